@@ -0,0 +1,225 @@
+"""
+app/cli.py
+Bakım komutları için basit komut satırı arayüzü.
+
+Kullanım:
+    python -m app.cli balances verify [--chunk-size 500]
+    python -m app.cli balances rebuild [--chunk-size 500]
+    python -m app.cli rollups rebuild [--since 2024-01-01] [--chunk-days 31]
+    python -m app.cli checkpoints build|rebuild [--until 2024-06-01]
+    python -m app.cli partitions ensure [--months-ahead 3]
+    python -m app.cli archive run [--before 2024-01-01]
+    python -m app.cli import-stocks hareketler.csv [--chunk-size 1000]
+    python -m app.cli alerts evaluate
+    python -m app.cli reorder compute [--full]
+    python -m app.cli notifications recount|flush
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal, engine
+from app.core.partitions import ensure_stock_partitions
+from app.core.config import settings
+import app.models  # noqa: F401  (tüm mapper'ların yüklenmesi için)
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_rollup_repository import StockRollupRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.repositories.stock_archive_repository import StockArchiveRepository
+from app.repositories.stock_alert_repository import StockAlertRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.repositories.notification_digest_repository import NotificationDigestRepository
+from app.services.stock_import_service import StockImportService
+from app.services.reorder_service import ReorderService
+
+logger = logging.getLogger(__name__)
+
+
+def _balances(args) -> int:
+    db = SessionLocal()
+    try:
+        repo = StockBalanceRepository(db)
+        if args.action == "verify":
+            drift = repo.verify(chunk_size=args.chunk_size)
+            for item in drift:
+                logger.warning(
+                    f"Bakiye sapması: sponge_id={item['sponge_id']} "
+                    f"beklenen={item['expected_on_hand']} mevcut={item['actual_on_hand']}"
+                )
+            logger.info(f"Doğrulama tamamlandı, {len(drift)} sapma bulundu.")
+            return 1 if drift else 0
+
+        rebuilt = repo.rebuild(chunk_size=args.chunk_size)
+        logger.info(f"{rebuilt} bakiye satırı defterden yeniden hesaplandı.")
+        return 0
+    finally:
+        db.close()
+
+
+def _rollups(args) -> int:
+    db = SessionLocal()
+    try:
+        since = datetime.strptime(args.since, "%Y-%m-%d").date() if args.since else None
+        chunks = StockRollupRepository(db).rebuild(start=since, chunk_days=args.chunk_days)
+        logger.info(f"Günlük özetler {chunks} parça halinde defterden yeniden hesaplandı.")
+        return 0
+    finally:
+        db.close()
+
+
+def _checkpoints(args) -> int:
+    db = SessionLocal()
+    try:
+        until = datetime.strptime(args.until, "%Y-%m-%d").date() if args.until else None
+        repo = StockCheckpointRepository(db)
+        built = repo.rebuild(until) if args.action == "rebuild" else repo.build(until)
+        logger.info(f"{built} aylık bakiye kontrol noktası dönemi oluşturuldu.")
+        return 0
+    finally:
+        db.close()
+
+
+def _partitions(args) -> int:
+    created = ensure_stock_partitions(engine, months_ahead=args.months_ahead)
+    for name in created:
+        logger.info(f"Partition oluşturuldu: {name}")
+    logger.info(f"{len(created)} yeni stocks partition'ı oluşturuldu.")
+    return 0
+
+
+def _archive(args) -> int:
+    if args.before:
+        cutoff = datetime.strptime(args.before, "%Y-%m-%d")
+    else:
+        # Ay başına hizalanır; böylece PostgreSQL'de eski partition'lar tamamen boşalır
+        oldest = datetime.utcnow() - timedelta(days=settings.STOCK_ARCHIVE_AFTER_DAYS)
+        cutoff = datetime(oldest.year, oldest.month, 1)
+    db = SessionLocal()
+    try:
+        stats = StockArchiveRepository(db).archive(cutoff)
+        logger.info(
+            f"Arşivleme tamamlandı (< {cutoff:%Y-%m-%d}): {stats['archived']} hareket, "
+            f"{stats['sponges']} sünger için açılış bakiyesi yazıldı."
+        )
+        return 0
+    finally:
+        db.close()
+
+
+def _import_stocks(args) -> int:
+    db = SessionLocal()
+    try:
+        service = StockImportService(db, chunk_size=args.chunk_size)
+        with open(args.path, "rb") as f:
+            stats = service.import_file(f, args.path)
+        for error in stats["errors"]:
+            logger.warning(f"Satır {error['line']}: {error['detail']}")
+        logger.info(
+            f"İçe aktarma tamamlandı: {stats['processed']} satır, "
+            f"{stats['inserted']} eklendi, {stats['failed']} hatalı."
+        )
+        return 1 if stats["failed"] else 0
+    finally:
+        db.close()
+
+
+def _alerts(args) -> int:
+    db = SessionLocal()
+    try:
+        transitions = StockAlertRepository(db).evaluate()
+        db.commit()
+        for t in transitions:
+            logger.info(f"Uyarı durumu değişti: {t['name']} -> {'critical' if t['is_critical'] else 'ok'}")
+        logger.info(f"{len(transitions)} sünger için uyarı durumu güncellendi.")
+        return 0
+    finally:
+        db.close()
+
+
+def _reorder(args) -> int:
+    db = SessionLocal()
+    try:
+        result = ReorderService(db).recompute(full=args.full)
+        logger.info(f"{result['computed']} sünger için yeniden sipariş noktası hesaplandı.")
+        return 0
+    finally:
+        db.close()
+
+
+def _notifications(args) -> int:
+    db = SessionLocal()
+    try:
+        if args.action == "flush":
+            flushed = NotificationDigestRepository(db).flush(force=True)
+            logger.info(f"{flushed} bildirim özeti yazıldı.")
+            return 0
+        fixed = NotificationRepository(db).recount()
+        logger.info(f"{fixed} kullanıcının okunmamış bildirim sayacı düzeltildi.")
+        return 0
+    finally:
+        db.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Sponge Stock bakım komutları")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    balances = sub.add_parser("balances", help="stock_balances tablosunu doğrula / yeniden kur")
+    balances.add_argument("action", choices=["verify", "rebuild"])
+    balances.add_argument("--chunk-size", type=int, default=500)
+    balances.set_defaults(func=_balances)
+
+    rollups = sub.add_parser("rollups", help="stock_daily_rollups tablosunu defterden yeniden kur (catch-up)")
+    rollups.add_argument("action", choices=["rebuild"])
+    rollups.add_argument("--since", help="YYYY-MM-DD; verilmezse ilk hareketten itibaren")
+    rollups.add_argument("--chunk-days", type=int, default=31)
+    rollups.set_defaults(func=_rollups)
+
+    checkpoints = sub.add_parser("checkpoints", help="Aylık bakiye kontrol noktalarını üret (as_of sorguları için)")
+    checkpoints.add_argument("action", choices=["build", "rebuild"])
+    checkpoints.add_argument("--until", help="YYYY-MM-DD; verilmezse bu ayın başına kadar")
+    checkpoints.set_defaults(func=_checkpoints)
+
+    partitions = sub.add_parser("partitions", help="stocks tablosu için gelecek ayların partition'larını aç (PostgreSQL)")
+    partitions.add_argument("action", choices=["ensure"])
+    partitions.add_argument("--months-ahead", type=int, default=None)
+    partitions.set_defaults(func=_partitions)
+
+    archive = sub.add_parser("archive", help="Eski hareketleri stocks_archive'a taşı, açılış bakiyesi yaz")
+    archive.add_argument("action", choices=["run"])
+    archive.add_argument("--before", help="YYYY-MM-DD; verilmezse STOCK_ARCHIVE_AFTER_DAYS'e göre")
+    archive.set_defaults(func=_archive)
+
+    importer = sub.add_parser("import-stocks", help="CSV/XLSX dosyasından geçmiş hareketleri içe aktar")
+    importer.add_argument("path")
+    importer.add_argument("--chunk-size", type=int, default=1000)
+    importer.set_defaults(func=_import_stocks)
+
+    alerts = sub.add_parser("alerts", help="Kritik stok uyarı durumlarını bakiyelere göre yeniden değerlendir")
+    alerts.add_argument("action", choices=["evaluate"])
+    alerts.set_defaults(func=_alerts)
+
+    reorder = sub.add_parser("reorder", help="Yeniden sipariş noktası / sipariş miktarı önerilerini hesapla")
+    reorder.add_argument("action", choices=["compute"])
+    reorder.add_argument("--full", action="store_true", help="Değişmemiş süngerleri de yeniden hesapla")
+    reorder.set_defaults(func=_reorder)
+
+    notifications = sub.add_parser(
+        "notifications", help="Okunmamış bildirim sayaçlarını yeniden hesapla / bekleyen özetleri yaz"
+    )
+    notifications.add_argument("action", choices=["recount", "flush"])
+    notifications.set_defaults(func=_notifications)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
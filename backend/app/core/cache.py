@@ -0,0 +1,57 @@
+# app/core/cache.py
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import Base
+
+
+class QueryCache:
+    """
+    Process içi, TTL'li basit sorgu önbelleği.
+
+    Yazma yolları (yeni stok hareketi, sünger değişikliği) ilgili önbelleği
+    `invalidate()` ile temizler; TTL ise birden fazla uvicorn replikası
+    çalışırken diğer replikalardaki yazmalar için üst sınır bayatlık sağlar.
+    Dönen değerler paylaşılır, çağıran taraf değiştirmemelidir.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._generation = 0
+
+    def get_or_set(self, key: str, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            # Hesaplama sırasında invalidate edildiyse sonucu saklama
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Stok hareketlerinden türetilen okumalar (özet vb.) için önbellek
+stock_cache = QueryCache(ttl_seconds=settings.STOCK_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _clear_on_drop(*args, **kwargs):
+    # Tablolar yeniden kurulduğunda (testler, bakım) eski sonuçlar servis edilmesin
+    stock_cache.invalidate()
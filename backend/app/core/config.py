@@ -23,6 +23,60 @@ class Settings(BaseSettings):
     APP_ENV: str = Field(..., env="APP_ENV")
     LOG_LEVEL: str = Field(..., env="LOG_LEVEL")
 
+    # Cache
+    STOCK_CACHE_TTL_SECONDS: int = Field(30, env="STOCK_CACHE_TTL_SECONDS")
+
+    # Arşivleme: bu kadar günden eski hareketler stocks_archive'a taşınır
+    STOCK_ARCHIVE_AFTER_DAYS: int = Field(730, env="STOCK_ARCHIVE_AFTER_DAYS")
+
+    # Partitioning (yalnızca PostgreSQL)
+    STOCK_PARTITION_MONTHS_AHEAD: int = Field(3, env="STOCK_PARTITION_MONTHS_AHEAD")
+
+    # Zamanlayıcı (rapor ön hesaplama); replikalar arası tekillik DB kirasıyla sağlanır
+    SCHEDULER_ENABLED: bool = Field(True, env="SCHEDULER_ENABLED")
+    SCHEDULER_TICK_SECONDS: int = Field(30, env="SCHEDULER_TICK_SECONDS")
+    SCHEDULER_LEASE_SECONDS: int = Field(600, env="SCHEDULER_LEASE_SECONDS")
+    REPORT_PRECOMPUTE_INTERVAL_SECONDS: int = Field(900, env="REPORT_PRECOMPUTE_INTERVAL_SECONDS")
+    CRITICAL_REPORT_INTERVAL_SECONDS: int = Field(300, env="CRITICAL_REPORT_INTERVAL_SECONDS")
+
+    # Rapor dışa aktarma (XLSX/PDF): dosyaların yazıldığı dizin ve render havuzu boyutu
+    REPORT_STORAGE_DIR: str = Field("storage/reports", env="REPORT_STORAGE_DIR")
+    REPORT_EXPORT_WORKERS: int = Field(2, env="REPORT_EXPORT_WORKERS")
+
+    # Yeniden sipariş noktası motoru (tüketim değişkenliği + tedarik süresi)
+    REORDER_HISTORY_DAYS: int = Field(90, env="REORDER_HISTORY_DAYS")
+    REORDER_DEFAULT_LEAD_TIME_DAYS: int = Field(7, env="REORDER_DEFAULT_LEAD_TIME_DAYS")
+    REORDER_REVIEW_DAYS: int = Field(14, env="REORDER_REVIEW_DAYS")
+    REORDER_SERVICE_LEVEL_Z: float = Field(1.65, env="REORDER_SERVICE_LEVEL_Z")  # ~%95 hizmet düzeyi
+    REORDER_INTERVAL_SECONDS: int = Field(3600, env="REORDER_INTERVAL_SECONDS")
+
+    # ABC (çıkış değerinin kümülatif payı) / XYZ (günlük talebin varyasyon katsayısı) eşikleri
+    ABC_A_SHARE: float = Field(0.8, env="ABC_A_SHARE")
+    ABC_B_SHARE: float = Field(0.95, env="ABC_B_SHARE")
+    XYZ_X_CV: float = Field(0.5, env="XYZ_X_CV")
+    XYZ_Y_CV: float = Field(1.0, env="XYZ_Y_CV")
+
+    # Bildirim akışı (SSE): heartbeat aralığı, Last-Event-ID tamponu, kullanıcı başına bağlantı sınırı
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = Field(15, env="NOTIFICATION_STREAM_HEARTBEAT_SECONDS")
+    NOTIFICATION_STREAM_REPLAY_SIZE: int = Field(1000, env="NOTIFICATION_STREAM_REPLAY_SIZE")
+    NOTIFICATION_STREAM_MAX_CONNECTIONS_PER_USER: int = Field(5, env="NOTIFICATION_STREAM_MAX_CONNECTIONS_PER_USER")
+
+    # Bildirim özetleme (digest): pencere içindeki bildirimler alıcı başına tek kayıtta birleşir
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = Field(300, env="NOTIFICATION_DIGEST_WINDOW_SECONDS")
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = Field(50, env="NOTIFICATION_DIGEST_MAX_ITEMS")
+    NOTIFICATION_DIGEST_FLUSH_SECONDS: int = Field(30, env="NOTIFICATION_DIGEST_FLUSH_SECONDS")
+
+    # E-posta kuyruğu (email_outbox) ve arka plan göndericisi
+    EMAIL_OUTBOX_ENABLED: bool = Field(True, env="EMAIL_OUTBOX_ENABLED")
+    EMAIL_OUTBOX_POLL_SECONDS: float = Field(2, env="EMAIL_OUTBOX_POLL_SECONDS")
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(100, env="EMAIL_OUTBOX_BATCH_SIZE")
+    EMAIL_OUTBOX_LEASE_SECONDS: int = Field(300, env="EMAIL_OUTBOX_LEASE_SECONDS")
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(6, env="EMAIL_OUTBOX_MAX_ATTEMPTS")
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: int = Field(30, env="EMAIL_OUTBOX_RETRY_BASE_SECONDS")
+    SMTP_POOL_SIZE: int = Field(2, env="SMTP_POOL_SIZE")
+    SMTP_STARTTLS: bool = Field(True, env="SMTP_STARTTLS")
+    SMTP_TIMEOUT_SECONDS: int = Field(30, env="SMTP_TIMEOUT_SECONDS")
+
     # CORS
     CORS_ORIGINS: str = Field(..., env="CORS_ORIGINS")
 
@@ -1,9 +1,32 @@
 # app/core/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
+# ON CONFLICT (upsert) kullanan depolar yalnızca bu diyalektlerde çalışır
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class UnsupportedDatabaseError(RuntimeError):
+    """DATABASE_URL desteklenmeyen bir veritabanını gösteriyor (yapılandırma hatası)."""
+
+
+def check_dialect(engine) -> None:
+    """Motorun diyalektini bir kez doğrular; desteklenmiyorsa uygulama başlamaz."""
+    name = engine.dialect.name
+    if name not in _DIALECT_INSERTS:
+        raise UnsupportedDatabaseError(
+            f"Desteklenmeyen veritabanı: {name}. "
+            f"DATABASE_URL şunlardan birini göstermeli: {', '.join(sorted(_DIALECT_INSERTS))}"
+        )
+
+
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+check_dialect(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -14,3 +37,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(db, table):
+    """
+    Aktif veritabanı diyalektine göre ON CONFLICT destekleyen INSERT yapısını döner.
+    PostgreSQL (üretim) ve SQLite (testler) için `on_conflict_do_*` kullanılabilir;
+    diyalekt başlangıçta `check_dialect` ile doğrulanır.
+    """
+    return _DIALECT_INSERTS[db.get_bind().dialect.name](table)
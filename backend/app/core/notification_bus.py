@@ -0,0 +1,132 @@
+# app/core/notification_bus.py
+import asyncio
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_PENDING_KEY = "notification_bus_pending"
+
+
+@dataclass(frozen=True)
+class BusEvent:
+    id: int
+    type: str                 # notification, read, deleted
+    user_id: Optional[int]    # None: tüm kullanıcılar (genel bildirim)
+    data: dict
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+class NotificationBus:
+    """
+    Process içi bildirim yayın/abonelik kanalı (SSE akışları için).
+
+    Yazma yolları (NotificationRepository) olayları commit'ten sonra `publish` eder;
+    her abonelik kendi event loop'undaki kuyruğa thread-safe olarak beslenir. Son
+    `replay_size` olay `Last-Event-ID` ile yeniden bağlanan istemcilere tekrar gönderilmek
+    üzere tutulur. Olay numaraları yalnızca bu süreç için geçerlidir; birden fazla
+    replika çalışırken her replika kendi yazmalarını yayınlar.
+    """
+
+    def __init__(self, replay_size: int, max_connections_per_user: int):
+        self.max_connections_per_user = max_connections_per_user
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._recent: deque[BusEvent] = deque(maxlen=replay_size)
+        self._subscriptions: dict[int, list[Subscription]] = {}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Çağıran event loop'unda abonelik açar; kullanıcı bağlantı sınırındaysa TooManyConnections."""
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            subscriptions = self._subscriptions.setdefault(user_id, [])
+            if len(subscriptions) >= self.max_connections_per_user:
+                raise TooManyConnections(user_id)
+            subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+
+    def connection_count(self, user_id: int) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(user_id, []))
+
+    def publish(self, type: str, user_id: Optional[int], data: dict) -> BusEvent:
+        """Olayı ilgili abonelere (user_id None ise herkese) iletir; herhangi bir thread'den çağrılabilir."""
+        with self._lock:
+            self._last_id = next(self._ids)
+            bus_event = BusEvent(self._last_id, type, user_id, data)
+            self._recent.append(bus_event)
+            if user_id is None:
+                targets = [s for subscriptions in self._subscriptions.values() for s in subscriptions]
+            else:
+                targets = list(self._subscriptions.get(user_id, []))
+
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, bus_event)
+            except RuntimeError:
+                # Abonenin loop'u kapanmış (bağlantı kopuyor); unsubscribe ile temizlenir
+                pass
+        return bus_event
+
+    def replay(self, user_id: int, last_event_id: int) -> Optional[list[BusEvent]]:
+        """
+        `last_event_id`'den sonraki, kullanıcıyı ilgilendiren olaylar. Aradaki olaylar
+        tampondan düşmüşse (veya numara bu sürece ait değilse) None döner; istemci
+        listeyi baştan çekmelidir.
+        """
+        with self._lock:
+            events, last_id = list(self._recent), self._last_id
+        if last_event_id == last_id:
+            return []
+        if last_event_id > last_id or not events or last_event_id < events[0].id - 1:
+            return None
+        return [
+            e for e in events
+            if e.id > last_event_id and (e.user_id is None or e.user_id == user_id)
+        ]
+
+    def publish_after_commit(self, session: Session, type: str, user_id: Optional[int], data: dict) -> None:
+        """Olayı oturumun transaction'ı commit edildiğinde yayınlar; rollback'te atılır."""
+        session.info.setdefault(_PENDING_KEY, []).append((type, user_id, data))
+
+
+notification_bus = NotificationBus(
+    replay_size=settings.NOTIFICATION_STREAM_REPLAY_SIZE,
+    max_connections_per_user=settings.NOTIFICATION_STREAM_MAX_CONNECTIONS_PER_USER,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session):
+    for type, user_id, data in session.info.pop(_PENDING_KEY, []):
+        notification_bus.publish(type, user_id, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop(_PENDING_KEY, None)
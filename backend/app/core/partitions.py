@@ -0,0 +1,128 @@
+# app/core/partitions.py
+"""
+`stocks` tablosunun aylık range partition yönetimi (yalnızca PostgreSQL).
+
+Tablo, Alembic migration'ı ile `PARTITION BY RANGE (date)` haline getirilir.
+SQLite (testler) ve partition'a çevrilmemiş PostgreSQL veritabanlarında
+buradaki fonksiyonlar hiçbir şey yapmaz; model tanımı her iki durumda da aynıdır.
+"""
+import logging
+from datetime import date, datetime
+from typing import Iterator
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.stocks import Stock
+
+logger = logging.getLogger(__name__)
+
+STOCKS_TABLE = Stock.__tablename__
+DEFAULT_PARTITION = f"{STOCKS_TABLE}_default"
+
+
+def _columns() -> str:
+    """Taşımada kopyalanan kolonlar; modelden türetilir ki yeni kolonlar (ör. is_opening_balance) kaybolmasın."""
+    return ", ".join(f'"{column.name}"' for column in Stock.__table__.columns)
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{STOCKS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def month_partitions(start: date, end: date) -> Iterator[tuple[str, date, date]]:
+    """
+    [start ayı, end ayı] (dahil) aralığındaki her ay için
+    (partition_adı, alt_sınır, üst_sınır) döner; sınırlar yarı açıktır.
+    """
+    month = start.replace(day=1)
+    last = end.replace(day=1)
+    while month <= last:
+        upper = _add_months(month, 1)
+        yield partition_name(month), month, upper
+        month = upper
+
+
+def is_partitioned(connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = to_regnamespace(current_schema())"
+        ),
+        {"table": STOCKS_TABLE},
+    ).scalar())
+
+
+def _create_partition(connection, name: str, lower: date, upper: date, has_default: bool) -> None:
+    """
+    Aylık partition'ı oluşturur. DEFAULT partition'da bu aya ait satır varsa PostgreSQL
+    partition'ı oluşturmayı reddeder; bu durumda aynı transaction içinde DEFAULT ayrılır,
+    partition oluşturulur, satırlar taşınır ve DEFAULT geri bağlanır.
+    """
+    bounds = f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    in_range = {"lower": lower, "upper": upper}
+    stranded = has_default and connection.execute(
+        text(f'SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE date >= :lower AND date < :upper LIMIT 1'),
+        in_range,
+    ).scalar()
+    if not stranded:
+        connection.execute(text(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {STOCKS_TABLE} {bounds}'))
+        return
+
+    connection.execute(text(f'ALTER TABLE {STOCKS_TABLE} DETACH PARTITION "{DEFAULT_PARTITION}"'))
+    connection.execute(text(f'CREATE TABLE "{name}" PARTITION OF {STOCKS_TABLE} {bounds}'))
+    columns = _columns()
+    moved = connection.execute(
+        text(
+            f'INSERT INTO {STOCKS_TABLE} ({columns}) SELECT {columns} FROM "{DEFAULT_PARTITION}" '
+            "WHERE date >= :lower AND date < :upper"
+        ),
+        in_range,
+    ).rowcount
+    connection.execute(
+        text(f'DELETE FROM "{DEFAULT_PARTITION}" WHERE date >= :lower AND date < :upper'), in_range
+    )
+    connection.execute(text(f'ALTER TABLE {STOCKS_TABLE} ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT'))
+    logger.warning(f"{name}: DEFAULT partition'dan {moved} satır taşındı")
+
+
+def ensure_stock_partitions(engine, months_ahead: int | None = None, today: date | None = None) -> list[str]:
+    """
+    Geçen aydan itibaren `months_ahead` ay ilerisine kadar eksik aylık partition'ları
+    oluşturur; bu aylara ait olup DEFAULT partition'a düşmüş satırlar yeni partition'a
+    taşınır. Zamanlayıcı işi `partitions.ensure` ile günlük çalışır (PostgreSQL dışında
+    hiçbir şey yapmaz). Oluşturulan partition adlarını döner.
+    """
+    months_ahead = settings.STOCK_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    today = today or datetime.utcnow().date()
+
+    created = []
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return created
+        existing = {
+            row[0] for row in connection.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "JOIN pg_class p ON p.oid = i.inhparent "
+                    "WHERE p.relname = :table"
+                ),
+                {"table": STOCKS_TABLE},
+            )
+        }
+        # Geçen ay da kontrol edilir: iş bir süre çalışmadıysa o ayın satırları DEFAULT'ta kalmış olabilir
+        for name, lower, upper in month_partitions(_add_months(today, -1), _add_months(today, months_ahead)):
+            if name in existing:
+                continue
+            _create_partition(connection, name, lower, upper, DEFAULT_PARTITION in existing)
+            created.append(name)
+    return created
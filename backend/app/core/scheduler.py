@@ -0,0 +1,123 @@
+# app/core/scheduler.py
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.scheduled_job_repository import ScheduledJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    interval_seconds: int
+    func: Callable[[Session], None]
+
+
+class Scheduler:
+    """
+    Uygulama süreci içinde çalışan basit periyodik iş zamanlayıcısı.
+
+    Her tick'te zamanı gelen işler için `scheduled_jobs` satırındaki kira koşullu
+    UPDATE ile alınmaya çalışılır; kirayı alan replika işi kendi oturumunda çalıştırır,
+    sonucu (süre, hata) yazar ve bir sonraki çalışma zamanını ayarlar. Böylece birden
+    fazla uvicorn replikası aynı işi aynı dönem için yalnızca bir kez çalıştırır.
+    İşler event loop'u bloklamamak için thread'de çalışır.
+    """
+
+    def __init__(
+        self,
+        jobs: list[Job],
+        session_factory: Callable[[], Session] = SessionLocal,
+        tick_seconds: int | None = None,
+        lease_seconds: int | None = None,
+    ):
+        self.jobs = {job.name: job for job in jobs}
+        self.session_factory = session_factory
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.lease_seconds = lease_seconds or settings.SCHEDULER_LEASE_SECONDS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._registered = False
+        self._task: asyncio.Task | None = None
+        self._stopped = asyncio.Event()
+
+    def register(self) -> None:
+        """İş satırlarını (yoksa) oluşturur; ilk çalışma hemen zamanı gelmiş kabul edilir."""
+        db = self.session_factory()
+        try:
+            ScheduledJobRepository(db).register(list(self.jobs), datetime.utcnow())
+            self._registered = True
+        finally:
+            db.close()
+
+    def run_pending(self) -> list[str]:
+        """Zamanı gelen ve kirası alınabilen işleri sırayla çalıştırır; çalışanların adlarını döner."""
+        if not self._registered:
+            try:
+                self.register()
+            except Exception as e:
+                logger.error(f"Zamanlanmış işler kaydedilemedi: {e}")
+                return []
+
+        ran = []
+        for job in self.jobs.values():
+            db = self.session_factory()
+            try:
+                repo = ScheduledJobRepository(db)
+                if not repo.try_acquire(job.name, self.owner, datetime.utcnow(), self.lease_seconds):
+                    continue
+
+                started = time.perf_counter()
+                error = None
+                try:
+                    job.func(db)
+                except Exception as e:
+                    db.rollback()
+                    error = f"{type(e).__name__}: {e}"
+                    logger.exception(f"Zamanlanmış iş başarısız: {job.name}")
+                duration = time.perf_counter() - started
+
+                finished_at = datetime.utcnow()
+                repo.finish(
+                    job.name, self.owner, finished_at, duration,
+                    next_run_at=finished_at + timedelta(seconds=job.interval_seconds),
+                    error=error,
+                )
+                ran.append(job.name)
+                logger.info(f"Zamanlanmış iş tamamlandı: {job.name} ({duration:.3f} sn)")
+            except Exception as e:
+                # Kira tablosuna erişilemiyorsa (ör. DB kesintisi) bir sonraki tick'te tekrar denenir
+                logger.error(f"Zamanlayıcı hatası ({job.name}): {e}")
+            finally:
+                db.close()
+        return ran
+
+    async def _loop(self) -> None:
+        while not self._stopped.is_set():
+            await asyncio.to_thread(self.run_pending)
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Zamanlayıcı başlatıldı ({self.owner}): {', '.join(self.jobs)}")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
@@ -0,0 +1,103 @@
+# app/core/smtp_pool.py
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class SmtpPool:
+    """
+    Kimliği doğrulanmış SMTP bağlantılarından oluşan küçük, thread-safe havuz.
+
+    Bağlantı (TCP + EHLO + STARTTLS + LOGIN) yalnızca havuzda boşta bağlantı yoksa kurulur
+    ve kullanım sonrası havuza geri konur; aynı anda en fazla `size` bağlantı açıktır.
+    Boştaki bağlantı alınırken NOOP ile yoklanır, sunucunun kapattığı bağlantı yenilenir.
+    Kullanım sırasında hata veren bağlantı havuza geri konmaz.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        size: int = 2,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._quit(smtp)
+            raise
+        self.connections_opened += 1
+        return smtp
+
+    def _take_idle(self) -> smtplib.SMTP | None:
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            try:
+                if smtp.noop()[0] == 250:
+                    return smtp
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._quit(smtp)
+
+    @staticmethod
+    def _quit(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        self._slots.acquire()
+        smtp = None
+        try:
+            smtp = self._take_idle() or self._connect()
+            yield smtp
+        except Exception:
+            if smtp is not None:
+                self._quit(smtp)
+                smtp = None
+            raise
+        finally:
+            if smtp is not None:
+                self._idle.put(smtp)
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
@@ -1,12 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import sponge_router, stock_router, user_router, report_router, notification_router, dashboard_router, chatbot_router
+from app.routers import sponge_router, stock_router, user_router, report_router, notification_router, dashboard_router, chatbot_router, admin_router
 from app.core.database import Base, engine
 from app.core.config import settings
+from app.core.scheduler import Scheduler
+from app.services.scheduler_service import report_jobs
+from app.services.email_outbox_service import EmailOutboxWorker
 import logging
 
 
-app = FastAPI(title=settings.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rapor ön hesaplama zamanlayıcısı (replikalar arası tekillik DB kirasıyla)
+    scheduler = Scheduler(report_jobs()) if settings.SCHEDULER_ENABLED else None
+    if scheduler:
+        await scheduler.start()
+    # E-posta kuyruğu göndericisi (istekler yalnızca kuyruğa ekler)
+    mailer = EmailOutboxWorker() if settings.EMAIL_OUTBOX_ENABLED else None
+    if mailer:
+        await mailer.start()
+    yield
+    if mailer:
+        await mailer.stop()
+    if scheduler:
+        await scheduler.stop()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -28,6 +49,7 @@ app.include_router(report_router.router)
 app.include_router(notification_router.router)
 app.include_router(dashboard_router.router)
 app.include_router(chatbot_router.router)
+app.include_router(admin_router.router)
 
 @app.get("/")
 def read_root():
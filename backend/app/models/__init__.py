@@ -7,7 +7,20 @@ Bu sayede Alembic, ORM import pathlerini tek yerden bulabilir.
 from app.models.users import User, UserRole
 from app.models.sponges import Sponge
 from app.models.stocks import Stock, StockType
-from app.models.reports import Report
+from app.models.stock_balances import StockBalance
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.models.stock_balance_checkpoints import StockBalanceCheckpoint
+from app.models.stocks_archive import StockArchive
+from app.models.reports import Report, ReportType
+from app.models.scheduled_jobs import ScheduledJob
+from app.models.stock_alert_states import StockAlertState
+from app.models.sponge_reorder_points import SpongeReorderPoint
+from app.models.notifications import Notification
+from app.models.notification_reads import NotificationReadEntry
+from app.models.notification_user_states import NotificationUserState
+from app.models.notification_global_counters import NotificationGlobalCounter
+from app.models.email_outbox import EmailOutbox
+from app.models.notification_digest_items import NotificationDigestItem
 from app.models.refresh_tokens import RefreshToken  
 
 __all__ = [
@@ -16,6 +29,20 @@ __all__ = [
     "Sponge",
     "Stock",
     "StockType",
+    "StockBalance",
+    "StockDailyRollup",
+    "StockBalanceCheckpoint",
+    "StockArchive",
     "Report",
+    "ReportType",
+    "ScheduledJob",
+    "StockAlertState",
+    "SpongeReorderPoint",
+    "Notification",
+    "NotificationReadEntry",
+    "NotificationUserState",
+    "NotificationGlobalCounter",
+    "EmailOutbox",
+    "NotificationDigestItem",
     "RefreshToken",
 ]
@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from app.core.database import Base
+
+
+class EmailOutbox(Base):
+    """
+    Gönderilecek e-postaların kalıcı kuyruğu. İstekler yalnızca satır ekler; arka plandaki
+    gönderici (EmailOutboxWorker) bekleyen satırları kira (lease) ile sahiplenip havuzdaki
+    SMTP bağlantılarıyla toplu gönderir. Durumlar: pending → sending → sent | failed;
+    geçici hatalarda satır artan bekleme süresiyle (backoff) tekrar pending olur.
+    Zamanlar naive UTC'dir.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    recipients = Column(JSON, nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_owner = Column(String(255))
+    lease_expires_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        # Göndericinin "zamanı gelmiş bekleyenler" taraması
+        Index("idx_email_outbox_status_next", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, status='{self.status}', attempts={self.attempts})>"
@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from app.core.database import Base
+
+
+class NotificationDigestItem(Base):
+    """
+    Özet (digest) penceresinde bekleyen bildirim/e-posta satırları. Aynı kanal ve alıcıya
+    ait satırlar pencere kapandığında (ilk satırdan NOTIFICATION_DIGEST_WINDOW_SECONDS sonra)
+    veya sayı NOTIFICATION_DIGEST_MAX_ITEMS'a ulaştığında tek bir bildirim / e-posta olarak
+    yazılır ve silinir. `recipient`: bildirimde kullanıcı id'si (genel bildirim için "*"),
+    e-postada adres. `dedupe_key` dolu satırlar pencere içinde tek satırda güncellenir.
+    Zamanlar naive UTC'dir.
+    """
+    __tablename__ = "notification_digest_items"
+
+    id = Column(Integer, primary_key=True)
+    channel = Column(String(20), nullable=False)     # notification, email
+    recipient = Column(String(255), nullable=False)
+    dedupe_key = Column(String(255), nullable=True)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String(50), nullable=False, default="info")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Tekilleştirme + (channel, recipient) gruplaması için öncü kolonlar
+        UniqueConstraint("channel", "recipient", "dedupe_key", name="uq_notification_digest_dedupe"),
+    )
+
+    def __repr__(self):
+        return f"<NotificationDigestItem(id={self.id}, channel='{self.channel}', recipient='{self.recipient}')>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NotificationGlobalCounter(Base):
+    """
+    Genel bildirimlerin (user_id IS NULL) toplam sayısını tutan tek satır (id = 1).
+    Genel bildirim eklendiği transaction'da artar; kullanıcı başına okunmamış sayısı
+    `total_count - notification_user_states.global_read_count` olarak tek satır okumasıyla
+    bulunur. Satır yoksa ilk ihtiyaçta bildirimlerden sayılarak oluşturulur.
+    """
+    __tablename__ = "notification_global_counters"
+
+    id = Column(Integer, primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<NotificationGlobalCounter(total_count={self.total_count})>"
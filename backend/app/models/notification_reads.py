@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NotificationReadEntry(Base):
+    """
+    Genel bildirimlerin (user_id IS NULL) kullanıcı bazında okunma kaydı. Paylaşılan
+    `notifications.is_read` bayrağı yalnızca kişisel bildirimler için kullanılır.
+    Kullanıcının `global_read_through` filigranına kadarki bildirimler için satır tutulmaz.
+    """
+    __tablename__ = "notification_reads"
+
+    user_id = Column(Integer, primary_key=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True)
+    read_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<NotificationReadEntry(user_id={self.user_id}, notification_id={self.notification_id})>"
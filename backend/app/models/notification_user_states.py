@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NotificationUserState(Base):
+    """
+    Kullanıcı bazında bildirim durumu:
+    - unread_count: kişisel bildirim ekleme / okuma / silme ile aynı transaction'da güncellenen
+      okunmamış sayacı. Genel bildirimler buraya yansıtılmaz (bir genel bildirim tüm
+      kullanıcıların satırını kilitlemez).
+    - global_read_through: "tümünü okundu işaretle" filigranı; id'si bu değere kadar olan
+      genel bildirimler okunmuş sayılır.
+    - global_read_count: kullanıcının okuduğu genel bildirim sayısı (filigrana kadar olanlar +
+      filigranın üzerinde tek tek okunanlar). Okunmamış genel bildirim sayısı
+      `notification_global_counters.total_count - global_read_count`'tur.
+    Satır ilk ihtiyaçta bildirimlerden sayılarak oluşturulur.
+    """
+    __tablename__ = "notification_user_states"
+
+    user_id = Column(Integer, primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+    global_read_through = Column(Integer, nullable=False, default=0)
+    global_read_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<NotificationUserState(user_id={self.user_id}, unread_count={self.unread_count})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, text
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -13,3 +13,20 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     read_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Kişisel akış: user_id = ? ORDER BY created_at DESC, id DESC (keyset)
+        Index("idx_notification_user_created_id", "user_id", "created_at", "id"),
+        # Genel akış: yalnızca user_id IS NULL satırlarını taşıyan partial index
+        Index(
+            "idx_notification_global_created_id", "created_at", "id",
+            postgresql_where=text("user_id IS NULL"),
+            sqlite_where=text("user_id IS NULL"),
+        ),
+        # Genel bildirimlerin okunmamış sayımı: id > filigran (kullanıcı başına okuma anında)
+        Index(
+            "idx_notification_global_id", "id",
+            postgresql_where=text("user_id IS NULL"),
+            sqlite_where=text("user_id IS NULL"),
+        ),
+    )
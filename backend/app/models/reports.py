@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum, Float
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, JSON, Enum, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -8,6 +8,7 @@ import enum
 class ReportType(str, enum.Enum):
     weekly = "weekly"
     monthly = "monthly"
+    critical = "critical"
 
 
 class Report(Base):
@@ -20,6 +21,19 @@ class Report(Base):
     generated_duration = Column(Float)  # saniye cinsinden (rapor oluşturma süresi)
     created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Raporun kapsadığı [period_start, period_end) gün aralığı; kapanmış dönemlerin
+    # raporları bu anahtarla saklanır ve tekrar hesaplanmadan servis edilir
+    period_start = Column(Date)
+    period_end = Column(Date)
+    # Kapanmış döneme geriye tarihli hareket yazıldığında işaretlenir (naive UTC); snapshot
+    # silinmez, bir sonraki okumada veya zamanlayıcıda aynı satırın üzerine yeniden üretilir
+    invalidated_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("uq_report_type_period", "report_type", "period_start", "period_end", unique=True),
+        # Geriye tarihli hareketlerde etkilenen (kapanmış) dönemlerin bulunması için
+        Index("idx_report_period_end", "period_end"),
+    )
 
     # Relationships
     user = relationship("User", back_populates="reports")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from app.core.database import Base
+
+
+class ScheduledJob(Base):
+    """
+    Zamanlanmış bir işin (ör. rapor ön hesaplama) hem kira (lease) satırı hem de
+    durum kaydı. Birden fazla uvicorn replikası aynı tabloyu paylaşır; bir işi yalnızca
+    kirayı koşullu UPDATE ile alabilen replika çalıştırır. Zamanlar naive UTC'dir.
+    """
+    __tablename__ = "scheduled_jobs"
+
+    name = Column(String(100), primary_key=True)
+    next_run_at = Column(DateTime, nullable=False)
+    lease_owner = Column(String(255))
+    lease_expires_at = Column(DateTime)
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_duration = Column(Float)  # saniye
+    last_status = Column(String(20))  # success | failed
+    last_error = Column(Text)
+    run_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ScheduledJob(name='{self.name}', next_run_at={self.next_run_at}, owner='{self.lease_owner}')>"
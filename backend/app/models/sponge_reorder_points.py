@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class SpongeReorderPoint(Base):
+    """
+    Yeniden sipariş motorunun sünger bazında son sonucu. `balance_version`, hesaplamada
+    kullanılan `stock_balances.version` değeridir; bakiye sürümü değişmemiş (yeni hareket
+    olmamış), tedarik süresi aynı kalmış ve bugün (UTC) hesaplanmış süngerler artımlı
+    çalıştırmada atlanır.
+    """
+    __tablename__ = "sponge_reorder_points"
+
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), primary_key=True)
+    avg_daily_demand = Column(Float, nullable=False)
+    demand_std = Column(Float, nullable=False)
+    lead_time_days = Column(Integer, nullable=False)
+    safety_stock = Column(Float, nullable=False)
+    reorder_point = Column(Float, nullable=False)
+    order_up_to = Column(Float, nullable=False)
+    order_quantity = Column(Float, nullable=False)
+    balance_version = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SpongeReorderPoint(sponge_id={self.sponge_id}, reorder_point={self.reorder_point})>"
@@ -19,6 +19,8 @@ class Sponge(Base):
     thickness = Column(Float)
     unit = Column(String(10), nullable=False)  # "m3" veya "adet"
     critical_stock = Column(Float, default=5)
+    # Tedarik süresi (gün); None ise REORDER_DEFAULT_LEAD_TIME_DAYS kullanılır
+    lead_time_days = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -29,6 +31,7 @@ class Sponge(Base):
 
     # Relationships
     stocks = relationship("Stock", back_populates="sponge", cascade="all, delete")
+    balance = relationship("StockBalance", back_populates="sponge", uselist=False, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Sponge(id={self.id}, name='{self.name}', density={self.density}, hardness='{self.hardness}')>"
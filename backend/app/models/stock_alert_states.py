@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy.sql import func, false
+from app.core.database import Base
+
+
+class StockAlertState(Base):
+    """
+    Her süngerin kritik stok uyarı durumu. Bildirim yalnızca durum değiştiğinde
+    (ok → critical, critical → ok) üretilir; satırı olmayan sünger "ok" kabul edilir.
+    Durum, bakiyeyi değiştiren hareketle aynı transaction içinde güncellenir.
+    """
+    __tablename__ = "stock_alert_states"
+
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), primary_key=True)
+    is_critical = Column(Boolean, nullable=False, default=False, server_default=false())
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<StockAlertState(sponge_id={self.sponge_id}, is_critical={self.is_critical})>"
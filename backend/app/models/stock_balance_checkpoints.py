@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index
+from app.core.database import Base
+
+
+class StockBalanceCheckpoint(Base):
+    """
+    Aylık bakiye kontrol noktaları: `period_start` gününün 00:00 anından ÖNCEKİ
+    tüm hareketlerin toplamı (yani bir önceki ayın kapanış bakiyesi).
+    Geçmiş tarihli ("as of") bakiye sorguları en yakın kontrol noktasından
+    başlayıp yalnızca o dönemin hareketlerini toplar.
+    """
+    __tablename__ = "stock_balance_checkpoints"
+
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    on_hand = Column(Float, nullable=False, default=0)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+    total_return = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        # En yakın kontrol noktası dönemi ve geriye tarihli hareket düzeltmeleri için
+        Index("idx_checkpoint_period", "period_start"),
+    )
+
+    def __repr__(self):
+        return f"<StockBalanceCheckpoint(sponge_id={self.sponge_id}, period_start={self.period_start}, on_hand={self.on_hand})>"
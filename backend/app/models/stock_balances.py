@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class StockBalance(Base):
+    """
+    Her sünger için tek satırlık, materyalize edilmiş stok bakiyesi.
+    `stocks` defteri (ledger) değiştikçe aynı transaction içinde güncellenir;
+    böylece mevcut stok okumaları hareket sayısından bağımsız O(1) olur.
+    """
+    __tablename__ = "stock_balances"
+
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), primary_key=True)
+    on_hand = Column(Float, nullable=False, default=0)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+    total_return = Column(Float, nullable=False, default=0)
+    last_movement_at = Column(DateTime(timezone=True))
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    sponge = relationship("Sponge", back_populates="balance")
+
+    def __repr__(self):
+        return f"<StockBalance(sponge_id={self.sponge_id}, on_hand={self.on_hand}, version={self.version})>"
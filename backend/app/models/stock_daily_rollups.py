@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index
+from app.core.database import Base
+
+
+class StockDailyRollup(Base):
+    """
+    Sünger × gün bazında önceden toplanmış hareket özetleri.
+    Her hareketle (tekil/toplu ekleme ve silme) aynı transaction içinde artımlı güncellenir;
+    rapor ve trend sorguları ham `stocks` yerine bu tablo üzerinden çalışır.
+    """
+    __tablename__ = "stock_daily_rollups"
+
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+    total_return = Column(Float, nullable=False, default=0)
+    movement_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Tüm süngerler için tarih aralığı sorguları (haftalık/aylık rapor, trend)
+        Index(
+            "idx_rollup_day_sponge", "day", "sponge_id",
+            postgresql_include=["total_in", "total_out", "total_return", "movement_count"],
+        ),
+    )
+
+    def __repr__(self):
+        return f"<StockDailyRollup(sponge_id={self.sponge_id}, day={self.day}, count={self.movement_count})>"
@@ -1,9 +1,9 @@
 from sqlalchemy import (
     Column, Integer, Float, String, DateTime, ForeignKey,
-    Enum, Text, CheckConstraint, Index
+    Enum, Text, Boolean, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, false
 import enum
 from app.core.database import Base
 
@@ -24,14 +24,26 @@ class Stock(Base):
     type = Column(Enum(StockType), nullable=False)
     price = Column(Float)
     note = Column(Text)
-    date = Column(DateTime(timezone=True), server_default=func.now())
+    # PostgreSQL'de partition anahtarı (aylık RANGE, bkz. app/core/partitions.py); boş olamaz
+    date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Arşivleme sonrası arşivlenen hareketlerin yerine yazılan sentetik devir hareketi
+    is_opening_balance = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Constraints & Index
     __table_args__ = (
         CheckConstraint("quantity >= 0", name="ck_quantity_positive"),
-        Index("idx_stock_sponge_date", "sponge_id", "date"),
+        # Sünger bazlı keyset sayfalama + as_of / doğrulama toplamları; PostgreSQL'de
+        # toplanan kolonları da taşıyan covering index (index-only scan)
+        Index(
+            "idx_stock_sponge_date_id", "sponge_id", "date", "id",
+            postgresql_include=["type", "quantity", "is_opening_balance"],
+        ),
+        # GET /stocks/ keyset sayfalama (date DESC, id DESC) ve filtreleri için
+        Index("idx_stock_date_id", "date", "id"),
+        Index("idx_stock_type_date_id", "type", "date", "id"),
+        Index("idx_stock_created_by_date_id", "created_by", "date", "id"),
     )
 
     # Relationships
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Enum, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.stocks import StockType
+
+
+class StockArchive(Base):
+    """
+    Arşivlenmiş (kesim tarihinden eski) stok hareketleri.
+    Satırlar `stocks`'tan aynı id ile taşınır; canlı tabloda yerlerine sünger başına
+    tek bir açılış bakiyesi hareketi (`is_opening_balance`) kalır.
+    Denetim amaçlıdır; tarih aralığı uç noktalarında `include_archived=true` ile okunur.
+    """
+    __tablename__ = "stocks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    sponge_id = Column(Integer, ForeignKey("sponges.id", ondelete="CASCADE"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    quantity = Column(Float, nullable=False)
+    type = Column(Enum(StockType), nullable=False)
+    price = Column(Float)
+    note = Column(Text)
+    date = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_stock_archive_sponge_date", "sponge_id", "date", postgresql_include=["type", "quantity"]),
+        Index("idx_stock_archive_date_id", "date", "id"),
+    )
+
+    def __repr__(self):
+        return f"<StockArchive(id={self.id}, sponge_id={self.sponge_id}, qty={self.quantity}, type={self.type})>"
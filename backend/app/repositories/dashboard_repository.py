@@ -3,6 +3,8 @@ from sqlalchemy import func, case
 from datetime import datetime, timedelta
 from app.models.stocks import Stock, StockType
 from app.models.sponges import Sponge
+from app.models.stock_balances import StockBalance
+from app.models.stock_daily_rollups import StockDailyRollup
 
 class DashboardRepository:
     def __init__(self, db: Session):
@@ -19,24 +21,17 @@ class DashboardRepository:
         # Toplam ürün sayısı
         total_products = self.db.query(func.count(Sponge.id)).scalar() or 0
         
-        # Toplam stok ve kritik stok sayısı
-        balance_expr = case(
-            (Stock.type.in_([StockType.in_, StockType.return_]), Stock.quantity),
-            else_=-Stock.quantity
-        )
-        
-        stock_query = (
+        # Toplam stok ve kritik stok sayısı (materyalize bakiyelerden)
+        on_hand = func.coalesce(StockBalance.on_hand, 0)
+        total_stock, critical_count = (
             self.db.query(
-                Sponge.id,
-                func.coalesce(func.sum(balance_expr), 0).label("current_stock"),
-                Sponge.critical_stock
+                func.coalesce(func.sum(on_hand), 0),
+                func.count(case((on_hand <= Sponge.critical_stock, 1))),
             )
-            .outerjoin(Stock, Stock.sponge_id == Sponge.id)
-            .group_by(Sponge.id, Sponge.critical_stock)
-        ).all()
-        
-        total_stock = sum(row.current_stock for row in stock_query)
-        critical_count = sum(1 for row in stock_query if row.current_stock <= row.critical_stock)
+            .select_from(Sponge)
+            .outerjoin(StockBalance, StockBalance.sponge_id == Sponge.id)
+            .one()
+        )
         
         # Son 24 saat içindeki hareket sayısı
         twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
@@ -55,25 +50,20 @@ class DashboardRepository:
     
     def get_weekly_trend(self):
         """
-        Son 7 günün günlük giriş/çıkış trendi
+        Son 7 günün günlük giriş/çıkış trendi (günlük özet tablosundan)
         """
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        seven_days_ago = (datetime.utcnow() - timedelta(days=7)).date()
         
         daily_data = (
             self.db.query(
-                func.date(Stock.date).label("date"),
-                func.coalesce(func.sum(case(
-                    (Stock.type.in_([StockType.in_, StockType.return_]), Stock.quantity),
-                    else_=0
-                )), 0).label("total_in"),
-                func.coalesce(func.sum(case(
-                    (Stock.type == StockType.out, Stock.quantity),
-                    else_=0
-                )), 0).label("total_out")
+                StockDailyRollup.day.label("date"),
+                func.coalesce(func.sum(StockDailyRollup.total_in + StockDailyRollup.total_return), 0).label("total_in"),
+                func.coalesce(func.sum(StockDailyRollup.total_out), 0).label("total_out")
             )
-            .filter(Stock.date >= seven_days_ago)
-            .group_by(func.date(Stock.date))
-            .order_by(func.date(Stock.date))
+            .filter(StockDailyRollup.day >= seven_days_ago)
+            .filter(StockDailyRollup.movement_count > 0)
+            .group_by(StockDailyRollup.day)
+            .order_by(StockDailyRollup.day)
             .all()
         )
         
@@ -91,18 +81,22 @@ class DashboardRepository:
         """
         Son 7 gündeki en çok hareket gören ürünler
         """
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        seven_days_ago = (datetime.utcnow() - timedelta(days=7)).date()
+        movement_count = func.sum(StockDailyRollup.movement_count)
         
         top_movers = (
             self.db.query(
                 Sponge.name,
-                func.count(Stock.id).label("movement_count"),
-                func.coalesce(func.sum(Stock.quantity), 0).label("total_quantity")
+                movement_count.label("movement_count"),
+                func.coalesce(func.sum(
+                    StockDailyRollup.total_in + StockDailyRollup.total_out + StockDailyRollup.total_return
+                ), 0).label("total_quantity")
             )
-            .join(Stock, Stock.sponge_id == Sponge.id)
-            .filter(Stock.date >= seven_days_ago)
+            .join(StockDailyRollup, StockDailyRollup.sponge_id == Sponge.id)
+            .filter(StockDailyRollup.day >= seven_days_ago)
             .group_by(Sponge.name)
-            .order_by(func.count(Stock.id).desc())
+            .having(movement_count > 0)
+            .order_by(movement_count.desc())
             .limit(limit)
             .all()
         )
@@ -110,7 +104,7 @@ class DashboardRepository:
         return [
             {
                 "name": row.name,
-                "movement_count": row.movement_count,
+                "movement_count": int(row.movement_count),
                 "total_quantity": float(row.total_quantity)
             }
             for row in top_movers
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select, update
+from app.models.email_outbox import EmailOutbox
+
+
+class EmailOutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, to: list[str], subject: str, body: str) -> EmailOutbox:
+        """enqueue'nun commit ETMEYEN hali; çağıranın transaction'ına dahil olur."""
+        message = EmailOutbox(recipients=list(to), subject=subject, body=body, status="pending", attempts=0)
+        self.db.add(message)
+        self.db.flush()
+        return message
+
+    def enqueue(self, to: list[str], subject: str, body: str) -> EmailOutbox:
+        """E-postayı kuyruğa ekler; gönderim arka planda yapılır."""
+        message = self.add(to, subject, body)
+        self.db.commit()
+        self.db.refresh(message)
+        return message
+
+    @staticmethod
+    def _claimable(now: datetime):
+        # Zamanı gelmiş bekleyenler + kirası dolmuş (gönderici çökmüş) satırlar
+        return or_(
+            and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == "sending", EmailOutbox.lease_expires_at < now),
+        )
+
+    def claim(self, owner: str, now: datetime, limit: int, lease_seconds: int) -> list[EmailOutbox]:
+        """
+        En fazla `limit` gönderilebilir satırı `owner` adına kiralar ve döner. Satırlar
+        koşullu UPDATE ile alınır; aynı anda çalışan göndericilerden her satırı yalnızca
+        biri alır (PostgreSQL'de kilitli satırlar SKIP LOCKED ile atlanır).
+        """
+        ids = self.db.scalars(
+            select(EmailOutbox.id)
+            .where(self._claimable(now))
+            .order_by(EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            self.db.commit()
+            return []
+
+        self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids), self._claimable(now))
+            .values(
+                status="sending",
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+        )
+        self.db.commit()
+        return (
+            self.db.query(EmailOutbox)
+            .filter(EmailOutbox.id.in_(ids), EmailOutbox.lease_owner == owner, EmailOutbox.status == "sending")
+            .order_by(EmailOutbox.id)
+            .all()
+        )
+
+    def mark_sent(self, ids: list[int], owner: str, now: datetime) -> None:
+        """Commit ETMEZ; gönderim sonucu tek transaction'da yazılır."""
+        if not ids:
+            return
+        self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids), EmailOutbox.lease_owner == owner)
+            .values(
+                status="sent", sent_at=now, attempts=EmailOutbox.attempts + 1,
+                lease_owner=None, lease_expires_at=None, last_error=None,
+            )
+        )
+
+    def mark_failed(self, message_id: int, owner: str, error: str, retry_at: datetime | None) -> None:
+        """retry_at verilirse satır o zamana kadar bekler, yoksa kalıcı olarak başarısızdır. Commit ETMEZ."""
+        self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id, EmailOutbox.lease_owner == owner)
+            .values(
+                status="pending" if retry_at else "failed",
+                next_attempt_at=retry_at or EmailOutbox.next_attempt_at,
+                attempts=EmailOutbox.attempts + 1,
+                last_error=error[:2000],
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
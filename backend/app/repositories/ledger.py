@@ -0,0 +1,60 @@
+"""
+Stok defteri (ledger) için ortak sorgu parçaları.
+
+Arşivlemeden sonra defter iki tabloya yayılır: canlı `stocks` ve `stocks_archive`.
+Defterin tamamından türetilen değerler (bakiye doğrulama, günlük özet ve
+kontrol noktası hesapları) bu modüldeki birleşik sorguları kullanır.
+"""
+from datetime import datetime
+from sqlalchemy import case, select, union_all, literal
+from app.models.stocks import Stock, StockType
+from app.models.stocks_archive import StockArchive
+
+
+def signed_quantity(model):
+    """Giriş/iade için +quantity, çıkış için -quantity."""
+    return case((model.type == StockType.out, -model.quantity), else_=model.quantity)
+
+
+def ledger_movements(since: datetime | None = None, until: datetime | None = None,
+                     until_inclusive: bool = False, sponge_ids: list[int] | None = None):
+    """
+    Defterin tamamını (canlı hareketler + arşiv) tek bir alt sorgu olarak döner.
+    Açılış bakiyesi hareketleri arşivdeki satırların özeti olduğundan hariç tutulur.
+    Filtreler her iki kola ayrı ayrı uygulanır; böylece index / partition budaması korunur.
+    Kolonlar: id, sponge_id, type, quantity, date
+    """
+    def _branch(model, *criteria):
+        stmt = select(model.id, model.sponge_id, model.type, model.quantity, model.date).where(*criteria)
+        if since is not None:
+            stmt = stmt.where(model.date >= since)
+        if until is not None:
+            stmt = stmt.where(model.date <= until if until_inclusive else model.date < until)
+        if sponge_ids is not None:
+            stmt = stmt.where(model.sponge_id.in_(sponge_ids))
+        return stmt
+
+    return union_all(
+        _branch(Stock, Stock.is_opening_balance.is_(False)),
+        _branch(StockArchive),
+    ).subquery("ledger")
+
+
+def movement_rows(include_archived: bool, *criteria_by_model):
+    """
+    Tarih aralığı uç noktaları için (id, sponge_id, type, quantity, price, note, date,
+    created_by, archived) kolonlu hareket sorgusu. include_archived=True ise arşiv de eklenir.
+    `criteria_by_model`, model alıp filtre listesi dönen fonksiyonlardır.
+    """
+    def _branch(model, archived: bool, *extra):
+        return select(
+            model.id, model.sponge_id, model.type, model.quantity, model.price,
+            model.note, model.date, model.created_by, literal(archived).label("archived"),
+        ).where(*extra, *(c for build in criteria_by_model for c in build(model)))
+
+    if not include_archived:
+        return _branch(Stock, False)
+    return union_all(
+        _branch(Stock, False, Stock.is_opening_balance.is_(False)),
+        _branch(StockArchive, True),
+    )
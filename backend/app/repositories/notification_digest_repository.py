@@ -0,0 +1,143 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.notification_digest_items import NotificationDigestItem
+from app.repositories.email_outbox_repository import EmailOutboxRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.schemas.notification_schema import NotificationCreate
+
+# Genel bildirimlerin (user_id None) alıcı anahtarı
+ALL_USERS = "*"
+
+# Özetin türü, içindeki en önemli bildirimin türüdür
+_SEVERITY = {"success": 0, "info": 1, "warning": 2, "error": 3}
+
+
+def _digest_title(rows) -> str:
+    titles = {row.title for row in rows}
+    if len(rows) == 1:
+        return rows[0].title
+    title = titles.pop() if len(titles) == 1 else "🔔 Bildirim Özeti"
+    return f"{title} ({len(rows)})"
+
+
+def _email_body(subject: str, lines: list[str]) -> str:
+    return f"<h3>{subject}</h3><ul>" + "".join(f"<li>{line}</li>" for line in lines) + "</ul>"
+
+
+class NotificationDigestRepository:
+    """
+    Yüksek frekanslı bildirimleri alıcı başına zaman penceresinde birleştirir.
+
+    `add_*` çağrıları satırları `notification_digest_items`'a yazar; aynı (kanal, alıcı)
+    grubunun ilk satırından NOTIFICATION_DIGEST_WINDOW_SECONDS sonra (zamanlayıcı işi
+    `notifications.digest`) ya da grup NOTIFICATION_DIGEST_MAX_ITEMS satıra ulaştığında
+    (hemen, aynı transaction'da) grup tek bir bildirim / e-posta olarak yazılır. Böylece
+    yazılan bildirim ve gönderilen e-posta sayısı olay sayısıyla değil pencere sayısıyla
+    büyür. Pencere 0 ise özetleme kapalıdır; kayıtlar doğrudan yazılır.
+    """
+
+    def __init__(self, db: Session, window_seconds: Optional[int] = None, max_items: Optional[int] = None):
+        self.db = db
+        self.window_seconds = (
+            settings.NOTIFICATION_DIGEST_WINDOW_SECONDS if window_seconds is None else window_seconds
+        )
+        self.max_items = max_items or settings.NOTIFICATION_DIGEST_MAX_ITEMS
+        self.notification_repo = NotificationRepository(db)
+        self.outbox_repo = EmailOutboxRepository(db)
+
+    def add_notifications(self, notifications: list[NotificationCreate]) -> None:
+        """Bildirimleri alıcılarının penceresine ekler. Commit ETMEZ."""
+        if self.window_seconds <= 0:
+            self.notification_repo.add_many(notifications)
+            return
+        groups = defaultdict(list)
+        for n in notifications:
+            recipient = ALL_USERS if n.user_id is None else str(n.user_id)
+            groups[recipient].append({"title": n.title, "message": n.message, "type": n.type, "dedupe_key": None})
+        for recipient, items in groups.items():
+            self._add("notification", recipient, items)
+
+    def add_email(self, to: list[str], subject: str, lines: list[tuple[Optional[str], str]]) -> None:
+        """
+        E-posta satırlarını (dedupe_key, satır) her adresin penceresine ekler; aynı anahtarlı
+        satır pencere içinde tekrar gelirse yenisiyle değiştirilir. Commit ETMEZ.
+        """
+        if self.window_seconds <= 0:
+            self.outbox_repo.add(to, subject, _email_body(subject, [line for _, line in lines]))
+            return
+        items = [{"title": subject, "message": line, "type": "info", "dedupe_key": key} for key, line in lines]
+        for address in to:
+            self._add("email", address, items)
+
+    def _add(self, channel: str, recipient: str, items: list[dict]) -> None:
+        # Aynı ifadede aynı anahtar iki kez güncellenemez (PostgreSQL); son gelen kazanır
+        keyed = {item["dedupe_key"]: item for item in items if item["dedupe_key"] is not None}
+        items = [item for item in items if item["dedupe_key"] is None] + list(keyed.values())
+
+        now = datetime.utcnow()
+        stmt = dialect_insert(self.db, NotificationDigestItem)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["channel", "recipient", "dedupe_key"],
+            set_={"title": stmt.excluded.title, "message": stmt.excluded.message, "type": stmt.excluded.type},
+        )
+        self.db.execute(stmt, [
+            {"channel": channel, "recipient": recipient, "created_at": now, **item} for item in items
+        ])
+
+        pending = self.db.scalar(
+            select(func.count(NotificationDigestItem.id)).where(
+                NotificationDigestItem.channel == channel, NotificationDigestItem.recipient == recipient
+            )
+        )
+        if pending >= self.max_items:
+            self._flush_group(channel, recipient)
+
+    def flush(self, now: Optional[datetime] = None, force: bool = False) -> int:
+        """
+        Penceresi kapanmış (force=True ise tüm) grupları yazar ve commit eder.
+        Yazılan özet sayısını döner.
+        """
+        query = self.db.query(NotificationDigestItem.channel, NotificationDigestItem.recipient).group_by(
+            NotificationDigestItem.channel, NotificationDigestItem.recipient
+        )
+        if not force:
+            cutoff = (now or datetime.utcnow()) - timedelta(seconds=self.window_seconds)
+            query = query.having(or_(
+                func.min(NotificationDigestItem.created_at) <= cutoff,
+                func.count(NotificationDigestItem.id) >= self.max_items,
+            ))
+        flushed = sum(self._flush_group(channel, recipient) for channel, recipient in query.all())
+        self.db.commit()
+        return flushed
+
+    def _flush_group(self, channel: str, recipient: str) -> bool:
+        # Satırlar DELETE ... RETURNING ile alınır; eşzamanlı iki boşaltma aynı satırı iki kez yazamaz
+        rows = self.db.execute(
+            delete(NotificationDigestItem)
+            .where(NotificationDigestItem.channel == channel, NotificationDigestItem.recipient == recipient)
+            .returning(
+                NotificationDigestItem.id, NotificationDigestItem.title,
+                NotificationDigestItem.message, NotificationDigestItem.type,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            return False
+        rows.sort(key=lambda row: row.id)
+
+        title = _digest_title(rows)
+        if channel == "email":
+            self.outbox_repo.add([recipient], title, _email_body(title, [row.message for row in rows]))
+        else:
+            self.notification_repo.add_many([NotificationCreate(
+                title=title,
+                message="\n".join(row.message for row in rows),
+                type=max((row.type for row in rows), key=lambda t: _SEVERITY.get(t, 1)),
+                user_id=None if recipient == ALL_USERS else int(recipient),
+            )])
+        return True
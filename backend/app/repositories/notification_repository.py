@@ -1,6 +1,13 @@
-from sqlalchemy.orm import Session
+from collections import Counter
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, insert, select, tuple_, union_all, update
+from app.core.database import dialect_insert
+from app.core.notification_bus import notification_bus
 from app.models.notifications import Notification
-from app.schemas.notification_schema import NotificationCreate
+from app.models.notification_reads import NotificationReadEntry
+from app.models.notification_user_states import NotificationUserState
+from app.models.notification_global_counters import NotificationGlobalCounter
+from app.schemas.notification_schema import NotificationCreate, NotificationRead
 from typing import List, Optional
 from datetime import datetime
 
@@ -9,78 +16,342 @@ class NotificationRepository:
         self.db = db
 
     def create(self, notification: NotificationCreate) -> Notification:
-        """Yeni bildirim oluştur"""
+        """
+        Yeni bildirim oluştur; alıcının okunmamış sayacı (genel bildirimde tek satırlık
+        genel sayaç) aynı transaction'da artar.
+        """
         db_notification = Notification(**notification.model_dump())
         self.db.add(db_notification)
+        if notification.user_id is None:
+            self.db.flush()
+            self._bump_global(1)
+        else:
+            self._bump_unread(notification.user_id, 1)
         self.db.commit()
         self.db.refresh(db_notification)
+        self._publish_created(db_notification)
         return db_notification
 
-    def get_by_user(self, user_id: Optional[int] = None, limit: int = 50) -> List[Notification]:
+    def add_many(self, notifications: List[NotificationCreate]) -> None:
         """
-        Kullanıcıya özel bildirimleri getir.
-        user_id None ise genel bildirimleri getir.
+        Bildirimleri tek bir çok satırlı INSERT ile ekler. Commit ETMEZ;
+        çağıran tarafın transaction'ına (ör. stok hareketi) dahil olur. Akış (SSE)
+        olayları transaction commit edildiğinde yayınlanır.
         """
-        query = self.db.query(Notification)
-        
-        if user_id:
-            # Kullanıcıya özel veya genel bildirimler
-            query = query.filter(
-                (Notification.user_id == user_id) | (Notification.user_id.is_(None))
-            )
+        if not notifications:
+            return
+        created = self.db.scalars(
+            insert(Notification).returning(Notification), [n.model_dump() for n in notifications]
+        ).all()
+        for user_id, count in Counter(n.user_id for n in notifications).items():
+            if user_id is None:
+                self._bump_global(count)
+            else:
+                self._bump_unread(user_id, count)
+        for notification in created:
+            self._publish_created(notification, after_commit=True)
+
+    def _publish_created(self, notification: Notification, after_commit: bool = False) -> None:
+        data = NotificationRead.model_validate(notification).model_dump(mode="json")
+        if after_commit:
+            notification_bus.publish_after_commit(self.db, "notification", notification.user_id, data)
         else:
-            # Sadece genel bildirimler
-            query = query.filter(Notification.user_id.is_(None))
-        
-        return query.order_by(Notification.created_at.desc()).limit(limit).all()
+            notification_bus.publish("notification", notification.user_id, data)
 
-    def get_unread_count(self, user_id: Optional[int] = None) -> int:
-        """Okunmamış bildirim sayısı"""
-        query = self.db.query(Notification).filter(Notification.is_read == False)
-        
-        if user_id:
-            query = query.filter(
-                (Notification.user_id == user_id) | (Notification.user_id.is_(None))
+    # -----------------------------
+    # Okunmamış sayaçları
+    # -----------------------------
+
+    def _bump_unread(self, user_id: int, delta: int) -> None:
+        """
+        Kullanıcının kişisel okunmamış sayacını `delta` kadar değiştirir. Genel bildirimler
+        kullanıcı sayaçlarına yansıtılmaz (tüm kullanıcıların satırını kilitlerdi); tek satırlık
+        genel sayaçta tutulur. Sayaç satırı olmayan kullanıcı etkilenmez; satırı ilk ihtiyaçta
+        sayılarak oluşturulur. Commit ETMEZ.
+        """
+        self.db.execute(
+            update(NotificationUserState)
+            .where(NotificationUserState.user_id == user_id)
+            .values(unread_count=NotificationUserState.unread_count + delta)
+        )
+
+    def _bump_global_read(self, user_id: int, delta: int) -> None:
+        """Kullanıcının okuduğu genel bildirim sayısını `delta` kadar değiştirir. Commit ETMEZ."""
+        self.db.execute(
+            update(NotificationUserState)
+            .where(NotificationUserState.user_id == user_id)
+            .values(global_read_count=NotificationUserState.global_read_count + delta)
+        )
+
+    def _bump_global(self, delta: int) -> None:
+        """
+        Genel bildirim sayacını `delta` kadar artırır (eklenen satırlar flush edilmiş olmalı).
+        Sayaç satırı yoksa bildirimlerden sayılarak oluşturulur; sayım eklenen satırları
+        içerdiğinden bu durumda ayrıca artırılmaz. Commit ETMEZ.
+        """
+        result = self.db.execute(
+            update(NotificationGlobalCounter)
+            .where(NotificationGlobalCounter.id == 1)
+            .values(total_count=NotificationGlobalCounter.total_count + delta)
+        )
+        if result.rowcount == 0:
+            self._ensure_global()
+
+    def _ensure_global(self) -> int:
+        """Genel sayaç satırını (yoksa sayarak) oluşturur; toplam genel bildirim sayısını döner."""
+        total = self.db.query(NotificationGlobalCounter.total_count).filter(
+            NotificationGlobalCounter.id == 1
+        ).scalar()
+        if total is not None:
+            return total
+
+        stmt = dialect_insert(self.db, NotificationGlobalCounter).values(
+            id=1, total_count=self._count_global(None)
+        )
+        self.db.execute(stmt.on_conflict_do_nothing(index_elements=["id"]))
+        return self.db.query(NotificationGlobalCounter.total_count).filter(
+            NotificationGlobalCounter.id == 1
+        ).scalar()
+
+    def _count_unread(self, user_id: int) -> int:
+        return self.db.query(func.count(Notification.id)).filter(
+            Notification.user_id == user_id, Notification.is_read == False
+        ).scalar()
+
+    def _count_global(self, through: Optional[int]) -> int:
+        """Genel bildirim sayısı; `through` verilirse id'si bu değere kadar olanlar."""
+        query = self.db.query(func.count(Notification.id)).filter(Notification.user_id.is_(None))
+        if through is not None:
+            query = query.filter(Notification.id <= through)
+        return query.scalar()
+
+    def _count_global_read(self, user_id: int, global_read_through: int) -> int:
+        """Filigrana kadar olan genel bildirimler + filigranın üzerinde tek tek okunanlar."""
+        return self._count_global(global_read_through) + self.db.query(
+            func.count(NotificationReadEntry.notification_id)
+        ).filter(
+            NotificationReadEntry.user_id == user_id,
+            NotificationReadEntry.notification_id > global_read_through,
+        ).scalar()
+
+    def _ensure_state(self, user_id: int) -> int:
+        """Kullanıcının sayaç satırını (yoksa sayarak) oluşturur; global_read_through döner."""
+        watermark = self.db.query(NotificationUserState.global_read_through).filter(
+            NotificationUserState.user_id == user_id
+        ).scalar()
+        if watermark is not None:
+            return watermark
+
+        stmt = dialect_insert(self.db, NotificationUserState).values(
+            user_id=user_id,
+            unread_count=self._count_unread(user_id),
+            global_read_through=0,
+            global_read_count=self._count_global_read(user_id, 0),
+        )
+        self.db.execute(stmt.on_conflict_do_nothing(index_elements=["user_id"]))
+        return self.db.query(NotificationUserState.global_read_through).filter(
+            NotificationUserState.user_id == user_id
+        ).scalar()
+
+    def recount(self) -> int:
+        """
+        Tüm sayaçları (kullanıcı sayaçları ve genel sayaç) bildirimlerden yeniden hesaplar
+        (bakım); düzeltilen satır sayısını döner.
+        """
+        fixed = 0
+        states = self.db.query(
+            NotificationUserState.user_id,
+            NotificationUserState.unread_count,
+            NotificationUserState.global_read_through,
+            NotificationUserState.global_read_count,
+        ).all()
+        for user_id, unread_count, watermark, global_read_count in states:
+            actual = (self._count_unread(user_id), self._count_global_read(user_id, watermark))
+            if actual != (unread_count, global_read_count):
+                self.db.execute(
+                    update(NotificationUserState)
+                    .where(NotificationUserState.user_id == user_id)
+                    .values(unread_count=actual[0], global_read_count=actual[1])
+                )
+                fixed += 1
+
+        total = self._count_global(None)
+        if self._ensure_global() != total:
+            self.db.execute(
+                update(NotificationGlobalCounter)
+                .where(NotificationGlobalCounter.id == 1)
+                .values(total_count=total)
             )
-        else:
-            query = query.filter(Notification.user_id.is_(None))
-        
-        return query.count()
+            fixed += 1
+        self.db.commit()
+        return fixed
+
+    def _feed(self, condition, limit: int, before: Optional[tuple[datetime, int]]):
+        query = select(Notification).where(condition)
+        if before is not None:
+            query = query.where(tuple_(Notification.created_at, Notification.id) < tuple_(*before))
+        return query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
+
+    def get_by_user(
+        self,
+        user_id: Optional[int] = None,
+        limit: int = 50,
+        before: Optional[tuple[datetime, int]] = None,
+    ) -> List[Notification]:
+        """
+        Kullanıcıya özel ve genel bildirimleri (created_at DESC, id DESC) sırasıyla getirir;
+        user_id None ise yalnızca genel bildirimleri. `before` bir önceki sayfanın son
+        satırının (created_at, id) çiftidir (keyset sayfalama).
+
+        `user_id = ? OR user_id IS NULL` tek bir index'le karşılanamadığından iki akış
+        ayrı ayrı (her biri kendi index'inden en fazla `limit` satır) okunur ve UNION ALL
+        ile birleştirilip yeniden sıralanır; sıralanan satır sayısı en fazla 2 * limit'tir.
+        """
+        global_feed = self._feed(Notification.user_id.is_(None), limit, before)
+        if not user_id:
+            return self.db.execute(global_feed).scalars().all()
+
+        user_feed = self._feed(Notification.user_id == user_id, limit, before)
+        merged = union_all(
+            select(user_feed.subquery()), select(global_feed.subquery())
+        ).subquery()
+        feed = aliased(Notification, merged)
+        return (
+            self.db.execute(
+                select(feed).order_by(merged.c.created_at.desc(), merged.c.id.desc()).limit(limit)
+            )
+            .scalars()
+            .all()
+        )
+
+    def get_global_read_state(self, user_id: int, notification_ids: List[int]) -> dict:
+        """
+        Verilen genel bildirimlerden kullanıcının okuduklarını {id: read_at} olarak döner
+        (filigran altında kalanlar için read_at None'dır).
+        """
+        watermark = self.db.query(NotificationUserState.global_read_through).filter(
+            NotificationUserState.user_id == user_id
+        ).scalar() or 0
+        state = {notification_id: None for notification_id in notification_ids if notification_id <= watermark}
+        rest = [notification_id for notification_id in notification_ids if notification_id > watermark]
+        if rest:
+            state.update(
+                self.db.query(NotificationReadEntry.notification_id, NotificationReadEntry.read_at)
+                .filter(
+                    NotificationReadEntry.user_id == user_id,
+                    NotificationReadEntry.notification_id.in_(rest),
+                )
+                .all()
+            )
+        return state
+
+    def get_unread_count(self, user_id: Optional[int] = None) -> int:
+        """
+        Okunmamış bildirim sayısı. Kullanıcı için iki tek satır okumasıdır: kişisel sayaç +
+        (genel sayaç - kullanıcının okuduğu genel bildirim sayısı). Satırlar yoksa bir kez
+        sayılarak oluşturulur.
+        """
+        if not user_id:
+            return self.db.query(func.count(Notification.id)).filter(
+                Notification.user_id.is_(None), Notification.is_read == False
+            ).scalar()
+
+        state = self.db.query(
+            NotificationUserState.unread_count, NotificationUserState.global_read_count
+        ).filter(NotificationUserState.user_id == user_id).first()
+        global_total = self.db.query(NotificationGlobalCounter.total_count).filter(
+            NotificationGlobalCounter.id == 1
+        ).scalar()
+        if state is None or global_total is None:
+            self._ensure_state(user_id)
+            global_total = self._ensure_global()
+            self.db.commit()
+            state = self.db.query(
+                NotificationUserState.unread_count, NotificationUserState.global_read_count
+            ).filter(NotificationUserState.user_id == user_id).first()
+        personal, global_read = state
+        return personal + global_total - global_read
 
     def mark_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
         """
         Bildirimi okundu olarak işaretle.
-        Sadece kullanıcının kendi bildirimini işaretlemesine izin verilir.
+        Kullanıcı kendi bildirimlerini ve genel bildirimleri işaretleyebilir; genel
+        bildirimin okunma durumu yalnızca bu kullanıcı için (`notification_reads`) tutulur.
         """
         notification = self.db.query(Notification).filter(
             Notification.id == notification_id,
-            Notification.user_id == user_id
+            (Notification.user_id == user_id) | (Notification.user_id.is_(None)),
         ).first()
-        
-        if notification:
+        if not notification:
+            return None
+
+        watermark = self._ensure_state(user_id)
+        if notification.user_id is None:
+            if notification.id > watermark:
+                stmt = dialect_insert(self.db, NotificationReadEntry).values(
+                    user_id=user_id, notification_id=notification.id
+                )
+                result = self.db.execute(
+                    stmt.on_conflict_do_nothing(index_elements=["user_id", "notification_id"])
+                )
+                if result.rowcount == 1:
+                    self._bump_global_read(user_id, 1)
+        elif not notification.is_read:
             notification.is_read = True
             notification.read_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(notification)
+            self._bump_unread(user_id, -1)
+
+        notification_bus.publish_after_commit(self.db, "read", user_id, {"notification_id": notification.id})
+        self.db.commit()
+        self.db.refresh(notification)
         return notification
 
     def mark_all_as_read(self, user_id: int) -> int:
         """
-        Tüm KİŞİSEL bildirimleri okundu olarak işaretle.
-        Global bildirimler (user_id=None) etkilenmez çünkü başkasının verisini bozar.
+        Kullanıcının tüm kişisel bildirimlerini ve (kendisi için) tüm genel bildirimleri
+        okundu işaretler. Genel bildirimler için satır yazılmaz; kullanıcının filigranı son
+        genel bildirime ilerletilir. İşaretlenen bildirim sayısını döner.
         """
-        # Sadece bu kullanıcıya ait olanları güncelle
-        query = self.db.query(Notification).filter(
+        watermark = self._ensure_state(user_id)
+
+        personal = self.db.query(Notification).filter(
             Notification.is_read == False,
             Notification.user_id == user_id
-        )
-        
-        count = query.update({
+        ).update({
             "is_read": True,
             "read_at": datetime.utcnow()
-        })
+        }, synchronize_session=False)
+
+        latest = self.db.query(func.max(Notification.id)).filter(Notification.user_id.is_(None)).scalar()
+        global_marked = 0
+        if latest is not None and latest > watermark:
+            global_marked = self.db.query(func.count(Notification.id)).filter(
+                Notification.user_id.is_(None),
+                Notification.id > watermark,
+                Notification.id <= latest,
+            ).scalar() - self.db.query(func.count(NotificationReadEntry.notification_id)).filter(
+                NotificationReadEntry.user_id == user_id,
+                NotificationReadEntry.notification_id > watermark,
+                NotificationReadEntry.notification_id <= latest,
+            ).scalar()
+            # Filigran altında kalan tekil okuma kayıtlarına artık gerek yok
+            self.db.query(NotificationReadEntry).filter(
+                NotificationReadEntry.user_id == user_id,
+                NotificationReadEntry.notification_id <= latest,
+            ).delete(synchronize_session=False)
+            self.db.execute(
+                update(NotificationUserState)
+                .where(NotificationUserState.user_id == user_id)
+                .values(
+                    global_read_through=latest,
+                    global_read_count=NotificationUserState.global_read_count + global_marked,
+                )
+            )
+
+        self._bump_unread(user_id, -personal)
+        notification_bus.publish_after_commit(self.db, "read", user_id, {"all": True})
         self.db.commit()
-        return count
+        return personal + global_marked
 
     def delete(self, notification_id: int, user_id: int) -> bool:
         """
@@ -93,7 +364,10 @@ class NotificationRepository:
         ).first()
         
         if notification:
+            if not notification.is_read:
+                self._bump_unread(user_id, -1)
             self.db.delete(notification)
+            notification_bus.publish_after_commit(self.db, "deleted", user_id, {"notification_id": notification_id})
             self.db.commit()
             return True
         return False
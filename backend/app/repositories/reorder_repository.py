@@ -0,0 +1,63 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.core.database import dialect_insert
+from app.models.sponges import Sponge
+from app.models.stock_balances import StockBalance
+from app.models.sponge_reorder_points import SpongeReorderPoint
+
+
+class ReorderRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stale(self, default_lead_time: int, full: bool = False,
+                  computed_before: datetime | None = None):
+        """
+        Yeniden hesaplanması gereken süngerler: (sponge_id, lead_time_days, balance_version).
+        Sonucu hiç olmayan, son hesaplamadan beri bakiye sürümü değişen (yeni hareket),
+        tedarik süresi değişen veya sonucu `computed_before`'dan eski olan (geçmiş penceresi
+        kaymış) süngerler döner; full=True ise tüm süngerler.
+        """
+        lead_time = func.coalesce(Sponge.lead_time_days, default_lead_time)
+        version = func.coalesce(StockBalance.version, 0)
+        query = (
+            self.db.query(Sponge.id, lead_time, version)
+            .outerjoin(StockBalance, StockBalance.sponge_id == Sponge.id)
+            .outerjoin(SpongeReorderPoint, SpongeReorderPoint.sponge_id == Sponge.id)
+        )
+        if not full:
+            stale = (
+                (SpongeReorderPoint.sponge_id.is_(None))
+                | (SpongeReorderPoint.balance_version != version)
+                | (SpongeReorderPoint.lead_time_days != lead_time)
+            )
+            if computed_before is not None:
+                stale = stale | (SpongeReorderPoint.computed_at < computed_before)
+            query = query.filter(stale)
+        return query.order_by(Sponge.id).all()
+
+    def save(self, rows: list[dict]) -> None:
+        """Sonuçları tek bir çok satırlı UPSERT ile yazar. Commit ETMEZ."""
+        if not rows:
+            return
+        stmt = dialect_insert(self.db, SpongeReorderPoint)
+        columns = [
+            "avg_daily_demand", "demand_std", "lead_time_days", "safety_stock",
+            "reorder_point", "order_up_to", "order_quantity", "balance_version",
+        ]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sponge_id"],
+            set_={**{c: stmt.excluded[c] for c in columns}, "computed_at": func.now()},
+        )
+        self.db.execute(stmt, rows)
+
+    def get_all(self):
+        """Sonuçlar, süngerin adı ve mevcut stoğuyla: (SpongeReorderPoint, name, on_hand)."""
+        return (
+            self.db.query(SpongeReorderPoint, Sponge.name, func.coalesce(StockBalance.on_hand, 0))
+            .join(Sponge, Sponge.id == SpongeReorderPoint.sponge_id)
+            .outerjoin(StockBalance, StockBalance.sponge_id == SpongeReorderPoint.sponge_id)
+            .order_by(SpongeReorderPoint.sponge_id)
+            .all()
+        )
@@ -1,76 +1,288 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, case, cast, Float # <--- case IMPORT ETTİK
-from datetime import datetime, timedelta
+from sqlalchemy import func, extract, case, cast, select, Float, Integer, Date # <--- case IMPORT ETTİK
+from datetime import date, datetime, timedelta
+from itertools import chain
 from app.models.stocks import Stock, StockType
 from app.models.sponges import Sponge
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.models.stock_balances import StockBalance
+from app.models.reports import Report, ReportType
+from app.models.sponge_reorder_points import SpongeReorderPoint
+from app.core.database import dialect_insert
+from app.repositories.ledger import movement_rows
 
 class ReportRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_weekly_summary(self):
-        one_week_ago = datetime.utcnow() - timedelta(days=7)
-        result = (
+    def _bucket_expr(self, granularity: str):
+        """
+        Günlük özet satırının ait olduğu zaman diliminin başlangıç gününü veren ifade.
+        week: ISO hafta (Pazartesi), quarter: çeyreğin ilk günü.
+        """
+        day = StockDailyRollup.day
+        if granularity == "day":
+            return day
+        if self.db.get_bind().dialect.name == "postgresql":
+            return cast(func.date_trunc(granularity, day), Date)
+
+        # SQLite: strftime/date fonksiyonlarıyla aynı sınırlar
+        if granularity == "week":
+            weekday = (cast(func.strftime("%w", day), Integer) + 6) % 7
+            return func.date(day, func.printf("-%d days", weekday))
+        if granularity == "month":
+            return func.date(day, "start of month")
+        if granularity == "quarter":
+            month = cast(func.strftime("%m", day), Integer)
+            return func.printf(
+                "%04d-%02d-01", cast(func.strftime("%Y", day), Integer), ((month - 1) // 3) * 3 + 1
+            )
+        raise ValueError(f"Geçersiz granularity: {granularity}")
+
+    def get_period_summary(self, start: date, end: date, granularity: str = "day"):
+        """
+        [start, end) yarı açık gün aralığında, zaman dilimi ve sünger bazında giriş
+        (giriş + iade) / çıkış toplamlarını tek sorguda döner: (bucket, name, total_in, total_out).
+
+        Kaynak günlük özet tablosudur; filtre `day` kolonu üzerinde düz aralık
+        karşılaştırmasıdır (extract vb. yok), böylece `idx_rollup_day_sponge` kullanılır ve
+        okunan satır sayısı hareket sayısına değil, sünger x gün sayısına bağlıdır.
+        """
+        return self._period_summary_query(start, end, granularity).all()
+
+    def iter_period_summary(self, start: date, end: date, granularity: str = "day", batch_size: int = 1000):
+        """
+        get_period_summary'nin akış sürümü: satırlar sunucu tarafı cursor ile
+        `batch_size`'lık partiler halinde okunur (dosya dışa aktarımı için).
+        """
+        yield from self._period_summary_query(start, end, granularity).execution_options(
+            yield_per=batch_size, stream_results=True
+        )
+
+    def _period_summary_query(self, start: date, end: date, granularity: str):
+        bucket = self._bucket_expr(granularity).label("bucket")
+        return (
             self.db.query(
+                bucket,
                 Sponge.name,
-                func.coalesce(func.sum(case(
-                    (Stock.type.in_([StockType.in_, StockType.return_]), Stock.quantity),
-                    else_=0
-                )), 0).label("total_in"),
-                func.coalesce(func.sum(case(
-                    (Stock.type == StockType.out, Stock.quantity),
-                    else_=0
-                )), 0).label("total_out")
+                func.coalesce(func.sum(StockDailyRollup.total_in + StockDailyRollup.total_return), 0).label("total_in"),
+                func.coalesce(func.sum(StockDailyRollup.total_out), 0).label("total_out")
             )
-            .join(Sponge, Sponge.id == Stock.sponge_id)
-            .filter(Stock.date >= one_week_ago)
-            .group_by(Sponge.name)
-            .all()
+            .join(Sponge, Sponge.id == StockDailyRollup.sponge_id)
+            .filter(StockDailyRollup.day >= start)
+            .filter(StockDailyRollup.day < end)
+            .group_by(bucket, Sponge.name)
+            # Silinen hareketler yüzünden sıfırlanmış satırlar rapora girmez
+            .having(func.sum(StockDailyRollup.movement_count) > 0)
+            .order_by(bucket, Sponge.name)
         )
-        return result
 
-    def get_monthly_summary(self):
-        current_month = datetime.utcnow().month
-        current_year = datetime.utcnow().year
-        result = (
+    def _day_offset_expr(self, start: date):
+        """Günlük özet satırının `start`'a göre gün farkı (tamsayı)."""
+        if self.db.get_bind().dialect.name == "postgresql":
+            return StockDailyRollup.day - start
+        return cast(func.julianday(StockDailyRollup.day) - func.julianday(start.isoformat()), Integer)
+
+    def iter_daily_consumption(self, start: date, end: date, sponge_ids: list[int] | None = None):
+        """
+        [start, end) aralığında sünger x gün net tüketimini (çıkış - iade) tek sorguda okur ve
+        (sponge_id, gün_offseti, tüketim) değerlerini düz bir sayı akışı olarak döner
+        (`np.fromiter` ile doğrudan diziye çevrilebilir). Gün, `start`'a göre tamsayı offsettir.
+        `sponge_ids` verilirse yalnızca o süngerler okunur.
+
+        Yalnızca sayısal kolonlar okunduğundan satırlar DBAPI imlecinden doğrudan alınır;
+        milyon satırlık geçmişte SQLAlchemy Row katmanı toplam süreyi birkaç kat artırır.
+        """
+        query = (
+            select(
+                StockDailyRollup.sponge_id,
+                self._day_offset_expr(start),
+                StockDailyRollup.total_out - StockDailyRollup.total_return,
+            )
+            .where(StockDailyRollup.day >= start, StockDailyRollup.day < end)
+            .where((StockDailyRollup.total_out != 0) | (StockDailyRollup.total_return != 0))
+        )
+        if sponge_ids is not None:
+            query = query.where(StockDailyRollup.sponge_id.in_(sponge_ids))
+        result = self.db.connection().execute(query)
+        try:
+            yield from chain.from_iterable(result.cursor)
+        finally:
+            result.close()
+
+    def get_sponge_balances(self, sponge_ids: list[int] | None = None):
+        """Süngerler (id sırasıyla) ve mevcut stokları: (id, name, critical_stock, on_hand)."""
+        query = (
             self.db.query(
+                Sponge.id,
                 Sponge.name,
-                func.coalesce(func.sum(case(
-                    (Stock.type.in_([StockType.in_, StockType.return_]), Stock.quantity),
-                    else_=0
-                )), 0).label("total_in"),
-                func.coalesce(func.sum(case(
-                    (Stock.type == StockType.out, Stock.quantity),
-                    else_=0
-                )), 0).label("total_out")
+                Sponge.critical_stock,
+                func.coalesce(StockBalance.on_hand, 0),
             )
-            .join(Sponge, Sponge.id == Stock.sponge_id)
-            .filter(extract("month", Stock.date) == current_month)
-            .filter(extract("year", Stock.date) == current_year)
-            .group_by(Sponge.name)
-            .all()
+            .outerjoin(StockBalance, StockBalance.sponge_id == Sponge.id)
         )
-        return result
+        if sponge_ids is not None:
+            query = query.filter(Sponge.id.in_(sponge_ids))
+        return query.order_by(Sponge.id).all()
 
-    def get_critical_stocks(self):
-        # Having clause içinde aggregate fonksiyonu kullanımı
-        # Stok miktarı: (Girenler + İadeler) - Çıkanlar
-        
-        # Giriş/İade ise +, Çıkış ise - quantity
-        balance_expr = case(
-            (Stock.type.in_([StockType.in_, StockType.return_]), Stock.quantity),
-            else_=-Stock.quantity
+    def get_classification_stats(self, start: date, end: date):
+        """
+        ABC/XYZ sınıflandırması için tüm katalog tek sorguda: her sünger için
+        (id, name, çıkış değeri, günlük net tüketim toplamı, günlük net tüketim kareleri toplamı).
+        Değer [start, end) aralığındaki çıkışların `price * quantity` toplamıdır (fiyatsız
+        hareketler 0 sayılır); tüketim istatistikleri günlük özet tablosundan toplanır.
+        Her iki eksen de defterin tamamını (arşiv dahil) okur; günlük özet arşivlemeden etkilenmez.
+        """
+        since = datetime.combine(start, datetime.min.time())
+        until = datetime.combine(end, datetime.min.time())
+        outs = movement_rows(
+            True, lambda m: (m.type == StockType.out, m.date >= since, m.date < until)
+        ).subquery("outs")
+        value = (
+            select(
+                outs.c.sponge_id,
+                func.sum(func.coalesce(outs.c.price, 0) * outs.c.quantity).label("value"),
+            )
+            .group_by(outs.c.sponge_id)
+            .subquery()
         )
-
-        result = (
+        net = StockDailyRollup.total_out - StockDailyRollup.total_return
+        demand = (
+            select(
+                StockDailyRollup.sponge_id,
+                func.sum(net).label("total"),
+                func.sum(net * net).label("squares"),
+            )
+            .where(StockDailyRollup.day >= start, StockDailyRollup.day < end)
+            .group_by(StockDailyRollup.sponge_id)
+            .subquery()
+        )
+        return (
             self.db.query(
+                Sponge.id,
                 Sponge.name,
-                func.coalesce(func.sum(balance_expr), 0).label("available_stock"),
-                Sponge.critical_stock
+                func.coalesce(value.c.value, 0),
+                func.coalesce(demand.c.total, 0),
+                func.coalesce(demand.c.squares, 0),
+            )
+            .outerjoin(value, value.c.sponge_id == Sponge.id)
+            .outerjoin(demand, demand.c.sponge_id == Sponge.id)
+            .order_by(Sponge.id)
+            .all()
+        )
+
+    def get_critical_stocks(self, dynamic: bool = False):
+        # Mevcut stok (giriş + iade - çıkış) materyalize bakiyelerden okunur;
+        # böylece sorgu `stocks` defterinin (tüm partition'larının) taranmasını gerektirmez.
+        # dynamic=True ise eşik, hesaplanmışsa yeniden sipariş noktasıdır (yoksa critical_stock).
+        threshold = Sponge.critical_stock
+        query = self.db.query(Sponge.name, StockBalance.on_hand.label("available_stock"))
+        if dynamic:
+            threshold = func.coalesce(SpongeReorderPoint.reorder_point, Sponge.critical_stock)
+            query = query.outerjoin(SpongeReorderPoint, SpongeReorderPoint.sponge_id == Sponge.id)
+        result = (
+            query.add_columns(threshold.label("critical_stock"))
+            .join(StockBalance, StockBalance.sponge_id == Sponge.id)
+            .filter(StockBalance.on_hand <= threshold)
+            .order_by(Sponge.id)
+            .all()
+        )
+        return result
+
+    # -----------------------------
+    # Rapor snapshot'ları
+    # -----------------------------
+
+    def get_snapshot(self, report_type: ReportType, period_start: date, period_end: date):
+        return (
+            self.db.query(Report)
+            .filter(
+                Report.report_type == report_type,
+                Report.period_start == period_start,
+                Report.period_end == period_end,
             )
-            .join(Sponge, Sponge.id == Stock.sponge_id)
-            .group_by(Sponge.id, Sponge.name, Sponge.critical_stock) # Group by alanları tam olmalı
-            .having(func.coalesce(func.sum(balance_expr), 0) <= Sponge.critical_stock)
+            .first()
+        )
+
+    def save_snapshot(self, report_type: ReportType, period_start: date, period_end: date,
+                      summary: dict, duration: float, created_by: int | None = None,
+                      built_from: datetime | None = None) -> None:
+        """
+        (rapor türü, dönem) için snapshot'ı yazar; varsa aynı satırın üzerine yazar (UPSERT),
+        böylece satırın id'si, geçmişi ve dışa aktarılan dosyası korunur. Aynı raporu
+        eşzamanlı üreten istekler tek satırda birleşir. `built_from` üretimin başladığı an
+        (naive UTC); üretim sürerken işaretlenen geçersizlik silinmez.
+        """
+        stmt = dialect_insert(self.db, Report).values(
+            report_type=report_type,
+            period_start=period_start,
+            period_end=period_end,
+            summary_json=summary,
+            generated_duration=duration,
+            created_by=created_by,
+            generated_at=func.now(),
+            invalidated_at=None,
+        )
+        invalidated_at = Report.__table__.c.invalidated_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["report_type", "period_start", "period_end"],
+            set_={
+                "summary_json": stmt.excluded.summary_json,
+                "generated_duration": stmt.excluded.generated_duration,
+                "created_by": stmt.excluded.created_by,
+                "generated_at": func.now(),
+                "invalidated_at": (
+                    case((invalidated_at > built_from, invalidated_at), else_=None)
+                    if built_from is not None else None
+                ),
+            },
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def get_stale_snapshots(self, report_type: ReportType) -> list[Report]:
+        return (
+            self.db.query(Report)
+            .filter(Report.report_type == report_type, Report.invalidated_at.isnot(None))
+            .order_by(Report.period_start)
             .all()
         )
-        return result
\ No newline at end of file
+
+    def get_history(self, report_type: ReportType | None = None, limit: int = 50):
+        query = self.db.query(Report)
+        if report_type is not None:
+            query = query.filter(Report.report_type == report_type)
+        return query.order_by(Report.generated_at.desc(), Report.id.desc()).limit(limit).all()
+
+    def get_report(self, report_id: int):
+        return self.db.query(Report).filter(Report.id == report_id).first()
+
+    def set_file_path(self, report_id: int, file_path: str) -> bool:
+        """Dışa aktarılan dosyanın yolunu kaydeder; snapshot bu arada silindiyse False döner."""
+        updated = (
+            self.db.query(Report)
+            .filter(Report.id == report_id)
+            .update({Report.file_path: file_path}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+    def get_file_paths(self) -> set[str]:
+        return {
+            row[0] for row in
+            self.db.query(Report.file_path).filter(Report.file_path.isnot(None)).all()
+        }
+
+    def invalidate_snapshots(self, first_day: date, last_day: date) -> None:
+        """
+        [first_day, last_day] günlerine düşen geriye tarihli hareketlerden etkilenen kapanmış
+        dönem snapshot'larını geçersiz (stale) işaretler; satırlar silinmez. Açık dönemler
+        saklanmadığından günceli etkileyen hareketlerde hiçbir satır eşleşmez ve kilitlenmez.
+        Kritik stok snapshot'ları ana ait kayıt olduğundan işaretlenmez. Commit ETMEZ.
+        """
+        self.db.query(Report).filter(
+            Report.report_type != ReportType.critical,
+            Report.period_end > first_day,
+            Report.period_start <= last_day,
+            Report.invalidated_at.is_(None),
+        ).update({Report.invalidated_at: datetime.utcnow()}, synchronize_session=False)
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, update
+from app.core.database import dialect_insert
+from app.models.scheduled_jobs import ScheduledJob
+
+
+class ScheduledJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def register(self, names: list[str], first_run_at: datetime) -> None:
+        """Eksik iş satırlarını oluşturur; var olanlara (ve durumlarına) dokunmaz."""
+        if not names:
+            return
+        self.db.execute(
+            dialect_insert(self.db, ScheduledJob).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": name, "next_run_at": first_run_at, "run_count": 0, "failure_count": 0} for name in names],
+        )
+        self.db.commit()
+
+    def try_acquire(self, name: str, owner: str, now: datetime, lease_seconds: int) -> bool:
+        """
+        İş zamanı gelmişse ve kirası boşta/süresi dolmuşsa kirayı `owner` adına alır.
+        Tek bir koşullu UPDATE'tir; aynı anda deneyen replikalardan yalnızca biri
+        satırı günceller (rowcount == 1).
+        """
+        result = self.db.execute(
+            update(ScheduledJob)
+            .where(
+                ScheduledJob.name == name,
+                ScheduledJob.next_run_at <= now,
+                or_(ScheduledJob.lease_expires_at.is_(None), ScheduledJob.lease_expires_at < now),
+            )
+            .values(
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                last_started_at=now,
+            )
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def finish(self, name: str, owner: str, finished_at: datetime, duration: float,
+               next_run_at: datetime, error: str | None = None) -> None:
+        """Kirayı bırakır ve çalıştırma sonucunu kaydeder (yalnızca kira sahibi)."""
+        self.db.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.name == name, ScheduledJob.lease_owner == owner)
+            .values(
+                lease_owner=None,
+                lease_expires_at=None,
+                last_finished_at=finished_at,
+                last_duration=duration,
+                last_status="failed" if error else "success",
+                last_error=error,
+                run_count=ScheduledJob.run_count + 1,
+                failure_count=ScheduledJob.failure_count + (1 if error else 0),
+                next_run_at=next_run_at,
+            )
+        )
+        self.db.commit()
+
+    def get_all(self) -> list[ScheduledJob]:
+        return self.db.query(ScheduledJob).order_by(ScheduledJob.name).all()
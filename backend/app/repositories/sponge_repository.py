@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.sponges import Sponge
 from app.schemas.sponge_schema import SpongeCreate
+from app.core.cache import stock_cache
+from app.repositories.stock_alert_repository import StockAlertRepository
 
 class SpongeRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,13 @@ class SpongeRepository:
     def get_by_id(self, sponge_id: int):
         return self.db.query(Sponge).filter(Sponge.id == sponge_id).first()
 
+    def get_existing_ids(self, sponge_ids) -> set[int]:
+        """Verilen id'lerden veritabanında bulunanları tek sorguda döner."""
+        ids = set(sponge_ids)
+        if not ids:
+            return set()
+        return {row[0] for row in self.db.query(Sponge.id).filter(Sponge.id.in_(ids)).all()}
+
     def get_by_name(self, name: str):
         return self.db.query(Sponge).filter(Sponge.name == name).first()
 
@@ -21,6 +30,7 @@ class SpongeRepository:
             obj = Sponge(**sponge.model_dump())
             self.db.add(obj)
             self.db.commit()
+            stock_cache.invalidate()
             self.db.refresh(obj)
             return obj
         except IntegrityError:
@@ -36,7 +46,11 @@ class SpongeRepository:
             if value is not None:
                 setattr(obj, key, value)
 
+        # Kritik eşik değişmiş olabilir; uyarı durumu aynı transaction'da güncellenir
+        self.db.flush()
+        StockAlertRepository(self.db).evaluate([sponge_id])
         self.db.commit()
+        stock_cache.invalidate()
         self.db.refresh(obj)
         return obj
 
@@ -47,4 +61,5 @@ class SpongeRepository:
 
         self.db.delete(obj)
         self.db.commit()
+        stock_cache.invalidate()
         return obj
@@ -0,0 +1,87 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.core.database import dialect_insert
+from app.models.sponges import Sponge
+from app.models.stock_balances import StockBalance
+from app.models.stock_alert_states import StockAlertState
+from app.repositories.notification_digest_repository import NotificationDigestRepository
+from app.schemas.notification_schema import NotificationCreate
+
+
+def _transition_notification(name: str, on_hand: float, critical_stock: float, is_critical: bool) -> NotificationCreate:
+    if is_critical:
+        return NotificationCreate(
+            title="⚠️ Kritik Stok Uyarısı",
+            message=f"{name} stoğu kritik seviyede: {on_hand:.0f} / {critical_stock:.0f}",
+            type="warning",
+        )
+    return NotificationCreate(
+        title="✅ Stok Normale Döndü",
+        message=f"{name} stoğu kritik seviyenin üzerine çıktı: {on_hand:.0f} / {critical_stock:.0f}",
+        type="success",
+    )
+
+
+class StockAlertRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.digest_repo = NotificationDigestRepository(db)
+
+    def evaluate(self, sponge_ids: list[int] | None = None) -> list[dict]:
+        """
+        Verilen süngerlerin (None ise tümünün) kritik durumunu mevcut bakiyeye göre yeniden
+        değerlendirir. Yalnızca durumu değişen süngerler için durum satırı güncellenir ve
+        tek bir bildirim eklenir (özet penceresine; NotificationDigestRepository); durumu aynı
+        kalan sünger için hiçbir şey yazılmaz.
+        Kritiklik ölçütü `/reports/critical` ile aynıdır (on_hand <= critical_stock).
+
+        Commit ETMEZ; hareketle aynı transaction'a dahil olur (bakiye satırı bu transaction'da
+        kilitli olduğundan aynı süngere eşzamanlı hareketler sıraya girer). Geçişleri döner.
+        """
+        if sponge_ids is not None and not sponge_ids:
+            return []
+
+        query = (
+            self.db.query(
+                Sponge.id,
+                Sponge.name,
+                Sponge.critical_stock,
+                StockBalance.on_hand,
+                func.coalesce(StockAlertState.is_critical, False).label("was_critical"),
+            )
+            .join(StockBalance, StockBalance.sponge_id == Sponge.id)
+            .outerjoin(StockAlertState, StockAlertState.sponge_id == Sponge.id)
+        )
+        if sponge_ids is not None:
+            query = query.filter(Sponge.id.in_(set(sponge_ids)))
+
+        transitions = []
+        for sponge_id, name, critical_stock, on_hand, was_critical in query.order_by(Sponge.id).all():
+            on_hand, critical_stock = float(on_hand), float(critical_stock or 0)
+            is_critical = on_hand <= critical_stock
+            if is_critical == bool(was_critical):
+                continue
+            transitions.append({
+                "sponge_id": sponge_id, "name": name, "on_hand": on_hand,
+                "critical_stock": critical_stock, "is_critical": is_critical,
+            })
+
+        if not transitions:
+            return []
+
+        now = datetime.utcnow()
+        stmt = dialect_insert(self.db, StockAlertState)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sponge_id"],
+            set_={"is_critical": stmt.excluded.is_critical, "changed_at": stmt.excluded.changed_at},
+        )
+        self.db.execute(stmt, [
+            {"sponge_id": t["sponge_id"], "is_critical": t["is_critical"], "changed_at": now}
+            for t in transitions
+        ])
+        self.digest_repo.add_notifications([
+            _transition_notification(t["name"], t["on_hand"], t["critical_stock"], t["is_critical"])
+            for t in transitions
+        ])
+        return transitions
@@ -0,0 +1,89 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from app.models.stocks import Stock, StockType
+from app.models.stocks_archive import StockArchive
+from app.repositories.ledger import signed_quantity
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.core.cache import stock_cache
+
+OPENING_BALANCE_NOTE = "Açılış bakiyesi (arşivlenen hareketlerin devri)"
+
+_ARCHIVED_COLUMNS = [
+    "id", "sponge_id", "created_by", "quantity", "type", "price", "note", "date", "created_at", "updated_at",
+]
+
+
+class StockArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.balance_repo = StockBalanceRepository(db)
+
+    def _sponges_to_archive(self, cutoff: datetime) -> list[int]:
+        return [
+            row[0] for row in
+            self.db.query(Stock.sponge_id)
+            .filter(Stock.date < cutoff, Stock.is_opening_balance.is_(False))
+            .distinct()
+            .order_by(Stock.sponge_id)
+            .all()
+        ]
+
+    def archive(self, cutoff: datetime) -> dict:
+        """
+        `cutoff` anından eski hareketleri `stocks_archive`'a taşır ve her sünger için
+        önceki açılış bakiyesi + taşınan hareketlerin net etkisini tek bir açılış bakiyesi
+        hareketi (date=cutoff) olarak yazar. Bakiye, günlük özet ve kontrol noktası tabloları
+        değişmez (defterin toplam etkisi aynıdır).
+
+        Her sünger ayrı transaction'da işlenir; bakiye satırı kilitlenerek aynı süngere
+        eşzamanlı yazılan hareketlerle sıraya girilir. İstatistik döner.
+        """
+        stats = {"sponges": 0, "archived": 0}
+        for sponge_id in self._sponges_to_archive(cutoff):
+            try:
+                self.balance_repo.lock_for_update([sponge_id])
+
+                moving = (
+                    Stock.sponge_id == sponge_id,
+                    Stock.date < cutoff,
+                    Stock.is_opening_balance.is_(False),
+                )
+                count, net = self.db.query(
+                    func.count(Stock.id), func.coalesce(func.sum(signed_quantity(Stock)), 0)
+                ).filter(*moving).one()
+                opening = self.db.query(Stock).filter(
+                    Stock.sponge_id == sponge_id, Stock.is_opening_balance.is_(True)
+                ).all()
+                net = float(net) + sum(
+                    -o.quantity if o.type == StockType.out else o.quantity for o in opening
+                )
+
+                self.db.execute(
+                    insert(StockArchive).from_select(
+                        _ARCHIVED_COLUMNS,
+                        select(*(getattr(Stock, col) for col in _ARCHIVED_COLUMNS)).where(*moving),
+                    )
+                )
+                self.db.query(Stock).filter(*moving).delete(synchronize_session=False)
+                for row in opening:
+                    self.db.delete(row)
+
+                if abs(net) > 1e-9:
+                    self.db.add(Stock(
+                        sponge_id=sponge_id,
+                        type=StockType.in_ if net > 0 else StockType.out,
+                        quantity=abs(net),
+                        note=OPENING_BALANCE_NOTE,
+                        date=cutoff,
+                        is_opening_balance=True,
+                    ))
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            stats["sponges"] += 1
+            stats["archived"] += count
+        stock_cache.invalidate()
+        return stats
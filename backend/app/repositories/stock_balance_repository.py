@@ -0,0 +1,266 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, update, bindparam
+from app.models.stocks import Stock, StockType
+from app.models.stock_balances import StockBalance
+from app.models.sponges import Sponge
+from app.core.database import dialect_insert
+from app.core.cache import stock_cache
+from app.repositories.ledger import ledger_movements
+
+
+class InsufficientStockError(ValueError):
+    """Çıkış hareketi için mevcut stok yetersiz."""
+
+
+# Hareket tipine göre bakiye kolonlarına uygulanacak işaretler
+_DELTAS = {
+    StockType.in_: {"on_hand": 1, "total_in": 1},
+    StockType.out: {"on_hand": -1, "total_out": 1},
+    StockType.return_: {"on_hand": 1, "total_return": 1},
+}
+
+
+def ledger_totals_query(db: Session, sponge_ids: list[int] | None = None):
+    """
+    Defterden (canlı hareketler + arşiv) sünger bazında toplamları hesaplayan grup sorgusu.
+    Bakiye tablosunun doğrulanması ve yeniden kurulması için kaynak gerçektir.
+    """
+    ledger = ledger_movements(sponge_ids=sponge_ids)
+
+    def _sum_of(stock_type):
+        return func.coalesce(func.sum(case((ledger.c.type == stock_type, ledger.c.quantity), else_=0)), 0)
+
+    return (
+        db.query(
+            ledger.c.sponge_id.label("sponge_id"),
+            _sum_of(StockType.in_).label("total_in"),
+            _sum_of(StockType.out).label("total_out"),
+            _sum_of(StockType.return_).label("total_return"),
+            func.max(ledger.c.date).label("last_movement_at"),
+        )
+        .group_by(ledger.c.sponge_id)
+    )
+
+
+class StockBalanceRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, sponge_id: int) -> StockBalance | None:
+        return self.db.query(StockBalance).filter(StockBalance.sponge_id == sponge_id).first()
+
+    def get_on_hand(self, sponge_id: int) -> float:
+        on_hand = (
+            self.db.query(StockBalance.on_hand)
+            .filter(StockBalance.sponge_id == sponge_id)
+            .scalar()
+        )
+        return float(on_hand or 0)
+
+    def _ensure_row(self, sponge_id: int) -> None:
+        """Bakiye satırı yoksa sıfır bakiyeyle oluşturur (eşzamanlı eklemelerde çakışmayı yok sayar)."""
+        stmt = (
+            dialect_insert(self.db, StockBalance)
+            .values(sponge_id=sponge_id, on_hand=0, total_in=0, total_out=0, total_return=0, version=0)
+            .on_conflict_do_nothing(index_elements=["sponge_id"])
+        )
+        self.db.execute(stmt)
+
+    def apply_movement(self, sponge_id: int, stock_type: StockType, quantity: float,
+                       moved_at: datetime | None = None, sign: int = 1,
+                       require_available: bool = False) -> None:
+        """
+        Bir hareketin bakiyeye etkisini uygular (sign=-1 ise geri alır).
+
+        require_available=True ise mevcut stoğu azaltan hareket, koşullu bir UPDATE
+        (`WHERE on_hand >= quantity`) ile uygulanır. UPDATE bakiye satırını kilitlediği için
+        aynı sünger için eşzamanlı çıkışlar sıraya girer, farklı süngerler paralel ilerler.
+        Yeterli stok yoksa InsufficientStockError fırlatır.
+
+        Commit ETMEZ; çağıran tarafın transaction'ına dahil olur.
+        """
+        deltas = {col: factor * sign * quantity for col, factor in _DELTAS[StockType(stock_type)].items()}
+
+        values = {col: getattr(StockBalance, col) + delta for col, delta in deltas.items()}
+        values["version"] = StockBalance.version + 1
+        if moved_at is not None and sign > 0:
+            values["last_movement_at"] = case(
+                (StockBalance.last_movement_at.is_(None), moved_at),
+                (StockBalance.last_movement_at < moved_at, moved_at),
+                else_=StockBalance.last_movement_at,
+            )
+
+        stmt = (
+            update(StockBalance)
+            .where(StockBalance.sponge_id == sponge_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if require_available and deltas["on_hand"] < 0:
+            stmt = stmt.where(StockBalance.on_hand >= -deltas["on_hand"])
+
+        if self.db.execute(stmt).rowcount == 1:
+            return
+
+        # Satır yoksa oluşturup bir kez daha dene; yine güncellenemiyorsa stok yetersizdir
+        self._ensure_row(sponge_id)
+        if self.db.execute(stmt).rowcount == 0:
+            raise InsufficientStockError(f"Sponge {sponge_id}: yetersiz stok")
+
+    def lock_for_update(self, sponge_ids: list[int]) -> dict[int, float]:
+        """
+        Verilen süngerlerin bakiye satırlarını (yoksa oluşturarak) kilitler ve
+        mevcut stoklarını döner. Deadlock olmaması için kilitler sponge_id sırasıyla alınır.
+        """
+        ids = sorted(set(sponge_ids))
+        if not ids:
+            return {}
+        existing = {
+            row[0] for row in
+            self.db.query(StockBalance.sponge_id).filter(StockBalance.sponge_id.in_(ids)).all()
+        }
+        for sponge_id in ids:
+            if sponge_id not in existing:
+                self._ensure_row(sponge_id)
+
+        rows = (
+            self.db.query(StockBalance.sponge_id, StockBalance.on_hand)
+            .filter(StockBalance.sponge_id.in_(ids))
+            .order_by(StockBalance.sponge_id)
+            .with_for_update()
+            .all()
+        )
+        return {row.sponge_id: float(row.on_hand) for row in rows}
+
+    def apply_movements(self, movements: list[dict]) -> None:
+        """
+        Çok sayıda hareketin bakiyeye etkisini sünger bazında toplayıp
+        tek bir executemany UPDATE ile uygular. Satırlar önceden `lock_for_update`
+        ile kilitlenmiş / oluşturulmuş olmalıdır. Commit ETMEZ.
+        """
+        aggregated: dict[int, dict] = {}
+        for m in movements:
+            agg = aggregated.setdefault(m["sponge_id"], {
+                "b_sponge_id": m["sponge_id"], "d_on_hand": 0.0, "d_in": 0.0,
+                "d_out": 0.0, "d_return": 0.0, "d_count": 0, "moved_at": None,
+            })
+            stock_type = StockType(m["type"])
+            qty = m["quantity"]
+            agg["d_on_hand"] += -qty if stock_type == StockType.out else qty
+            key = {StockType.in_: "d_in", StockType.out: "d_out", StockType.return_: "d_return"}[stock_type]
+            agg[key] += qty
+            agg["d_count"] += 1
+            if m.get("date") and (agg["moved_at"] is None or m["date"] > agg["moved_at"]):
+                agg["moved_at"] = m["date"]
+
+        if not aggregated:
+            return
+
+        moved_at = bindparam("moved_at", type_=StockBalance.last_movement_at.type)
+        stmt = (
+            update(StockBalance.__table__)
+            .where(StockBalance.__table__.c.sponge_id == bindparam("b_sponge_id"))
+            .values(
+                on_hand=StockBalance.__table__.c.on_hand + bindparam("d_on_hand"),
+                total_in=StockBalance.__table__.c.total_in + bindparam("d_in"),
+                total_out=StockBalance.__table__.c.total_out + bindparam("d_out"),
+                total_return=StockBalance.__table__.c.total_return + bindparam("d_return"),
+                version=StockBalance.__table__.c.version + bindparam("d_count"),
+                last_movement_at=case(
+                    (moved_at.is_(None), StockBalance.__table__.c.last_movement_at),
+                    (StockBalance.__table__.c.last_movement_at.is_(None), moved_at),
+                    (StockBalance.__table__.c.last_movement_at < moved_at, moved_at),
+                    else_=StockBalance.__table__.c.last_movement_at,
+                ),
+            )
+        )
+        self.db.execute(stmt, list(aggregated.values()))
+
+    def _iter_sponge_id_chunks(self, chunk_size: int):
+        """Sünger id'lerini keyset ile sabit boyutlu parçalar halinde döner."""
+        last_id = 0
+        while True:
+            ids = [
+                row[0] for row in
+                self.db.query(Sponge.id)
+                .filter(Sponge.id > last_id)
+                .order_by(Sponge.id)
+                .limit(chunk_size)
+                .all()
+            ]
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def _ledger_chunk(self, sponge_ids: list[int]) -> dict:
+        rows = ledger_totals_query(self.db, sponge_ids).all()
+        return {row.sponge_id: row for row in rows}
+
+    def verify(self, chunk_size: int = 500) -> list[dict]:
+        """
+        Bakiye tablosunu defterle parça parça karşılaştırır ve sapmaları döner.
+        """
+        drift = []
+        for ids in self._iter_sponge_id_chunks(chunk_size):
+            ledger = self._ledger_chunk(ids)
+            balances = {
+                b.sponge_id: b for b in
+                self.db.query(StockBalance).filter(StockBalance.sponge_id.in_(ids)).all()
+            }
+            for sponge_id in ids:
+                expected = ledger.get(sponge_id)
+                exp_in = float(expected.total_in) if expected else 0.0
+                exp_out = float(expected.total_out) if expected else 0.0
+                exp_return = float(expected.total_return) if expected else 0.0
+                exp_on_hand = exp_in + exp_return - exp_out
+
+                balance = balances.get(sponge_id)
+                actual_on_hand = float(balance.on_hand) if balance else 0.0
+                actual = (
+                    (float(balance.total_in), float(balance.total_out), float(balance.total_return))
+                    if balance else (0.0, 0.0, 0.0)
+                )
+                if (
+                    abs(actual_on_hand - exp_on_hand) > 1e-6
+                    or any(abs(a - e) > 1e-6 for a, e in zip(actual, (exp_in, exp_out, exp_return)))
+                ):
+                    drift.append({
+                        "sponge_id": sponge_id,
+                        "expected_on_hand": exp_on_hand,
+                        "actual_on_hand": actual_on_hand,
+                    })
+        return drift
+
+    def rebuild(self, chunk_size: int = 500) -> int:
+        """
+        Bakiyeleri `stocks` defterinden parça parça yeniden hesaplar.
+        Her parça ayrı transaction'da commit edilir. Güncellenen satır sayısını döner.
+        """
+        rebuilt = 0
+        for ids in self._iter_sponge_id_chunks(chunk_size):
+            ledger = self._ledger_chunk(ids)
+            balances = {
+                b.sponge_id: b for b in
+                self.db.query(StockBalance).filter(StockBalance.sponge_id.in_(ids)).all()
+            }
+            for sponge_id in ids:
+                row = ledger.get(sponge_id)
+                balance = balances.get(sponge_id)
+                if row is None and balance is None:
+                    continue
+                if balance is None:
+                    balance = StockBalance(sponge_id=sponge_id, version=0)
+                    self.db.add(balance)
+
+                balance.total_in = float(row.total_in) if row else 0.0
+                balance.total_out = float(row.total_out) if row else 0.0
+                balance.total_return = float(row.total_return) if row else 0.0
+                balance.on_hand = balance.total_in + balance.total_return - balance.total_out
+                balance.last_movement_at = row.last_movement_at if row else None
+                balance.version = (balance.version or 0) + 1
+                rebuilt += 1
+            self.db.commit()
+            stock_cache.invalidate()
+        return rebuilt
@@ -0,0 +1,210 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from app.core.database import dialect_insert
+from app.models.stocks import StockType
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.models.stock_balance_checkpoints import StockBalanceCheckpoint
+from app.repositories.ledger import ledger_movements
+
+_TOTAL_COLUMNS = ("total_in", "total_out", "total_return")
+
+_COLUMN_BY_TYPE = {
+    StockType.in_: "total_in",
+    StockType.out: "total_out",
+    StockType.return_: "total_return",
+}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (month_start(day) + timedelta(days=32)).replace(day=1)
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def _empty_totals() -> dict:
+    return {"total_in": 0.0, "total_out": 0.0, "total_return": 0.0, "on_hand": 0.0}
+
+
+def _with_on_hand(totals: dict) -> dict:
+    totals["on_hand"] = totals["total_in"] + totals["total_return"] - totals["total_out"]
+    return totals
+
+
+class StockCheckpointRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # -----------------------------
+    # Bakım
+    # -----------------------------
+
+    def _periods_after(self, day: date) -> list[date]:
+        return [
+            row[0] for row in
+            self.db.query(StockBalanceCheckpoint.period_start)
+            .filter(StockBalanceCheckpoint.period_start > day)
+            .distinct()
+            .all()
+        ]
+
+    def apply_movements(self, movements: list[dict], sign: int = 1) -> None:
+        """
+        Geriye tarihli hareketlerin (veya silinen eski hareketlerin) etkisini, hareket
+        tarihinden sonraki tüm kontrol noktalarına yansıtır. Olağan durumda (hareket
+        son kontrol noktasından yeni) tek bir index sorgusuyla hiçbir şey yapmadan döner.
+        Commit ETMEZ.
+        """
+        if not movements:
+            return
+        days = [m["date"].date() for m in movements]
+        periods = self._periods_after(min(days))
+        if not periods:
+            return
+
+        aggregated: dict[tuple[int, date], dict] = {}
+        for m, day in zip(movements, days):
+            column = _COLUMN_BY_TYPE[StockType(m["type"])]
+            quantity = sign * m["quantity"]
+            for period in periods:
+                if period <= day:
+                    continue
+                agg = aggregated.setdefault((m["sponge_id"], period), {
+                    "sponge_id": m["sponge_id"], "period_start": period, **_empty_totals(),
+                })
+                agg[column] += quantity
+                agg["on_hand"] += -quantity if column == "total_out" else quantity
+
+        if not aggregated:
+            return
+
+        stmt = dialect_insert(self.db, StockBalanceCheckpoint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sponge_id", "period_start"],
+            set_={
+                col: getattr(StockBalanceCheckpoint, col) + getattr(stmt.excluded, col)
+                for col in (*_TOTAL_COLUMNS, "on_hand")
+            },
+        )
+        self.db.execute(stmt, list(aggregated.values()))
+
+    def build(self, until: date | None = None) -> int:
+        """
+        Eksik aylık kontrol noktalarını, son kontrol noktasından itibaren günlük özet
+        tablosu (`stock_daily_rollups`) üzerinden artımlı olarak üretir.
+        Her dönem ayrı transaction'da yazılır. Oluşturulan dönem sayısını döner.
+        """
+        target = month_start(until or datetime.utcnow().date())
+
+        last = self.db.query(func.max(StockBalanceCheckpoint.period_start)).scalar()
+        if last is None:
+            first_day = self.db.query(func.min(StockDailyRollup.day)).scalar()
+            if first_day is None:
+                return 0
+            previous: dict[int, dict] = {}
+            window_start = None
+            period = next_month(first_day)
+        else:
+            previous = {
+                row.sponge_id: {col: float(getattr(row, col)) for col in (*_TOTAL_COLUMNS, "on_hand")}
+                for row in self.db.query(StockBalanceCheckpoint)
+                .filter(StockBalanceCheckpoint.period_start == last)
+                .all()
+            }
+            window_start = last
+            period = next_month(last)
+
+        built = 0
+        while period <= target:
+            query = self.db.query(
+                StockDailyRollup.sponge_id,
+                func.sum(StockDailyRollup.total_in).label("total_in"),
+                func.sum(StockDailyRollup.total_out).label("total_out"),
+                func.sum(StockDailyRollup.total_return).label("total_return"),
+            ).filter(StockDailyRollup.day < period)
+            if window_start is not None:
+                query = query.filter(StockDailyRollup.day >= window_start)
+
+            current = {sponge_id: dict(totals) for sponge_id, totals in previous.items()}
+            for row in query.group_by(StockDailyRollup.sponge_id).all():
+                totals = current.setdefault(row.sponge_id, _empty_totals())
+                for col in _TOTAL_COLUMNS:
+                    totals[col] += float(getattr(row, col) or 0)
+                _with_on_hand(totals)
+
+            if current:
+                self.db.execute(
+                    dialect_insert(self.db, StockBalanceCheckpoint)
+                    .on_conflict_do_nothing(index_elements=["sponge_id", "period_start"]),
+                    [{"sponge_id": sponge_id, "period_start": period, **totals}
+                     for sponge_id, totals in current.items()],
+                )
+            self.db.commit()
+
+            built += 1
+            previous, window_start = current, period
+            period = next_month(period)
+        return built
+
+    def rebuild(self, until: date | None = None) -> int:
+        """Tüm kontrol noktalarını silip günlük özetlerden yeniden üretir."""
+        self.db.query(StockBalanceCheckpoint).delete(synchronize_session=False)
+        self.db.commit()
+        return self.build(until)
+
+    # -----------------------------
+    # Sorgular
+    # -----------------------------
+
+    def balances_as_of(self, as_of: datetime, sponge_ids: list[int] | None = None) -> dict[int, dict]:
+        """
+        `as_of` anındaki (o an dahil) bakiyeleri sünger bazında döner:
+        en yakın önceki kontrol noktası + o noktadan `as_of`'a kadarki hareketler.
+        Maliyet tüm geçmişe değil, tek bir dönemin hareket sayısına bağlıdır.
+        """
+        period = (
+            self.db.query(func.max(StockBalanceCheckpoint.period_start))
+            .filter(StockBalanceCheckpoint.period_start <= as_of.date())
+            .scalar()
+        )
+
+        result: dict[int, dict] = {}
+        if period is not None:
+            checkpoints = self.db.query(StockBalanceCheckpoint).filter(
+                StockBalanceCheckpoint.period_start == period
+            )
+            if sponge_ids is not None:
+                checkpoints = checkpoints.filter(StockBalanceCheckpoint.sponge_id.in_(sponge_ids))
+            for row in checkpoints.all():
+                result[row.sponge_id] = {col: float(getattr(row, col)) for col in _TOTAL_COLUMNS}
+
+        # Kontrol noktasından sonraki hareketler (canlı + arşiv, açılış bakiyeleri hariç)
+        ledger = ledger_movements(
+            since=_midnight(period) if period is not None else None,
+            until=as_of,
+            until_inclusive=True,
+            sponge_ids=sponge_ids,
+        )
+
+        def _sum_of(stock_type):
+            return func.coalesce(func.sum(case((ledger.c.type == stock_type, ledger.c.quantity), else_=0)), 0)
+
+        delta = self.db.query(
+            ledger.c.sponge_id,
+            _sum_of(StockType.in_).label("total_in"),
+            _sum_of(StockType.out).label("total_out"),
+            _sum_of(StockType.return_).label("total_return"),
+        )
+
+        for row in delta.group_by(ledger.c.sponge_id).all():
+            totals = result.setdefault(row.sponge_id, _empty_totals())
+            for col in _TOTAL_COLUMNS:
+                totals[col] += float(getattr(row, col))
+
+        return {sponge_id: _with_on_hand(totals) for sponge_id, totals in result.items()}
@@ -1,17 +1,71 @@
 from sqlalchemy.orm import Session
 from app.models.stocks import Stock, StockType
 from app.models.sponges import Sponge
+from app.models.stock_balances import StockBalance
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_rollup_repository import StockRollupRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.repositories.ledger import movement_rows
+from app.repositories.report_repository import ReportRepository
+from app.repositories.stock_alert_repository import StockAlertRepository
+from app.core.cache import stock_cache
 from app.schemas.stock_schema import StockCreate
-from sqlalchemy import func
-from datetime import datetime
+from sqlalchemy import insert, select, tuple_
+from datetime import datetime, timedelta
 
 class StockRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.balance_repo = StockBalanceRepository(db)
+        self.rollup_repo = StockRollupRepository(db)
+        self.checkpoint_repo = StockCheckpointRepository(db)
+        self.report_repo = ReportRepository(db)
+        self.alert_repo = StockAlertRepository(db)
+
+    def _invalidate_reports(self, movements: list[dict]) -> None:
+        # Hareketin düştüğü kapanmış dönemlerin rapor snapshot'ları geçersiz işaretlenir
+        days = [m["date"].date() for m in movements]
+        self.report_repo.invalidate_snapshots(min(days), max(days))
 
     def get_all(self):
         return self.db.query(Stock).all()
 
+    def get_page(
+        self,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        sponge_id: int | None = None,
+        stock_type: StockType | None = None,
+        created_by: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Stock]:
+        """
+        Hareketleri (date DESC, id DESC) sırasıyla keyset sayfalama ile döner.
+        `after` bir önceki sayfanın son satırının (date, id) çiftidir; OFFSET kullanılmadığı
+        için her sayfa, sayfa derinliğinden bağımsız sınırlı bir index taramasıdır.
+        Sonraki sayfa olup olmadığının anlaşılması için limit + 1 satır okunur.
+        """
+        query = self.db.query(Stock)
+        if sponge_id is not None:
+            query = query.filter(Stock.sponge_id == sponge_id)
+        if stock_type is not None:
+            query = query.filter(Stock.type == stock_type)
+        if created_by is not None:
+            query = query.filter(Stock.created_by == created_by)
+        if start is not None:
+            query = query.filter(Stock.date >= start)
+        if end is not None:
+            query = query.filter(Stock.date < end)
+        if after is not None:
+            query = query.filter(tuple_(Stock.date, Stock.id) < tuple_(*after))
+
+        return (
+            query.order_by(Stock.date.desc(), Stock.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
     def get_by_id(self, stock_id: int):
         return (
             self.db.query(Stock)
@@ -20,81 +74,224 @@ class StockRepository:
         )
 
     def create(self, stock: StockCreate):
+        """
+        Hareketi kaydeder; bakiyeyi, günlük özeti ve kritik stok uyarı durumunu
+        aynı transaction içinde günceller.
+        Çıkışlarda stok kontrolü bakiye satırı üzerinde atomik yapılır;
+        stok yetersizse InsufficientStockError fırlatılır ve hiçbir şey yazılmaz.
+        """
         # DÜZELTME 1: Pydantic V2 uyumu (dict -> model_dump)
         obj = Stock(**stock.model_dump())
-        self.db.add(obj)
-        self.db.commit()
+        # Bakiye satırının son hareket zamanı için tarihi burada sabitliyoruz
+        if obj.date is None:
+            obj.date = datetime.utcnow()
+        try:
+            # Önce bakiye: satır kilidi alınır, stok kontrolü ve güncelleme tek UPDATE'tir
+            self.balance_repo.apply_movement(
+                obj.sponge_id, obj.type, obj.quantity, obj.date, require_available=True
+            )
+            movement = {"sponge_id": obj.sponge_id, "type": obj.type, "quantity": obj.quantity, "date": obj.date}
+            self.rollup_repo.apply_movements([movement])
+            self.checkpoint_repo.apply_movements([movement])
+            self._invalidate_reports([movement])
+            self.alert_repo.evaluate([obj.sponge_id])
+            self.db.add(obj)
+            self.db.commit()
+            stock_cache.invalidate()
+        except Exception:
+            self.db.rollback()
+            raise
         self.db.refresh(obj)
         return obj
 
+    def bulk_create(self, rows: list[dict], atomic: bool = True) -> tuple[int, list[tuple[int, str]]]:
+        """
+        Çok sayıda hareketi tek transaction içinde yazar.
+
+        - İlgili süngerlerin bakiye satırları sponge_id sırasıyla kilitlenir.
+        - Çıkışlar, satır sırasına göre toplanan deltalarla mevcut stoğa karşı kontrol edilir.
+        - Geçerli satırlar tek bir çok satırlı INSERT (executemany) ile yazılır,
+          bakiyeler sünger başına tek UPDATE, günlük özetler tek UPSERT ile güncellenir.
+
+        atomic=True iken tek bir hata bile varsa hiçbir şey yazılmaz.
+        (eklenen_sayısı, [(index, hata_mesajı), ...]) döner.
+        """
+        available = self.balance_repo.lock_for_update([r["sponge_id"] for r in rows])
+
+        now = datetime.utcnow()
+        accepted, errors = [], []
+        for index, row in enumerate(rows):
+            if StockType(row["type"]) == StockType.out:
+                if row["quantity"] > available[row["sponge_id"]]:
+                    errors.append((index, "Not enough stock"))
+                    continue
+                available[row["sponge_id"]] -= row["quantity"]
+            else:
+                available[row["sponge_id"]] += row["quantity"]
+            accepted.append({**row, "date": row.get("date") or now})
+
+        if (errors and atomic) or not accepted:
+            self.db.rollback()
+            return 0, errors
+
+        try:
+            self.db.execute(insert(Stock), accepted)
+            self.balance_repo.apply_movements(accepted)
+            self.rollup_repo.apply_movements(accepted)
+            self.checkpoint_repo.apply_movements(accepted)
+            self._invalidate_reports(accepted)
+            self.alert_repo.evaluate([row["sponge_id"] for row in accepted])
+            self.db.commit()
+            stock_cache.invalidate()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(accepted), errors
+
     def delete(self, stock_id: int):
+        """
+        Hareketi siler; bakiye, günlük özet, kontrol noktası, rapor geçersizliği ve uyarı
+        durumu aynı transaction'da geri alınır. Herhangi bir adım başarısız olursa hiçbiri yazılmaz.
+        """
         record = self.get_by_id(stock_id)
         if not record:
             return None
-        self.db.delete(record)
-        self.db.commit()
+        try:
+            self.balance_repo.apply_movement(record.sponge_id, record.type, record.quantity, sign=-1)
+            movement = {"sponge_id": record.sponge_id, "type": record.type, "quantity": record.quantity, "date": record.date}
+            self.rollup_repo.apply_movements([movement], sign=-1)
+            self.checkpoint_repo.apply_movements([movement], sign=-1)
+            self._invalidate_reports([movement])
+            self.alert_repo.evaluate([record.sponge_id])
+            self.db.delete(record)
+            self.db.commit()
+            stock_cache.invalidate()
+        except Exception:
+            self.db.rollback()
+            raise
         return record
 
     def get_total_stock(self, sponge_id: int) -> float:
-        records = (
-            self.db.query(Stock)
-            .filter(Stock.sponge_id == sponge_id)
-            .all()
-        )
+        # Materyalize bakiye tablosundan O(1) okuma
+        return self.balance_repo.get_on_hand(sponge_id)
+
+    def get_total_stock_as_of(self, sponge_id: int, as_of: datetime) -> float:
+        balances = self.checkpoint_repo.balances_as_of(as_of, [sponge_id])
+        return balances[sponge_id]["on_hand"] if sponge_id in balances else 0.0
 
-        total = 0.0
-        for r in records:
-            if r.type == StockType.in_ or r.type == StockType.return_:
-                total += r.quantity
-            elif r.type == StockType.out:
-                total -= r.quantity
-        return total
+    def get_summary_as_of(self, as_of: datetime):
+        """
+        get_summary'nin `as_of` anındaki hali; kontrol noktası + dönem içi hareketlerden hesaplanır.
+        """
+        balances = self.checkpoint_repo.balances_as_of(as_of)
+        result = []
+        for sponge in self.db.query(Sponge).order_by(Sponge.id).all():
+            balance = balances.get(sponge.id)
+            result.append({
+                "sponge_id": sponge.id,
+                "name": sponge.name,
+                "total_in": balance["total_in"] if balance else 0,
+                "total_out": balance["total_out"] if balance else 0,
+                "total_return": balance["total_return"] if balance else 0,
+                "current_stock": balance["on_hand"] if balance else 0,
+                "critical_stock": sponge.critical_stock
+            })
+        return result
 
     def get_summary(self):
         """
         Her sünger için toplam giriş, çıkış, iade ve mevcut stok bilgisini döner.
+        Değerler `stock_balances` tablosundan tek sorguda okunur.
         """
-        sponges = self.db.query(Sponge).all()
-        
+        rows = (
+            self.db.query(Sponge, StockBalance)
+            .outerjoin(StockBalance, StockBalance.sponge_id == Sponge.id)
+            .order_by(Sponge.id)
+            .all()
+        )
+
         result = []
-        for sponge in sponges:
-            stocks = self.db.query(Stock).filter(Stock.sponge_id == sponge.id).all()
-            
-            total_in = sum(s.quantity for s in stocks if s.type == StockType.in_)
-            total_out = sum(s.quantity for s in stocks if s.type == StockType.out)
-            total_return = sum(s.quantity for s in stocks if s.type == StockType.return_)
-            
-            current_stock = total_in + total_return - total_out
-            
+        for sponge, balance in rows:
             result.append({
                 "sponge_id": sponge.id,
                 "name": sponge.name,
-                "total_in": total_in,
-                "total_out": total_out,
-                "total_return": total_return,
-                "current_stock": current_stock,
+                "total_in": balance.total_in if balance else 0,
+                "total_out": balance.total_out if balance else 0,
+                "total_return": balance.total_return if balance else 0,
+                "current_stock": balance.on_hand if balance else 0,
                 "critical_stock": sponge.critical_stock
             })
-        
+
         return result
 
-    def get_by_date_range(self, start: str, end: str):
+    @staticmethod
+    def _parse_date_range(start: str, end: str) -> tuple[datetime, datetime] | None:
         """
-        Belirtilen tarih aralığındaki stok hareketlerini döner.
-        start ve end formatı: YYYY-MM-DD
+        YYYY-MM-DD formatındaki aralığı [start 00:00, end+1 gün 00:00) yarı açık aralığına çevirir.
+        Geçersizse None döner.
         """
         try:
             start_date = datetime.strptime(start, "%Y-%m-%d")
             end_date = datetime.strptime(end, "%Y-%m-%d")
-            # End date'i günün sonuna kadar dahil et
-            end_date = end_date.replace(hour=23, minute=59, second=59)
         except ValueError:
+            return None
+        # End date'i günün sonuna kadar dahil et
+        return start_date, end_date + timedelta(days=1)
+
+    def _date_range_filter(self, query, start_date: datetime, end_date: datetime):
+        return query.filter(Stock.date >= start_date).filter(Stock.date < end_date)
+
+    def _archived_range_rows(self, start_date: datetime, end_date: datetime):
+        """Canlı + arşiv hareketlerinin birleşik (archived kolonlu) sorgusu, date DESC."""
+        rows = movement_rows(
+            True, lambda model: (model.date >= start_date, model.date < end_date)
+        ).subquery()
+        return select(rows).order_by(rows.c.date.desc())
+
+    def get_by_date_range(self, start: str, end: str, include_archived: bool = False):
+        """
+        Belirtilen tarih aralığındaki stok hareketlerini döner.
+        start ve end formatı: YYYY-MM-DD
+        include_archived=True ise `stocks_archive`'daki hareketler de (archived=True
+        işaretiyle) eklenir, açılış bakiyesi hareketleri çıkarılır.
+        """
+        date_range = self._parse_date_range(start, end)
+        if date_range is None:
             return []
-        
+
+        if include_archived:
+            return self.db.execute(self._archived_range_rows(*date_range)).all()
+
         return (
-            self.db.query(Stock)
-            .filter(Stock.date >= start_date)
-            .filter(Stock.date <= end_date)
+            self._date_range_filter(self.db.query(Stock), *date_range)
             .order_by(Stock.date.desc())
             .all()
-        )
\ No newline at end of file
+        )
+
+    def iter_by_date_range(self, start: str, end: str, batch_size: int = 1000,
+                           include_archived: bool = False):
+        """
+        get_by_date_range'in akış (streaming) sürümü: ORM nesnesi oluşturmadan,
+        yalnızca gerekli kolonları sunucu tarafı cursor ile `batch_size`'lık
+        partiler halinde okur. Bellek kullanımı satır sayısından bağımsızdır.
+        """
+        date_range = self._parse_date_range(start, end)
+        if date_range is None:
+            return
+
+        if include_archived:
+            yield from self.db.execute(
+                self._archived_range_rows(*date_range),
+                execution_options={"yield_per": batch_size, "stream_results": True},
+            )
+            return
+
+        query = self._date_range_filter(
+            self.db.query(
+                Stock.id, Stock.sponge_id, Stock.type, Stock.quantity,
+                Stock.price, Stock.note, Stock.date, Stock.created_by,
+            ),
+            *date_range,
+        ).order_by(Stock.date.desc())
+
+        yield from query.execution_options(yield_per=batch_size, stream_results=True)
@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, insert, select
+from app.core.database import dialect_insert
+from app.models.stocks import StockType
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.repositories.ledger import ledger_movements
+
+_COLUMN_BY_TYPE = {
+    StockType.in_: "total_in",
+    StockType.out: "total_out",
+    StockType.return_: "total_return",
+}
+
+
+def _day_of(moment) -> date:
+    return moment.date() if isinstance(moment, datetime) else moment
+
+
+class StockRollupRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_movements(self, movements: list[dict], sign: int = 1) -> None:
+        """
+        Hareketleri (sponge_id, gün) bazında toplayıp günlük özet satırlarına ekler
+        (sign=-1 ise düşer). Tek bir executemany UPSERT çalıştırır. Commit ETMEZ.
+        """
+        aggregated: dict[tuple[int, date], dict] = {}
+        for m in movements:
+            key = (m["sponge_id"], _day_of(m["date"]))
+            agg = aggregated.setdefault(key, {
+                "sponge_id": key[0], "day": key[1],
+                "total_in": 0.0, "total_out": 0.0, "total_return": 0.0, "movement_count": 0,
+            })
+            agg[_COLUMN_BY_TYPE[StockType(m["type"])]] += sign * m["quantity"]
+            agg["movement_count"] += sign
+
+        if not aggregated:
+            return
+
+        stmt = dialect_insert(self.db, StockDailyRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sponge_id", "day"],
+            set_={
+                col: getattr(StockDailyRollup, col) + getattr(stmt.excluded, col)
+                for col in ("total_in", "total_out", "total_return", "movement_count")
+            },
+        )
+        self.db.execute(stmt, list(aggregated.values()))
+
+    def rebuild(self, start: date | None = None, end: date | None = None, chunk_days: int = 31) -> int:
+        """
+        Günlük özetleri `stocks` defterinden yeniden hesaplar (catch-up / onarım).
+        [start, end) aralığı `chunk_days`'lik parçalar halinde, her parça ayrı
+        transaction'da işlenir. İşlenen parça sayısını döner.
+        """
+        if start is None:
+            ledger = ledger_movements()
+            first = self.db.query(func.min(ledger.c.date)).scalar()
+            if first is None:
+                return 0
+            start = _day_of(first)
+        if end is None:
+            end = datetime.utcnow().date() + timedelta(days=1)
+
+        chunks = 0
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days), end)
+
+            self.db.query(StockDailyRollup).filter(
+                StockDailyRollup.day >= chunk_start,
+                StockDailyRollup.day < chunk_end,
+            ).delete(synchronize_session=False)
+
+            # Kaynak: canlı hareketler + arşiv (açılış bakiyeleri hariç)
+            ledger = ledger_movements(
+                since=datetime.combine(chunk_start, datetime.min.time()),
+                until=datetime.combine(chunk_end, datetime.min.time()),
+            )
+
+            def _sum_of(stock_type):
+                return func.coalesce(func.sum(case((ledger.c.type == stock_type, ledger.c.quantity), else_=0)), 0)
+
+            day_expr = func.date(ledger.c.date)
+            source = (
+                select(
+                    ledger.c.sponge_id,
+                    day_expr,
+                    _sum_of(StockType.in_),
+                    _sum_of(StockType.out),
+                    _sum_of(StockType.return_),
+                    func.count(ledger.c.id),
+                )
+                .group_by(ledger.c.sponge_id, day_expr)
+            )
+            self.db.execute(
+                insert(StockDailyRollup).from_select(
+                    ["sponge_id", "day", "total_in", "total_out", "total_return", "movement_count"],
+                    source,
+                )
+            )
+            self.db.commit()
+            chunks += 1
+            chunk_start = chunk_end
+        return chunks
@@ -4,6 +4,7 @@ from app.routers import user_router
 from app.routers import report_router
 from app.routers import notification_router
 from app.routers import dashboard_router
+from app.routers import admin_router
 
 __all__ = [
     "sponge_router",
@@ -12,4 +13,5 @@ __all__ = [
     "report_router",
     "notification_router",
     "dashboard_router",
+    "admin_router",
 ]
@@ -0,0 +1,21 @@
+from typing import List
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.utils.auth import get_current_admin
+from app.services.scheduler_service import SchedulerService
+from app.schemas.scheduler_schema import ScheduledJobRead
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/jobs", response_model=List[ScheduledJobRead], status_code=status.HTTP_200_OK)
+def list_scheduled_jobs(
+    db: Session = Depends(get_db),
+    current_admin = Depends(get_current_admin),
+):
+    """
+    Zamanlanmış işler: sonraki çalışma, son çalışma zamanı/süresi/durumu,
+    hata sayısı ve (varsa) kirayı tutan replika.
+    """
+    return SchedulerService(db).list_jobs()
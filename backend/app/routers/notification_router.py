@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.repositories.notification_repository import NotificationRepository
-from app.schemas.notification_schema import NotificationCreate, NotificationRead, NotificationUpdate
+from app.schemas.notification_schema import NotificationCreate, NotificationRead, NotificationUpdate, NotificationPage
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.services.notification_stream import NotificationStream
 from typing import List, Optional
 import logging
 
@@ -12,18 +15,68 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=List[NotificationRead])
+def _for_user(repo: NotificationRepository, user_id: int, notifications) -> List[NotificationRead]:
+    """Genel bildirimlerin is_read / read_at alanlarını kullanıcının kendi okuma durumuyla doldurur."""
+    read_state = repo.get_global_read_state(
+        user_id, [n.id for n in notifications if n.user_id is None]
+    )
+    items = []
+    for notification in notifications:
+        item = NotificationRead.model_validate(notification)
+        if notification.user_id is None:
+            item.is_read = notification.id in read_state
+            item.read_at = read_state.get(notification.id)
+        items.append(item)
+    return items
+
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=NotificationPage)
 def get_notifications(
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Önceki sayfanın next_cursor değeri"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Bildirimleri getir.
-    Kullanıcının kendi bildirimlerini ve genel bildirimleri getirir.
+    Kullanıcının kendi bildirimlerini ve genel bildirimleri en yeniden eskiye,
+    (created_at, id) üzerinde keyset sayfalama ile getirir. Sonraki sayfa için
+    yanıttaki `next_cursor` değeri `before` parametresine verilir.
     """
+    try:
+        cursor = decode_cursor(before) if before else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     repo = NotificationRepository(db)
-    return repo.get_by_user(user_id=current_user.id, limit=limit)
+    rows = repo.get_by_user(user_id=current_user.id, limit=limit + 1, before=cursor)
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return NotificationPage(items=_for_user(repo, current_user.id, items), next_cursor=next_cursor)
+
+
+@router.get("/stream", status_code=status.HTTP_200_OK)
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Server-Sent Events akışı: yeni bildirimler (`notification`), okuma/silme olayları
+    (`read`, `deleted`) ve her değişiklikten sonra güncel `unread_count`. Yeniden bağlanırken
+    `Last-Event-ID` gönderilirse kaçırılan olaylar tekrar gönderilir. Kullanıcı başına
+    açık bağlantı sayısı sınırlıdır (429).
+    """
+    stream = NotificationStream(current_user.id)
+    if not stream.has_capacity():
+        raise HTTPException(status_code=429, detail="Çok fazla açık bildirim akışı")
+    # Kimlik doğrulama bitti; akış boyunca havuzdan bağlantı tutulmasın
+    db.close()
+    return StreamingResponse(
+        stream.events(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/unread-count", status_code=status.HTTP_200_OK)
@@ -31,7 +84,7 @@ def get_unread_count(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Okunmamış bildirim sayısı"""
+    """Okunmamış bildirim sayısı (kullanıcının sayaç satırından tek satır okuma)"""
     repo = NotificationRepository(db)
     count = repo.get_unread_count(user_id=current_user.id)
     return {"unread_count": count}
@@ -42,7 +95,7 @@ def mark_all_read(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Tüm bildirimleri okundu olarak işaretle"""
+    """Tüm bildirimleri (genel bildirimler dahil, yalnızca bu kullanıcı için) okundu olarak işaretle"""
     repo = NotificationRepository(db)
     count = repo.mark_all_as_read(user_id=current_user.id)
     return {"marked_count": count}
@@ -68,13 +121,12 @@ def mark_notification_read(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Bildirimi okundu olarak işaretle"""
+    """Bildirimi okundu olarak işaretle (genel bildirimler yalnızca bu kullanıcı için)"""
     repo = NotificationRepository(db)
     notification = repo.mark_as_read(notification_id, user_id=current_user.id)
     if not notification:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Bildirim bulunamadı")
-    return notification
+    return _for_user(repo, current_user.id, [notification])[0]
 
 
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -87,6 +139,5 @@ def delete_notification(
     repo = NotificationRepository(db)
     success = repo.delete(notification_id, user_id=current_user.id)
     if not success:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Bildirim bulunamadı")
     return None
@@ -1,39 +1,149 @@
+from datetime import date
+from typing import List, Literal, Optional
+import os
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 import logging
 from app.core.database import get_db
 from app.services.report_service import ReportService
+from app.services.forecast_service import ForecastService
+from app.services.classification_service import ClassificationService
+from app.services.reorder_service import ReorderService
+from app.schemas.report_schema import ReportHistoryItem, ReportRead, ReportType
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
+@router.get("/", status_code=status.HTTP_200_OK)
+def get_period_report(
+    start: date = Query(..., description="YYYY-MM-DD (dahil)"),
+    end: date = Query(..., description="YYYY-MM-DD (hariç)"),
+    granularity: Literal["day", "week", "month", "quarter"] = Query("day"),
+    db: Session = Depends(get_db),
+):
+    """
+    [start, end) aralığındaki stok giriş/çıkış raporu; seçilen zaman dilimine göre gruplanır.
+    """
+    return ReportService(db).period_report(start, end, granularity)
+
+
+@router.get("/history", response_model=List[ReportHistoryItem], status_code=status.HTTP_200_OK)
+def get_report_history(
+    report_type: Optional[ReportType] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Saklanan rapor snapshot'ları (en yeni üretilen önce); üretim zamanı ve süresiyle.
+    """
+    return ReportService(db).history(report_type, limit)
+
+
+@router.get("/history/{report_id}", response_model=ReportRead, status_code=status.HTTP_200_OK)
+def get_report_snapshot(report_id: int, db: Session = Depends(get_db)):
+    """
+    Tek bir rapor snapshot'ını içeriğiyle (summary_json) döner.
+    """
+    return ReportService(db).get_snapshot(report_id)
+
+
+@router.get("/history/{report_id}/file", status_code=status.HTTP_200_OK)
+def download_report_file(report_id: int, db: Session = Depends(get_db)):
+    """
+    Dışa aktarılmış rapor dosyasını indirir. `Range` başlığı desteklenir (206 Partial Content),
+    büyük dosyalar parça parça / kaldığı yerden indirilebilir.
+    """
+    path, media_type = ReportService(db).export_file(report_id)
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+
+
+@router.post("/export", status_code=status.HTTP_202_ACCEPTED)
+def export_report(
+    report_type: Literal["weekly", "monthly"] = Query(...),
+    format: Literal["xlsx", "pdf"] = Query("xlsx"),
+    end: Optional[date] = Query(None, description="Haftalık rapor için son gün, YYYY-MM-DD"),
+    month: Optional[str] = Query(None, description="Aylık rapor için YYYY-MM"),
+    db: Session = Depends(get_db),
+):
+    """
+    Raporun XLSX/PDF dosyasını arka planda üretir. Dosya hazır olduğunda
+    `GET /reports/history/{report_id}/file` ile indirilebilir.
+    """
+    return ReportService(db).export(ReportType(report_type), format, end=end, month=month)
+
+
 @router.get("/weekly", status_code=status.HTTP_200_OK)
-def get_weekly_report(db: Session = Depends(get_db)):
+def get_weekly_report(
+    end: Optional[date] = Query(None, description="Raporun son günü, YYYY-MM-DD (varsayılan: bugün)"),
+    db: Session = Depends(get_db),
+):
     """
-    Son 7 gün içindeki stok giriş/çıkış raporu.
+    `end` gününe kadarki son 7 günün stok giriş/çıkış raporu.
+    Kapanmış dönemler saklanan snapshot'tan servis edilir.
     """
     logger.info("Weekly report generated.")
-    return ReportService(db).weekly()
+    return ReportService(db).weekly(end)
 
 
 @router.get("/monthly", status_code=status.HTTP_200_OK)
-def get_monthly_report(db: Session = Depends(get_db)):
+def get_monthly_report(
+    month: Optional[str] = Query(None, description="YYYY-MM (varsayılan: içinde bulunulan ay)"),
+    db: Session = Depends(get_db),
+):
     """
-    İçinde bulunulan aya ait stok hareketleri.
+    Seçilen aya ait stok hareketleri. Kapanmış aylar saklanan snapshot'tan servis edilir.
     """
     logger.info("Monthly report generated.")
-    return ReportService(db).monthly()
+    return ReportService(db).monthly(month)
+
+
+@router.get("/forecast", status_code=status.HTTP_200_OK)
+def get_forecast(
+    history_days: int = Query(90, ge=7, le=1460, description="Kullanılacak geçmiş gün sayısı"),
+    window: int = Query(28, ge=1, le=365, description="Hareketli ortalama penceresi (gün)"),
+    alpha: float = Query(0.3, gt=0, le=1, description="Üstel düzleştirme katsayısı"),
+    db: Session = Depends(get_db),
+):
+    """
+    Sünger bazında günlük tüketim tahmini ve mevcut stoğun kaç gün yeteceği
+    (en kısa süre önce). Tüketim = çıkış - iade.
+    """
+    return ForecastService(db).forecast(history_days, window, alpha)
+
+
+@router.get("/classification", status_code=status.HTTP_200_OK)
+def get_classification(
+    history_days: int = Query(365, ge=7, le=1460, description="Kullanılacak geçmiş gün sayısı"),
+    db: Session = Depends(get_db),
+):
+    """
+    Tüm süngerlerin ABC (çıkış değeri, price * quantity) ve XYZ (günlük talebin
+    varyasyon katsayısı) sınıfları; değere göre azalan sırada.
+    """
+    return ClassificationService(db).classify(history_days)
 
 
 @router.get("/critical", status_code=status.HTTP_200_OK)
 def get_critical_stocks(
     notify: bool = Query(False, description="E-posta bildirimi gönderilsin mi?"),
+    dynamic: bool = Query(False, description="Eşik olarak hesaplanmış yeniden sipariş noktası kullanılsın mı?"),
     db: Session = Depends(get_db),
 ):
     """
     Kritik stok seviyesinin altındaki ürünleri döndürür.
-    notify=True ise e-posta bildirimi gönderir.
+    notify=True ise e-posta bildirimi gönderim kuyruğuna eklenir. dynamic=True ise eşik, süngerin
+    hesaplanmış yeniden sipariş noktasıdır (hesaplanmamışsa critical_stock).
     """
     logger.info("Critical stock report requested.")
-    return ReportService(db).critical(notify=notify)
+    return ReportService(db).critical(notify=notify, dynamic=dynamic)
+
+
+@router.get("/reorder", status_code=status.HTTP_200_OK)
+def get_reorder_recommendations(db: Session = Depends(get_db)):
+    """
+    Sünger bazında önerilen yeniden sipariş noktası ve sipariş miktarı
+    (son hesaplama sonucu; stoğu yeniden sipariş noktasına en yakın olanlar önce).
+    """
+    return ReorderService(db).recommendations()
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional
+from datetime import datetime
+import zipfile
 from app.core.database import get_db
-from app.schemas.stock_schema import StockCreate, StockResponse
+from app.schemas.stock_schema import (
+    StockCreate, StockResponse, StockBulkCreate, StockBulkResult, StockPage, StockType
+)
 from app.services.stock_service import StockService
+from app.services.stock_import_service import StockImportService, ImportRowError
 
 router = APIRouter(prefix="/stocks", tags=["Stocks"])
 
@@ -12,29 +18,69 @@ router = APIRouter(prefix="/stocks", tags=["Stocks"])
 # -----------------------------
 
 @router.get("/summary")
-def get_stock_summary(db: Session = Depends(get_db)):
-    return StockService(db).get_summary()
+def get_stock_summary(
+    as_of: Optional[str] = Query(None, description="YYYY-MM-DD (gün sonu) veya ISO tarih-saat"),
+    db: Session = Depends(get_db),
+):
+    return StockService(db).get_summary(as_of)
 
 @router.get("/by_date")
 def get_stocks_by_date(
     start: str = Query(..., description="YYYY-MM-DD"),
     end: str = Query(..., description="YYYY-MM-DD"),
+    format: Literal["json", "ndjson", "csv"] = Query(
+        "json", description="ndjson/csv: sabit bellekle akış halinde dışa aktarım"
+    ),
+    include_archived: bool = Query(False, description="stocks_archive'daki eski hareketleri de dahil et"),
     db: Session = Depends(get_db),
 ):
-    return StockService(db).get_by_date_range(start, end)
+    if format == "json":
+        return StockService(db).get_by_date_range(start, end, include_archived)
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        StockService(db).stream_by_date_range(start, end, format, include_archived=include_archived),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="stocks_{start}_{end}.{format}"'},
+    )
 
 @router.get("/{sponge_id}/status")
-def stock_status(sponge_id: int, db: Session = Depends(get_db)):
-    return StockService(db).get_status(sponge_id)
+def stock_status(
+    sponge_id: int,
+    as_of: Optional[str] = Query(None, description="YYYY-MM-DD (gün sonu) veya ISO tarih-saat"),
+    db: Session = Depends(get_db),
+):
+    return StockService(db).get_status(sponge_id, as_of)
 
 @router.get("/{sponge_id}/total")
 def total_stock(sponge_id: int, db: Session = Depends(get_db)):
     total = StockService(db).get_total_quantity(sponge_id)
     return {"sponge_id": sponge_id, "total": total}
 
-@router.get("/", response_model=List[StockResponse])
-def list_stocks(db: Session = Depends(get_db)):
-    return StockService(db).get_all()
+@router.get("/", response_model=StockPage)
+def list_stocks(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Önceki sayfanın next_cursor değeri"),
+    sponge_id: Optional[int] = None,
+    type: Optional[StockType] = None,
+    created_by: Optional[int] = None,
+    start: Optional[datetime] = Query(None, description="Bu andan itibaren (dahil)"),
+    end: Optional[datetime] = Query(None, description="Bu ana kadar (hariç)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stok hareketlerini en yeniden eskiye, (date, id) üzerinde keyset sayfalama ile listeler.
+    Sonraki sayfa için yanıttaki `next_cursor` değeri `cursor` parametresine verilir.
+    """
+    return StockService(db).get_page(
+        limit,
+        cursor=cursor,
+        sponge_id=sponge_id,
+        stock_type=type,
+        created_by=created_by,
+        start=start,
+        end=end,
+    )
 
 
 # -----------------------------
@@ -45,6 +91,31 @@ def list_stocks(db: Session = Depends(get_db)):
 def create_stock(stock: StockCreate, db: Session = Depends(get_db)):
     return StockService(db).create(stock)
 
+@router.post("/bulk", response_model=StockBulkResult, status_code=201)
+def create_stocks_bulk(payload: StockBulkCreate, db: Session = Depends(get_db)):
+    """
+    Toplu stok hareketi girişi (vardiya sonu el terminali yüklemeleri).
+    mode=atomic: tek hata varsa hiçbiri yazılmaz (400).
+    mode=best_effort: geçerli satırlar yazılır, hatalar satır bazında raporlanır.
+    """
+    return StockService(db).create_bulk(payload)
+
+@router.post("/import")
+def import_stocks(
+    file: UploadFile = File(..., description="CSV veya XLSX hareket dosyası"),
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Geçmiş hareketlerin CSV/XLSX dosyasından akış halinde içe aktarılması.
+    Kolonlar: date, sponge (ad) veya sponge_id, type, quantity, price, note.
+    Dosya parça parça okunur ve her parça ayrı transaction ile yazılır.
+    """
+    try:
+        return StockImportService(db, chunk_size=chunk_size).import_file(file.file, file.filename or "")
+    except (ImportRowError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+        raise HTTPException(status_code=400, detail=f"Dosya okunamadı: {e}")
+
 
 # -----------------------------
 # PARAMETERIZED PATHS LAST (Catch-all)
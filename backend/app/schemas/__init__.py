@@ -1,11 +1,11 @@
 from app.schemas.users_schema import UserBase, UserCreate, UserResponse, Token, TokenData
 from app.schemas.sponge_schema import SpongeBase, SpongeCreate, SpongeRead
-from app.schemas.stock_schema import StockBase, StockCreate, StockResponse
-from app.schemas.report_schema import ReportBase, ReportRead
+from app.schemas.stock_schema import StockBase, StockCreate, StockResponse, StockBulkCreate, StockBulkResult
+from app.schemas.report_schema import ReportBase, ReportRead, ReportHistoryItem
 
 __all__ = [
     "UserBase", "UserCreate", "UserResponse", "Token", "TokenData",
     "SpongeBase", "SpongeCreate", "SpongeRead",
-    "StockBase", "StockCreate", "StockResponse",
-    "ReportBase", "ReportRead"
+    "StockBase", "StockCreate", "StockResponse", "StockBulkCreate", "StockBulkResult",
+    "ReportBase", "ReportRead", "ReportHistoryItem"
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class NotificationBase(BaseModel):
     title: str
@@ -20,5 +20,9 @@ class NotificationRead(NotificationBase):
     class Config:
         from_attributes = True
 
+class NotificationPage(BaseModel):
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
+
 class NotificationUpdate(BaseModel):
     is_read: bool
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 from enum import Enum
 
@@ -7,18 +7,37 @@ from enum import Enum
 class ReportType(str, Enum):
     weekly = "weekly"
     monthly = "monthly"
+    critical = "critical"
 
 
 class ReportBase(BaseModel):
     report_type: ReportType
     summary_json: dict[str, Any] = Field(default_factory=dict)
     file_path: Optional[str] = None
-    created_by: int
+    created_by: Optional[int] = None
 
 
 class ReportRead(ReportBase):
     id: int
     generated_at: datetime
+    generated_duration: Optional[float] = None
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    invalidated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ReportHistoryItem(BaseModel):
+    id: int
+    report_type: ReportType
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    file_path: Optional[str] = None
+    generated_duration: Optional[float] = None
+    generated_at: datetime
+    invalidated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ScheduledJobRead(BaseModel):
+    name: str
+    next_run_at: datetime
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    run_count: int
+    failure_count: int
+
+    class Config:
+        from_attributes = True
@@ -12,6 +12,7 @@ class SpongeBase(BaseModel):
     height: Optional[float] = Field(None, gt=0)
     thickness: Optional[float] = Field(None, gt=0)
     critical_stock: float = Field(5, ge=0)
+    lead_time_days: Optional[int] = Field(None, ge=0, le=365, description="Tedarik süresi (gün)")
 
 
 class SpongeCreate(SpongeBase):
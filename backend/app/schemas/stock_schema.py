@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, condecimal, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -36,3 +36,30 @@ class StockResponse(StockBase):
 
     class Config:
         from_attributes = True
+
+
+class BulkMode(str, Enum):
+    atomic = "atomic"            # Tek hata varsa hiçbir satır yazılmaz
+    best_effort = "best_effort"  # Geçerli satırlar yazılır, hatalılar raporlanır
+
+
+class StockBulkCreate(BaseModel):
+    items: List[StockCreate] = Field(..., min_length=1, max_length=10000)
+    mode: BulkMode = BulkMode.atomic
+
+
+class StockBulkError(BaseModel):
+    index: int
+    sponge_id: int
+    detail: str
+
+
+class StockBulkResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[StockBulkError] = Field(default_factory=list)
+
+
+class StockPage(BaseModel):
+    items: List[StockResponse]
+    next_cursor: Optional[str] = None
@@ -1,11 +1,9 @@
 from app.services.sponge_service import SpongeService
 from app.services.stock_service import StockService
 from app.services.report_service import ReportService
-from app.services.notification_service import NotificationService
 
 __all__ = [
     "SpongeService",
     "StockService",
     "ReportService",
-    "NotificationService",
 ]
@@ -0,0 +1,67 @@
+import math
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import stock_cache
+from app.core.config import settings
+from app.repositories.report_repository import ReportRepository
+from app.utils.classification import abc_classes, demand_moments, xyz_classes
+
+
+class ClassificationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ReportRepository(db)
+
+    def classify(self, history_days: int = 365) -> dict:
+        """
+        Tüm süngerlerin ABC (çıkış değeri) ve XYZ (talep değişkenliği) sınıfları.
+        Katalog tek gruplu sorguyla okunur, sınıflar tek vektörel geçişte hesaplanır.
+        Sonuç stok önbelleğinde tutulur (yeni hareketle temizlenir).
+        """
+        today = datetime.utcnow().date()
+        return stock_cache.get_or_set(
+            f"classification:{today}:{history_days}",
+            lambda: self._classify(today, history_days),
+        )
+
+    def _classify(self, today, history_days: int) -> dict:
+        start = today - timedelta(days=history_days - 1)
+        rows = self.repo.get_classification_stats(start, today + timedelta(days=1))
+        count = len(rows)
+
+        values = np.fromiter((float(r[2]) for r in rows), dtype=np.float64, count=count)
+        total = np.fromiter((float(r[3]) for r in rows), dtype=np.float64, count=count)
+        squares = np.fromiter((float(r[4]) for r in rows), dtype=np.float64, count=count)
+
+        abc, cumulative = abc_classes(values, settings.ABC_A_SHARE, settings.ABC_B_SHARE)
+        mean, std = demand_moments(total, squares, history_days)
+        xyz, cv = xyz_classes(mean, std, settings.XYZ_X_CV, settings.XYZ_Y_CV)
+        value_total = values.sum()
+
+        items = []
+        for index in np.argsort(-values, kind="stable"):
+            demand_cv = float(cv[index])
+            items.append({
+                "sponge_id": rows[index][0],
+                "name": rows[index][1],
+                "value": round(float(values[index]), 2),
+                "value_share": round(float(values[index] / value_total), 4) if value_total > 0 else 0.0,
+                "cumulative_share": round(float(cumulative[index]), 4),
+                "avg_daily_demand": round(float(mean[index]), 4),
+                "demand_cv": round(demand_cv, 4) if math.isfinite(demand_cv) else None,
+                "abc": str(abc[index]),
+                "xyz": str(xyz[index]),
+                "class": f"{abc[index]}{xyz[index]}",
+            })
+
+        return {
+            "as_of": str(today),
+            "history_days": history_days,
+            "total_value": round(float(value_total), 2),
+            "counts": dict(sorted(Counter(item["class"] for item in items).items())),
+            "items": items,
+        }
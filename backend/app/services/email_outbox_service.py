@@ -0,0 +1,223 @@
+# app/services/email_outbox_service.py
+import asyncio
+import logging
+import os
+import smtplib
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.smtp_pool import SmtpPool
+from app.repositories.email_outbox_repository import EmailOutboxRepository
+from app.services.notification_service import build_message
+
+logger = logging.getLogger(__name__)
+
+# Tekrar denemeler arasındaki bekleme bu süreyi geçmez
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class _Outgoing:
+    id: int
+    recipients: list[str]
+    subject: str
+    body: str
+    attempts: int
+
+
+@dataclass(frozen=True)
+class _Result:
+    id: int
+    error: Optional[str] = None
+    permanent: bool = False
+
+
+def build_smtp_pool() -> Optional[SmtpPool]:
+    """Ayarlardan SMTP havuzu kurar; SMTP yapılandırılmamışsa None (konsol modu)."""
+    if not settings.SMTP_SERVER or not settings.SMTP_PORT:
+        return None
+    return SmtpPool(
+        settings.SMTP_SERVER,
+        settings.SMTP_PORT,
+        username=settings.MAIL_USERNAME,
+        password=settings.MAIL_PASSWORD,
+        starttls=settings.SMTP_STARTTLS,
+        size=settings.SMTP_POOL_SIZE,
+        timeout=settings.SMTP_TIMEOUT_SECONDS,
+    )
+
+
+def _permanent(error: Exception) -> bool:
+    """5xx yanıtları kalıcıdır (tekrar denemek sonucu değiştirmez); diğer hatalar geçicidir."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailOutboxService:
+    """
+    `email_outbox` kuyruğundaki e-postaları gönderir.
+
+    İstekler yalnızca `enqueue` eder; gönderim `send_pending` ile arka planda yapılır.
+    Her çağrı en fazla EMAIL_OUTBOX_BATCH_SIZE satırı kiralar, havuz boyutu kadar parçaya
+    böler ve her parçayı tek bir (havuzdan alınan, kimliği doğrulanmış) SMTP bağlantısı
+    üzerinden sırayla gönderir. Sonuçlar tek transaction'da yazılır: geçici hatalar
+    üstel bekleme ile tekrar kuyruğa döner, 5xx yanıtları ve deneme sınırını aşanlar
+    `failed` olarak işaretlenir.
+    """
+
+    def __init__(self, db: Session, pool: Optional[SmtpPool] = None, owner: Optional[str] = None):
+        self.db = db
+        self.repo = EmailOutboxRepository(db)
+        self.pool = pool
+        self.sender = settings.MAIL_FROM or "noreply@sponge-stock.com"
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def enqueue(self, to: List[str], subject: str, body: str):
+        return self.repo.enqueue(to, subject, body)
+
+    def send_pending(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Bir parti gönderir; {"sent", "retried", "failed"} sayılarını döner."""
+        now = now or datetime.utcnow()
+        claimed = self.repo.claim(
+            self.owner, now, settings.EMAIL_OUTBOX_BATCH_SIZE, settings.EMAIL_OUTBOX_LEASE_SECONDS
+        )
+        outgoing = [_Outgoing(m.id, m.recipients, m.subject, m.body, m.attempts) for m in claimed]
+        if not outgoing:
+            return {"sent": 0, "retried": 0, "failed": 0}
+
+        if self.pool is None:
+            results = [self._log(message) for message in outgoing]
+        else:
+            # Her parça bir bağlantı; bağlantılar havuz boyutunu aşmaz
+            chunks = [outgoing[i::self.pool.size] for i in range(min(self.pool.size, len(outgoing)))]
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                results = [r for chunk in executor.map(self._send_chunk, chunks) for r in chunk]
+
+        return self._record(outgoing, results, now)
+
+    def _log(self, message: _Outgoing) -> _Result:
+        # SMTP yapılandırılmamışsa konsola yazdır (development mode)
+        logger.info(f"📧 E-POSTA (KONSOL): {message.subject} -> {', '.join(message.recipients)}\n{message.body}")
+        return _Result(message.id)
+
+    def _send_chunk(self, messages: list[_Outgoing]) -> list[_Result]:
+        """
+        Mesajları tek bağlantı üzerinden sırayla gönderir. Bağlantı gönderim sırasında
+        koparsa o mesaj geçici hata sayılır ve kalanlar yeni bağlantıyla devam eder;
+        bağlantı hiç kurulamıyorsa kalan tüm mesajlar geçici hatayla döner.
+        """
+        results, remaining = [], list(messages)
+        while remaining:
+            connected = False
+            try:
+                with self.pool.connection() as smtp:
+                    connected = True
+                    while remaining:
+                        message = remaining[0]
+                        try:
+                            smtp.sendmail(
+                                self.sender, message.recipients,
+                                build_message(self.sender, message.recipients, message.subject, message.body),
+                            )
+                            results.append(_Result(message.id))
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                            results.append(_Result(message.id, f"{type(e).__name__}: {e}", _permanent(e)))
+                        remaining.pop(0)
+            except (smtplib.SMTPException, OSError) as e:
+                error = f"{type(e).__name__}: {e}"
+                if not connected:
+                    results.extend(_Result(m.id, error) for m in remaining)
+                    break
+                results.append(_Result(remaining.pop(0).id, error))
+        return results
+
+    def _record(self, outgoing: list[_Outgoing], results: list[_Result], now: datetime) -> dict[str, int]:
+        attempts = {message.id: message.attempts for message in outgoing}
+        counts = {"sent": 0, "retried": 0, "failed": 0}
+
+        sent = [r.id for r in results if r.error is None]
+        self.repo.mark_sent(sent, self.owner, now)
+        counts["sent"] = len(sent)
+
+        for result in results:
+            if result.error is None:
+                continue
+            attempt = attempts[result.id] + 1
+            retry_at = None
+            if not result.permanent and attempt < settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                delay = min(settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS)
+                retry_at = now + timedelta(seconds=delay)
+            self.repo.mark_failed(result.id, self.owner, result.error, retry_at)
+            counts["retried" if retry_at else "failed"] += 1
+            logger.warning(f"E-posta gönderilemedi (#{result.id}, deneme {attempt}): {result.error}")
+
+        self.db.commit()
+        return counts
+
+
+class EmailOutboxWorker:
+    """
+    Uygulama süreci içinde e-posta kuyruğunu boşaltan arka plan döngüsü. Gönderim
+    event loop'u bloklamamak için thread'de çalışır; kuyruk dolu olduğu sürece partiler
+    ara vermeden gönderilir, boşaldığında EMAIL_OUTBOX_POLL_SECONDS beklenir. Birden
+    fazla replika aynı kuyruğu kiralama sayesinde çakışmadan paylaşır.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        pool: Optional[SmtpPool] = None,
+        poll_seconds: float | None = None,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool if pool is not None else build_smtp_pool()
+        self.poll_seconds = poll_seconds or settings.EMAIL_OUTBOX_POLL_SECONDS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: asyncio.Task | None = None
+        self._stopped = asyncio.Event()
+
+    def run_once(self) -> dict[str, int]:
+        db = self.session_factory()
+        try:
+            return EmailOutboxService(db, self.pool, self.owner).send_pending()
+        except Exception as e:
+            # DB kesintisi vb.; kiralanan satırlar kira süresi dolunca tekrar alınır
+            db.rollback()
+            logger.error(f"E-posta kuyruğu işlenemedi: {e}")
+            return {"sent": 0, "retried": 0, "failed": 0}
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while not self._stopped.is_set():
+            counts = await asyncio.to_thread(self.run_once)
+            if sum(counts.values()) >= settings.EMAIL_OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"E-posta göndericisi başlatıldı ({self.owner})")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self.pool is not None:
+            self.pool.close()
@@ -0,0 +1,87 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.cache import stock_cache
+from app.repositories.report_repository import ReportRepository
+from app.utils.forecasting import consumption_matrix, days_of_cover, exponential_smoothing, moving_average
+
+
+class ForecastService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ReportRepository(db)
+
+    def consumption(self, history_days: int, sponge_ids: list[int] | None = None):
+        """
+        Son `history_days` günün (bugün dahil) sünger x gün tüketim matrisini kurar.
+        (sponges, matrix, start) döner; matrisin satırları `sponges` sırasındadır.
+        `sponge_ids` verilirse yalnızca o süngerler okunur.
+        """
+        today = datetime.utcnow().date()
+        start = today - timedelta(days=history_days - 1)
+        sponges = self.repo.get_sponge_balances(sponge_ids)
+
+        ids = np.fromiter((s[0] for s in sponges), dtype=np.int64, count=len(sponges))
+        rows = np.fromiter(
+            self.repo.iter_daily_consumption(start, today + timedelta(days=1), sponge_ids),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        if len(rows) and len(ids):
+            # sponge_id -> satır indeksi (ids artan sıralı); silinmiş süngerlerin satırları atılır
+            sponge_ids = rows[:, 0].astype(np.int64)
+            index = np.minimum(np.searchsorted(ids, sponge_ids), len(ids) - 1)
+            rows = rows[ids[index] == sponge_ids]
+            rows[:, 0] = index[ids[index] == sponge_ids]
+        elif not len(ids):
+            rows = rows[:0]
+        return sponges, consumption_matrix(rows, len(sponges), history_days), start
+
+    def forecast(self, history_days: int = 90, window: int = 28, alpha: float = 0.3) -> dict:
+        """
+        Her sünger için günlük tüketim tahmini (hareketli ortalama ve üstel düzleştirme)
+        ve mevcut stoğun kaç gün yeteceği (days of cover). Tüm süngerler tek bir vektörel
+        geçişte hesaplanır. Sonuç stok önbelleğinde tutulur (yeni hareketle temizlenir).
+        """
+        if window > history_days:
+            raise HTTPException(status_code=400, detail="window, history_days'ten büyük olamaz")
+        today = datetime.utcnow().date()
+        return stock_cache.get_or_set(
+            f"forecast:{today}:{history_days}:{window}:{alpha}",
+            lambda: self._forecast(today, history_days, window, alpha),
+        )
+
+    def _forecast(self, today, history_days: int, window: int, alpha: float) -> dict:
+        sponges, matrix, _ = self.consumption(history_days)
+        on_hand = np.fromiter((float(s[3]) for s in sponges), dtype=np.float64, count=len(sponges))
+
+        average = moving_average(matrix, window)
+        smoothed = exponential_smoothing(matrix, alpha)
+        cover = days_of_cover(on_hand, smoothed)
+
+        items = []
+        for index in np.argsort(cover, kind="stable"):
+            sponge_id, name, critical_stock, _ = sponges[index]
+            days = float(cover[index])
+            finite = math.isfinite(days)
+            items.append({
+                "sponge_id": sponge_id,
+                "name": name,
+                "on_hand": float(on_hand[index]),
+                "critical_stock": critical_stock,
+                "avg_daily_consumption": round(float(average[index]), 4),
+                "smoothed_daily_consumption": round(float(smoothed[index]), 4),
+                "days_of_cover": round(days, 1) if finite else None,
+                "stockout_date": str(today + timedelta(days=math.floor(days))) if finite else None,
+            })
+
+        return {
+            "as_of": str(today),
+            "history_days": history_days,
+            "window": window,
+            "alpha": alpha,
+            "items": items,
+        }
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.notification_bus import BusEvent, NotificationBus, TooManyConnections, notification_bus
+from app.repositories.notification_repository import NotificationRepository
+
+
+def sse_frame(event_type: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_type}", f"data: {json.dumps(data, ensure_ascii=False)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+class NotificationStream:
+    """
+    Bir kullanıcının SSE bildirim akışı. Yeni bildirimler ve okuma/silme olayları
+    process içi `notification_bus`'tan gelir; her olay grubundan sonra güncel okunmamış
+    sayısı (tek satırlık sayaç okuması) `unread_count` olayı olarak gönderilir. Boşta
+    geçen her `heartbeat_seconds` için yorum satırı yazılır (proxy zaman aşımlarına karşı).
+
+    `Last-Event-ID` ile yeniden bağlanan istemciye tampondaki kaçırılmış olaylar tekrar
+    gönderilir; tampon yetmiyorsa `reset` olayı gönderilir ve istemci listeyi yeniden çeker.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        bus: NotificationBus | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        heartbeat_seconds: float | None = None,
+    ):
+        self.user_id = user_id
+        self.bus = bus or notification_bus
+        self.session_factory = session_factory
+        self.heartbeat_seconds = heartbeat_seconds or settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+
+    def has_capacity(self) -> bool:
+        return self.bus.connection_count(self.user_id) < self.bus.max_connections_per_user
+
+    def _unread_count(self) -> int:
+        db = self.session_factory()
+        try:
+            return NotificationRepository(db).get_unread_count(self.user_id)
+        finally:
+            db.close()
+
+    async def _unread_frame(self) -> str:
+        count = await asyncio.to_thread(self._unread_count)
+        return sse_frame("unread_count", {"unread_count": count})
+
+    @staticmethod
+    def _frame(bus_event: BusEvent) -> str:
+        return sse_frame(bus_event.type, bus_event.data, bus_event.id)
+
+    async def events(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        # Abonelik akış başladığında açılır: hiç başlamayan yanıt bağlantı kotası sızdırmaz
+        try:
+            subscription = self.bus.subscribe(self.user_id)
+        except TooManyConnections:
+            yield sse_frame("error", {"detail": "Çok fazla açık bildirim akışı"})
+            return
+        queue = subscription.queue
+        try:
+            if last_event_id is not None:
+                replay = self.bus.replay(self.user_id, int(last_event_id)) if last_event_id.isdigit() else None
+                if replay is None:
+                    yield sse_frame("reset", {})
+                else:
+                    for bus_event in replay:
+                        yield self._frame(bus_event)
+            yield await self._unread_frame()
+
+            while True:
+                try:
+                    bus_event = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                # Aynı anda gelen olaylar (ör. toplu stok yüklemesi) tek sayaç okumasıyla kapanır
+                batch = [bus_event]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                for bus_event in batch:
+                    yield self._frame(bus_event)
+                yield await self._unread_frame()
+        finally:
+            self.bus.unsubscribe(subscription)
@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, time, timezone
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.reorder_repository import ReorderRepository
+from app.services.forecast_service import ForecastService
+from app.utils.forecasting import reorder_levels
+
+logger = logging.getLogger(__name__)
+
+
+class ReorderService:
+    # Bir partide hesaplanan sünger sayısı (IN listesi ve matris boyutu sınırı)
+    BATCH_SIZE = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ReorderRepository(db)
+        self.forecast = ForecastService(db)
+
+    def recompute(self, full: bool = False) -> dict:
+        """
+        Yeniden sipariş noktası ve sipariş miktarı önerilerini hesaplar ve `sponge_reorder_points`
+        tablosuna yazar. Artımlıdır: yalnızca son çalıştırmadan beri hareketi olan (bakiye sürümü
+        değişen), tedarik süresi değişen veya bugünden (UTC) önce hesaplanmış süngerler hesaplanır;
+        geçmiş penceresi her gün kaydığından hareketsiz süngerler de günde bir kez yenilenir.
+        full=True ise tümü. İstatistikler parti başına tek sorgu + tek vektörel geçişle çıkarılır.
+        """
+        # Pencere ForecastService.consumption ile aynı şekilde UTC gününe göre kayar
+        window_moved = datetime.combine(datetime.utcnow().date(), time.min, tzinfo=timezone.utc)
+        stale = self.repo.get_stale(
+            settings.REORDER_DEFAULT_LEAD_TIME_DAYS, full=full, computed_before=window_moved
+        )
+        for offset in range(0, len(stale), self.BATCH_SIZE):
+            self._compute_batch(stale[offset:offset + self.BATCH_SIZE])
+            self.db.commit()
+
+        logger.info(f"Yeniden sipariş noktaları hesaplandı: {len(stale)} sünger")
+        return {"computed": len(stale)}
+
+    def _compute_batch(self, batch) -> None:
+        lead_times = {sponge_id: lead_time for sponge_id, lead_time, _ in batch}
+        versions = {sponge_id: version for sponge_id, _, version in batch}
+
+        sponges, matrix, _ = self.forecast.consumption(settings.REORDER_HISTORY_DAYS, list(lead_times))
+        ids = [s[0] for s in sponges]
+        on_hand = np.fromiter((float(s[3]) for s in sponges), dtype=np.float64, count=len(sponges))
+        lead_time = np.fromiter((lead_times[i] for i in ids), dtype=np.float64, count=len(ids))
+
+        levels = reorder_levels(
+            matrix, lead_time, on_hand,
+            settings.REORDER_SERVICE_LEVEL_Z, settings.REORDER_REVIEW_DAYS,
+        )
+        self.repo.save([
+            {
+                "sponge_id": sponge_id,
+                "lead_time_days": lead_times[sponge_id],
+                "balance_version": versions[sponge_id],
+                **{key: round(float(values[index]), 4) for key, values in levels.items()},
+            }
+            for index, sponge_id in enumerate(ids)
+        ])
+
+    def recommendations(self) -> list[dict]:
+        """Kayıtlı öneriler; stoğu yeniden sipariş noktasına en yakın/altında olanlar önce."""
+        items = []
+        for point, name, on_hand in self.repo.get_all():
+            items.append({
+                "sponge_id": point.sponge_id,
+                "name": name,
+                "on_hand": float(on_hand),
+                "lead_time_days": point.lead_time_days,
+                "avg_daily_demand": point.avg_daily_demand,
+                "demand_std": point.demand_std,
+                "safety_stock": point.safety_stock,
+                "reorder_point": point.reorder_point,
+                "order_up_to": point.order_up_to,
+                "order_quantity": point.order_quantity,
+                "computed_at": point.computed_at,
+            })
+        items.sort(key=lambda item: item["on_hand"] - item["reorder_point"])
+        return items
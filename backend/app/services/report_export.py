@@ -0,0 +1,63 @@
+# app/services/report_export.py
+"""
+Rapor dosyası yazıcıları. Satırlar bir iterator'dan akış halinde okunur ve doğrudan
+dosyaya yazılır; tüm veri seti hiçbir zaman bellekte tutulmaz.
+"""
+from typing import Iterable
+
+from app.utils.pdf import SimplePdfWriter
+
+ROW_HEADER = ["Gün", "Sünger", "Giriş", "Çıkış", "Net"]
+
+
+def write_xlsx(path: str, title: str, summary: list[tuple[str, float]], rows: Iterable) -> int:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("XLSX dışa aktarımı için openpyxl kurulu olmalı.")
+
+    # write_only: satırlar geçici dosyaya aktarılır, çalışma kitabı bellekte büyümez
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Rapor")
+    sheet.append([title])
+    for label, value in summary:
+        sheet.append([label, value])
+    sheet.append([])
+    sheet.append(ROW_HEADER)
+
+    count = 0
+    for bucket, name, total_in, total_out in rows:
+        total_in, total_out = float(total_in or 0), float(total_out or 0)
+        sheet.append([str(bucket), name, total_in, total_out, total_in - total_out])
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def write_pdf(path: str, title: str, summary: list[tuple[str, float]], rows: Iterable) -> int:
+    def _row(day, name, total_in, total_out, net) -> str:
+        return f"{day:<12}{name[:34]:<36}{total_in:>12}{total_out:>12}{net:>12}"
+
+    count = 0
+    with open(path, "wb") as stream:
+        pdf = SimplePdfWriter(stream)
+        pdf.line(title, bold=True)
+        pdf.line()
+        for label, value in summary:
+            pdf.line(f"{label}: {value:g}")
+        pdf.line()
+        pdf.line(_row(*ROW_HEADER), bold=True)
+        for bucket, name, total_in, total_out in rows:
+            total_in, total_out = float(total_in or 0), float(total_out or 0)
+            pdf.line(_row(str(bucket), name, f"{total_in:g}", f"{total_out:g}", f"{total_in - total_out:g}"))
+            count += 1
+        pdf.close()
+    return count
+
+
+WRITERS = {"xlsx": write_xlsx, "pdf": write_pdf}
+
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
@@ -1,99 +1,368 @@
 import logging
-from datetime import datetime, timedelta
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.reports import ReportType
 from app.repositories.report_repository import ReportRepository
-from app.repositories.notification_repository import NotificationRepository
-from app.services.notification_service import NotificationService
-from app.schemas.notification_schema import NotificationCreate
+from app.repositories.notification_digest_repository import NotificationDigestRepository
+from app.services.report_export import WRITERS, MEDIA_TYPES
 
 logger = logging.getLogger(__name__)
 
+GRANULARITIES = ("day", "week", "month", "quarter")
+
+# Dosya render işleri istek thread'lerinden ayrı, sınırlı bir havuzda çalışır
+_export_pool = ThreadPoolExecutor(max_workers=settings.REPORT_EXPORT_WORKERS, thread_name_prefix="report-export")
+
+
+def _render_export(report_id: int, fmt: str) -> None:
+    """Havuz thread'inde, kendi DB oturumuyla dosyayı üretir."""
+    db = SessionLocal()
+    try:
+        ReportService(db).render_export(report_id, fmt)
+    except Exception:
+        logger.exception(f"Rapor dışa aktarımı başarısız (report_id={report_id}, format={fmt})")
+    finally:
+        db.close()
+
 class ReportService:
     def __init__(self, db: Session):
         self.db = db
         self.repo = ReportRepository(db)
-        self.notifier = NotificationService()
-        self.notification_repo = NotificationRepository(db)
+        self.digest = NotificationDigestRepository(db)
+
+    def period_report(self, start: date, end: date, granularity: str = "day"):
+        """
+        [start, end) yarı açık aralığı için zaman dilimlerine (day/week/month/quarter)
+        bölünmüş giriş/çıkış raporu. Tüm dilimler tek sorguda hesaplanır.
+        """
+        if granularity not in GRANULARITIES:
+            raise HTTPException(status_code=400, detail=f"granularity şunlardan biri olmalı: {', '.join(GRANULARITIES)}")
+        if end <= start:
+            raise HTTPException(status_code=400, detail="end, start'tan sonra olmalı (end hariçtir)")
+
+        buckets: dict[str, dict] = {}
+        for bucket, name, total_in, total_out in self.repo.get_period_summary(start, end, granularity):
+            entry = buckets.setdefault(str(bucket), {
+                "period_start": str(bucket), "total_in": 0, "total_out": 0, "items": [],
+            })
+            entry["total_in"] += total_in or 0
+            entry["total_out"] += total_out or 0
+            entry["items"].append({"name": name, "in": total_in or 0, "out": total_out or 0})
+
+        for entry in buckets.values():
+            entry["net"] = entry["total_in"] - entry["total_out"]
+
+        return {
+            "start": str(start),
+            "end": str(end),
+            "granularity": granularity,
+            "total_in": sum(b["total_in"] for b in buckets.values()),
+            "total_out": sum(b["total_out"] for b in buckets.values()),
+            "buckets": list(buckets.values()),
+        }
+
+    @staticmethod
+    def _totals_by_name(report: dict) -> list[dict]:
+        """Dilimlere bölünmüş raporu sünger bazında tek toplama indirger."""
+        totals: dict[str, dict] = {}
+        for bucket in report["buckets"]:
+            for item in bucket["items"]:
+                entry = totals.setdefault(item["name"], {"name": item["name"], "in": 0, "out": 0})
+                entry["in"] += item["in"]
+                entry["out"] += item["out"]
+        return list(totals.values())
+
+    def _snapshot(self, report_type: ReportType, period_start: date, period_end: date, build,
+                  refresh: bool = False) -> dict:
+        """
+        [period_start, period_end) dönemi kapanmışsa saklanan snapshot'ı döner; yoksa,
+        geçersiz işaretlenmişse (geriye tarihli hareket) veya refresh=True ise raporu `build()`
+        ile üretir ve üretim süresiyle birlikte `reports` tablosuna (varsa aynı satıra) yazar.
+        Açık dönem (bugünü içeren) saklanmaz; her istekte güncel veriden hesaplanır.
+        """
+        if period_end > datetime.utcnow().date():
+            return build()
+
+        stored = self.repo.get_snapshot(report_type, period_start, period_end)
+        if stored is not None and stored.invalidated_at is None and not refresh:
+            return stored.summary_json
+
+        built_from = datetime.utcnow()
+        started = time.perf_counter()
+        summary = build()
+        duration = time.perf_counter() - started
+        try:
+            self.repo.save_snapshot(report_type, period_start, period_end, summary, duration, built_from=built_from)
+        except Exception as e:
+            self.db.rollback()
+            # Ön hesaplama (zamanlayıcı) hatayı görmeli; istek yolunda rapor yine de döner
+            if refresh:
+                raise
+            logger.error(f"Rapor snapshot'ı kaydedilemedi ({report_type.value} {period_start}): {e}")
+            return summary
+
+        # Dışa aktarılmış dosya eski veriyi taşır; aynı biçimde yeniden üretilir
+        if stored is not None and stored.file_path:
+            fmt = os.path.splitext(stored.file_path)[1].lstrip(".")
+            if fmt in WRITERS:
+                _export_pool.submit(_render_export, stored.id, fmt)
+        return summary
+
+    def precompute(self, report_type: ReportType) -> None:
+        """
+        Zamanlayıcı işi: geçersiz işaretlenmiş snapshot'ları yerinde yeniden üretir ve son
+        kapanan dönemin (dünü bitiren hafta / geçen ay) snapshot'ını (yoksa) oluşturur.
+        """
+        builders = {ReportType.weekly: self._build_weekly, ReportType.monthly: self._build_monthly}
+        build = builders[report_type]
+        for report in self.repo.get_stale_snapshots(report_type):
+            start, end = report.period_start, report.period_end
+            self._snapshot(report_type, start, end, lambda: build(start, end), refresh=True)
+
+        today = datetime.utcnow().date()
+        if report_type == ReportType.weekly:
+            self.weekly(today - timedelta(days=1))
+        else:
+            self.monthly((today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m"))
+
+    @staticmethod
+    def _weekly_period(end: date | None) -> tuple[date, date]:
+        today = end or datetime.utcnow().date()
+        return today - timedelta(days=7), today + timedelta(days=1)
+
+    @staticmethod
+    def _monthly_period(month: str | None) -> tuple[date, date]:
+        if month is None:
+            month_start = datetime.utcnow().date().replace(day=1)
+        else:
+            try:
+                month_start = datetime.strptime(month, "%Y-%m").date()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="month YYYY-MM formatında olmalı")
+        return month_start, (month_start + timedelta(days=32)).replace(day=1)
+
+    def weekly(self, end: date | None = None, refresh: bool = False):
+        """`end` gününü (varsayılan: bugün) son gün kabul eden 7 günlük rapor."""
+        start, period_end = self._weekly_period(end)
+        return self._snapshot(
+            ReportType.weekly, start, period_end, lambda: self._build_weekly(start, period_end),
+            refresh=refresh,
+        )
 
-    def weekly(self):
-        data = self.repo.get_weekly_summary()
-        if not data:
+    def _build_weekly(self, start: date, period_end: date) -> dict:
+        report = self.period_report(start, period_end, "day")
+        if not report["buckets"]:
             return {"message": "Son 7 gün içinde hareket bulunamadı."}
 
-        total_in = sum(row[1] or 0 for row in data)
-        total_out = sum(row[2] or 0 for row in data)
         return {
-            "period": f"{(datetime.utcnow() - timedelta(days=7)).date()} - {datetime.utcnow().date()}",
-            "total_in": total_in,
-            "total_out": total_out,
+            "period": f"{start} - {period_end - timedelta(days=1)}",
+            "total_in": report["total_in"],
+            "total_out": report["total_out"],
             "top_items": sorted(
-                [{"name": row[0], "net": (row[1] or 0) - (row[2] or 0)} for row in data],
+                [{"name": item["name"], "net": item["in"] - item["out"]} for item in self._totals_by_name(report)],
                 key=lambda x: abs(x["net"]),
                 reverse=True,
             ),
         }
 
-    def monthly(self):
-        data = self.repo.get_monthly_summary()
-        if not data:
+    def monthly(self, month: str | None = None, refresh: bool = False):
+        """`month` (YYYY-MM, varsayılan: içinde bulunulan ay) ayına ait rapor."""
+        month_start, next_month = self._monthly_period(month)
+        return self._snapshot(
+            ReportType.monthly, month_start, next_month, lambda: self._build_monthly(month_start, next_month),
+            refresh=refresh,
+        )
+
+    def _build_monthly(self, month_start: date, next_month: date) -> dict:
+        report = self.period_report(month_start, next_month, "month")
+        if not report["buckets"]:
             return {"message": "Bu ay içinde hareket bulunamadı."}
 
-        total_in = sum(row[1] or 0 for row in data)
-        total_out = sum(row[2] or 0 for row in data)
         return {
-            "month": datetime.utcnow().strftime("%B %Y"),
-            "total_in": total_in,
-            "total_out": total_out,
-            "items": [
-                {"name": row[0], "in": row[1] or 0, "out": row[2] or 0}
-                for row in data
-            ],
+            "month": month_start.strftime("%B %Y"),
+            "total_in": report["total_in"],
+            "total_out": report["total_out"],
+            "items": self._totals_by_name(report),
         }
 
-    def critical(self, notify: bool = False):
-        data = self.repo.get_critical_stocks()
-        formatted = [
+    def history(self, report_type: ReportType | None = None, limit: int = 50):
+        return self.repo.get_history(report_type, limit)
+
+    def get_snapshot(self, report_id: int):
+        report = self.repo.get_report(report_id)
+        if not report:
+            raise HTTPException(status_code=404, detail="Rapor bulunamadı")
+        return report
+
+    # -----------------------------
+    # Dosya dışa aktarma (XLSX / PDF)
+    # -----------------------------
+
+    def export(self, report_type: ReportType, fmt: str, end: date | None = None, month: str | None = None) -> dict:
+        """
+        Kapanmış dönem raporunun snapshot'ını oluşturur (yoksa) ve dosya üretimini render
+        havuzuna bırakır.
+        İstek dosyanın yazılmasını beklemez; dosya hazır olunca `file_path` dolar.
+        """
+        if fmt not in WRITERS:
+            raise HTTPException(status_code=400, detail=f"format şunlardan biri olmalı: {', '.join(WRITERS)}")
+        if report_type == ReportType.weekly:
+            period_start, period_end = self._weekly_period(end)
+        elif report_type == ReportType.monthly:
+            period_start, period_end = self._monthly_period(month)
+        else:
+            raise HTTPException(status_code=400, detail="Yalnızca haftalık ve aylık raporlar dışa aktarılabilir")
+        if period_end > datetime.utcnow().date():
+            # Açık dönemin snapshot'ı saklanmaz; dosya yalnızca kapanmış dönemler için üretilir
+            raise HTTPException(status_code=400, detail="Açık dönem dışa aktarılamaz; dönem kapandıktan sonra tekrar deneyin")
+        if report_type == ReportType.weekly:
+            self.weekly(end)
+        else:
+            self.monthly(month)
+
+        report = self.repo.get_snapshot(report_type, period_start, period_end)
+        if report is None:
+            raise HTTPException(status_code=500, detail="Rapor kaydedilemedi")
+
+        _export_pool.submit(_render_export, report.id, fmt)
+        return {"report_id": report.id, "format": fmt, "status": "pending"}
+
+    def render_export(self, report_id: int, fmt: str) -> str | None:
+        """
+        Snapshot'ın dönemine ait gün x sünger satırlarını akış halinde okuyup dosyaya yazar,
+        yolunu `Report.file_path`'e kaydeder. Dosya önce `.part` uzantısıyla yazılır ve
+        tamamlanınca atomik olarak yeniden adlandırılır; yarım dosya asla servis edilmez.
+        """
+        report = self.repo.get_report(report_id)
+        if report is None:
+            return None
+
+        os.makedirs(settings.REPORT_STORAGE_DIR, exist_ok=True)
+        path = os.path.join(
+            settings.REPORT_STORAGE_DIR,
+            f"{report.report_type.value}_{report.period_start}_{report.id}.{fmt}",
+        )
+        partial = f"{path}.part"
+        summary = report.summary_json or {}
+        if report.report_type == ReportType.weekly:
+            title = f"Haftalık Rapor {report.period_start} - {report.period_end - timedelta(days=1)}"
+        else:
+            title = f"Aylık Rapor {report.period_start.strftime('%Y-%m')}"
+
+        started = time.perf_counter()
+        rows = self.repo.iter_period_summary(report.period_start, report.period_end, "day")
+        count = WRITERS[fmt](partial, title, [
+            ("Toplam giriş", float(summary.get("total_in", 0))),
+            ("Toplam çıkış", float(summary.get("total_out", 0))),
+        ], rows)
+        os.replace(partial, path)
+
+        previous = report.file_path
+        if not self.repo.set_file_path(report.id, path):
+            # Snapshot render sırasında silindi; dosya artık yetim
+            os.remove(path)
+            return None
+        if previous and previous != path and os.path.exists(previous):
+            os.remove(previous)
+
+        logger.info(f"Rapor dışa aktarıldı: {path} ({count} satır, {time.perf_counter() - started:.3f} sn)")
+        return path
+
+    def export_file(self, report_id: int) -> tuple[str, str]:
+        """İndirilecek dosyanın yolunu ve media type'ını döner."""
+        report = self.get_snapshot(report_id)
+        if not report.file_path or not os.path.exists(report.file_path):
+            raise HTTPException(status_code=404, detail="Rapor dosyası henüz hazır değil")
+        fmt = os.path.splitext(report.file_path)[1].lstrip(".")
+        return report.file_path, MEDIA_TYPES.get(fmt, "application/octet-stream")
+
+    def prune_exports(self, min_age_seconds: int = 3600) -> int:
+        """
+        Hiçbir snapshot'a bağlı olmayan (geçersizleşmiş veya yerine yenisi yazılmış)
+        dosyaları siler. Yazımı süren `.part` dosyalarına dokunmamak için yalnızca
+        `min_age_seconds`'tan eski dosyalar silinir. Silinen dosya sayısını döner.
+        """
+        directory = settings.REPORT_STORAGE_DIR
+        if not os.path.isdir(directory):
+            return 0
+        referenced = {os.path.abspath(path) for path in self.repo.get_file_paths()}
+        cutoff = time.time() - min_age_seconds
+
+        removed = 0
+        for entry in os.scandir(directory):
+            if not entry.is_file() or os.path.abspath(entry.path) in referenced:
+                continue
+            if entry.stat().st_mtime > cutoff:
+                continue
+            os.remove(entry.path)
+            removed += 1
+        return removed
+
+    def _critical_items(self, dynamic: bool = False) -> list[dict]:
+        return [
             {
                 "name": row[0],
                 "available_stock": float(row[1]),
                 "critical_stock": float(row[2]),
                 "status": "critical",
             }
-            for row in data
+            for row in self.repo.get_critical_stocks(dynamic)
         ]
 
+    def critical_snapshot(self, refresh: bool = False) -> dict:
+        """
+        Kritik stok listesinin bugüne ait snapshot'ı (bildirim/e-posta üretmez).
+        Zamanlayıcı tarafından ön hesaplanır; rapor geçmişinde görünür. Dönem raporu değil
+        ana ait bir kayıt olduğundan açık dönem kuralına tabi değildir: gün içindeki her
+        üretim aynı satırın üzerine yazılır, gün kapandığında son hali kalır.
+        """
+        today = datetime.utcnow().date()
+        if not refresh:
+            stored = self.repo.get_snapshot(ReportType.critical, today, today + timedelta(days=1))
+            if stored is not None:
+                return stored.summary_json
+
+        started = time.perf_counter()
+        summary = {"items": self._critical_items()}
+        self.repo.save_snapshot(
+            ReportType.critical, today, today + timedelta(days=1), summary, time.perf_counter() - started
+        )
+        return summary
+
+    def critical(self, notify: bool = False, dynamic: bool = False):
+        """
+        Kritik stoktaki ürünler. Salt okumadır: uygulama içi bildirimler, durum
+        değiştiğinde hareketle birlikte üretilir (StockAlertRepository). notify=True
+        yalnızca açıkça istenen e-postayı özet penceresi üzerinden gönderim kuyruğuna
+        ekler; pencere içindeki tekrarlı çağrılar tek e-postada birleşir. dynamic=True ise
+        eşik olarak hesaplanmış yeniden sipariş noktası kullanılır (ReorderService).
+        """
+        formatted = self._critical_items(dynamic)
+
         if not formatted:
             return {"message": "Kritik stokta ürün bulunmuyor."}
 
-        # Bildirim oluştur (her zaman)
-        for item in formatted:
-            notification = NotificationCreate(
-                title="⚠️ Kritik Stok Uyarısı",
-                message=f"{item['name']} stoğu kritik seviyede: {item['available_stock']:.0f} / {item['critical_stock']:.0f}",
-                type="warning"
-            )
-            try:
-                self.notification_repo.create(notification)
-                logger.info(f"Kritik stok bildirimi oluşturuldu: {item['name']}")
-            except Exception as e:
-                logger.error(f"Bildirim oluşturma hatası: {e}")
-
-        # E-posta gönder (isteğe bağlı)
+        # E-posta özet penceresine eklenir (isteğe bağlı); pencere kapanınca tek e-posta kuyruğa girer
         if notify:
             try:
-                body = "<h3>Kritik Stok Uyarısı</h3><ul>"
-                for item in formatted:
-                    body += f"<li>{item['name']} — {item['available_stock']} / {item['critical_stock']}</li>"
-                body += "</ul>"
-                result = self.notifier.send_email(
+                self.digest.add_email(
                     to=["admin@factory.com"],
                     subject="⚠️ Kritik Stok Uyarısı",
-                    body=body,
+                    lines=[
+                        (f"critical:{item['name']}", f"{item['name']} — {item['available_stock']} / {item['critical_stock']}")
+                        for item in formatted
+                    ],
                 )
-                logger.info(f"E-posta gönderimi: {result}")
+                self.db.commit()
             except Exception as e:
-                logger.error(f"E-posta gönderimi başarısız: {e}")
+                self.db.rollback()
+                logger.error(f"E-posta kuyruğa eklenemedi: {e}")
                 raise HTTPException(status_code=500, detail="E-posta gönderimi başarısız.")
         
         return formatted
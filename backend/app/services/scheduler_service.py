@@ -0,0 +1,56 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.partitions import ensure_stock_partitions
+from app.core.scheduler import Job
+from app.models.reports import ReportType
+from app.repositories.notification_digest_repository import NotificationDigestRepository
+from app.repositories.scheduled_job_repository import ScheduledJobRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.services.report_service import ReportService
+from app.services.reorder_service import ReorderService
+
+
+def report_jobs() -> list[Job]:
+    """
+    Rapor ön hesaplama ve bakım işleri; snapshot'lar ReportService üzerinden `reports`
+    tablosuna yazılır (geçersiz işaretlenenler yerinde yeniden üretilir).
+    """
+    return [
+        Job(
+            "reports.weekly",
+            settings.REPORT_PRECOMPUTE_INTERVAL_SECONDS,
+            lambda db: ReportService(db).precompute(ReportType.weekly),
+        ),
+        Job(
+            "reports.monthly",
+            settings.REPORT_PRECOMPUTE_INTERVAL_SECONDS,
+            lambda db: ReportService(db).precompute(ReportType.monthly),
+        ),
+        Job(
+            "reports.critical",
+            settings.CRITICAL_REPORT_INTERVAL_SECONDS,
+            lambda db: ReportService(db).critical_snapshot(refresh=True),
+        ),
+        Job("reports.export_cleanup", 3600, lambda db: ReportService(db).prune_exports()),
+        Job(
+            "reorder.recompute",
+            settings.REORDER_INTERVAL_SECONDS,
+            lambda db: ReorderService(db).recompute(),
+        ),
+        Job("partitions.ensure", 86400, lambda db: ensure_stock_partitions(db.get_bind())),
+        # Eksik aylık kontrol noktaları (as_of sorguları); mevcut dönemler atlandığından günlük çalışması zararsızdır
+        Job("checkpoints.build", 86400, lambda db: StockCheckpointRepository(db).build()),
+        Job(
+            "notifications.digest",
+            settings.NOTIFICATION_DIGEST_FLUSH_SECONDS,
+            lambda db: NotificationDigestRepository(db).flush(),
+        ),
+    ]
+
+
+class SchedulerService:
+    def __init__(self, db: Session):
+        self.repo = ScheduledJobRepository(db)
+
+    def list_jobs(self):
+        return self.repo.get_all()
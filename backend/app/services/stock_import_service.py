@@ -0,0 +1,198 @@
+import csv
+import io
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+from app.models.sponges import Sponge
+from app.models.stocks import StockType
+from app.repositories.stock_repository import StockRepository
+
+logger = logging.getLogger(__name__)
+
+# Rapor edilen hata sayısı sınırlı tutulur; böylece hatalı büyük dosyalarda da bellek sabit kalır
+MAX_REPORTED_ERRORS = 100
+
+_DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%d.%m.%Y")
+
+ProgressCallback = Callable[[dict], None]
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+class StockImportService:
+    """
+    Geçmiş stok hareketlerinin CSV/XLSX dosyalarından akış halinde içe aktarılması.
+
+    Dosya sabit boyutlu parçalar halinde okunur; her parça doğrulanıp
+    `StockRepository.bulk_create` ile ayrı bir transaction içinde yazılır.
+    Bellek kullanımı dosya boyutundan bağımsızdır (yalnızca bir parça + sünger haritası).
+
+    Beklenen kolonlar: date, sponge (ad) veya sponge_id, type, quantity, price (ops.), note (ops.)
+    """
+
+    def __init__(self, db, chunk_size: int = 1000, progress: Optional[ProgressCallback] = None):
+        self.db = db
+        self.repo = StockRepository(db)
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._sponges_by_name: dict[str, int] = {}
+        self._sponge_ids: set[int] = set()
+
+    # -----------------------------
+    # Kaynaklar
+    # -----------------------------
+
+    def import_csv(self, stream: BinaryIO, encoding: str = "utf-8-sig") -> dict:
+        text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+        try:
+            return self._run(csv.DictReader(text))
+        finally:
+            # Alttaki dosyayı kapatma sorumluluğu çağırana aittir
+            text.detach()
+
+    def import_xlsx(self, stream: BinaryIO) -> dict:
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportRowError("XLSX içe aktarımı için openpyxl kurulu olmalı.")
+
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return self._run(iter(()))
+            keys = [str(h).strip() if h is not None else "" for h in header]
+            return self._run(dict(zip(keys, values)) for values in rows)
+        finally:
+            workbook.close()
+
+    def import_file(self, stream: BinaryIO, filename: str) -> dict:
+        if filename.lower().endswith((".xlsx", ".xlsm")):
+            return self.import_xlsx(stream)
+        return self.import_csv(stream)
+
+    # -----------------------------
+    # İşleme
+    # -----------------------------
+
+    def _load_sponge_map(self) -> None:
+        for sponge_id, name in self.db.query(Sponge.id, Sponge.name).all():
+            self._sponges_by_name[name.strip().lower()] = sponge_id
+            self._sponge_ids.add(sponge_id)
+
+    def _run(self, rows: Iterable[dict]) -> dict:
+        self._load_sponge_map()
+        stats = {"processed": 0, "inserted": 0, "failed": 0, "chunks": 0, "errors": []}
+
+        # Başlık satırı 1. satırdır; veri satırları 2'den başlar
+        numbered: Iterator = enumerate(rows, start=2)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+
+            valid, line_numbers = [], []
+            for line, raw in chunk:
+                try:
+                    valid.append(self._parse_row(raw))
+                    line_numbers.append(line)
+                except ImportRowError as e:
+                    self._record_error(stats, line, str(e))
+
+            if valid:
+                inserted, row_errors = self.repo.bulk_create(valid, atomic=False)
+                stats["inserted"] += inserted
+                for pos, detail in row_errors:
+                    self._record_error(stats, line_numbers[pos], detail)
+
+            stats["processed"] += len(chunk)
+            stats["chunks"] += 1
+            logger.info(
+                f"İçe aktarma: {stats['processed']} satır işlendi, "
+                f"{stats['inserted']} eklendi, {stats['failed']} hatalı."
+            )
+            if self.progress:
+                self.progress({k: v for k, v in stats.items() if k != "errors"})
+
+        return stats
+
+    @staticmethod
+    def _record_error(stats: dict, line: int, detail: str) -> None:
+        stats["failed"] += 1
+        if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+            stats["errors"].append({"line": line, "detail": detail})
+
+    def _parse_row(self, raw: dict) -> dict:
+        row = {str(k).strip().lower(): v for k, v in raw.items() if k}
+
+        sponge_id = self._resolve_sponge(row)
+
+        type_value = str(row.get("type") or "").strip().lower()
+        try:
+            stock_type = StockType(type_value)
+        except ValueError:
+            raise ImportRowError(f"Geçersiz hareket tipi: {type_value!r}")
+
+        quantity = self._parse_float(row.get("quantity"), "quantity")
+        if quantity is None or quantity <= 0:
+            raise ImportRowError("quantity pozitif olmalı")
+
+        price = self._parse_float(row.get("price"), "price")
+        if price is not None and price <= 0:
+            raise ImportRowError("price pozitif olmalı")
+
+        note = row.get("note")
+        return {
+            "sponge_id": sponge_id,
+            "type": stock_type,
+            "quantity": quantity,
+            "price": price,
+            "note": str(note)[:255] if note not in (None, "") else None,
+            "date": self._parse_date(row.get("date")),
+        }
+
+    def _resolve_sponge(self, row: dict) -> int:
+        raw_id = row.get("sponge_id")
+        if raw_id not in (None, ""):
+            try:
+                sponge_id = int(float(raw_id))
+            except (TypeError, ValueError):
+                raise ImportRowError(f"Geçersiz sponge_id: {raw_id!r}")
+            if sponge_id not in self._sponge_ids:
+                raise ImportRowError("Sponge not found")
+            return sponge_id
+
+        name = str(row.get("sponge") or row.get("name") or "").strip().lower()
+        if name not in self._sponges_by_name:
+            raise ImportRowError(f"Sünger bulunamadı: {name!r}")
+        return self._sponges_by_name[name]
+
+    @staticmethod
+    def _parse_float(value, field: str) -> Optional[float]:
+        if value in (None, ""):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return float(str(value).strip().replace(",", "."))
+        except ValueError:
+            raise ImportRowError(f"Geçersiz {field}: {value!r}")
+
+    @staticmethod
+    def _parse_date(value) -> Optional[datetime]:
+        if value in (None, ""):
+            return None
+        if isinstance(value, datetime):
+            return value
+        text = str(value).strip()
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        raise ImportRowError(f"Geçersiz tarih: {text!r}")
@@ -1,23 +1,41 @@
+import csv
+import io
+import json
 import logging
-from datetime import datetime
+from datetime import datetime, time, timezone
 from fastapi import HTTPException
-from sqlalchemy import func  # <--- EKLENDI
 
 from app.repositories.stock_repository import StockRepository
-from app.schemas.stock_schema import StockCreate, StockType
+from app.repositories.stock_balance_repository import InsufficientStockError
+from app.schemas.stock_schema import (
+    StockCreate, StockBulkCreate, StockBulkResult, StockBulkError, BulkMode, StockPage
+)
+from app.utils.pagination import encode_cursor, decode_cursor
 from app.repositories.sponge_repository import SpongeRepository
-from app.models.stocks import Stock # <--- EKLENDI
+from app.core.cache import stock_cache
 
 logger = logging.getLogger(__name__)
 
+EXPORT_COLUMNS = ["id", "sponge_id", "type", "quantity", "price", "note", "date", "created_by"]
+
 class StockService:
     def __init__(self, db):
         self.db = db
         self.repo = StockRepository(db)
         self.sponge_repo = SpongeRepository(db)
 
-    def get_all(self):
-        return self.repo.get_all()
+    def get_page(self, limit: int, cursor: str | None = None, **filters) -> StockPage:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        rows = self.repo.get_page(limit, after=after, **filters)
+        items = rows[:limit]
+        next_cursor = (
+            encode_cursor(items[-1].date, items[-1].id) if len(rows) > limit else None
+        )
+        return StockPage(items=items, next_cursor=next_cursor)
 
     def get_by_id(self, stock_id: int):
         return self.repo.get_by_id(stock_id)
@@ -28,56 +46,174 @@ class StockService:
         if not sponge:
             raise HTTPException(status_code=404, detail="Sponge not found")
 
-        # 2) OUT işleminde stok yeterli mi?
-        # Not: get_total_stock metodunu repository'den çağırmak daha güvenlidir
-        current = self.repo.get_total_stock(stock.sponge_id)
-
-        if stock.type == StockType.out and stock.quantity > current:
+        # 2) Kayıt oluştur
+        # OUT işleminde stok kontrolü repository içinde bakiye satırı üzerinde
+        # atomik yapılır; eşzamanlı çıkışlar aynı stoğu iki kez kullanamaz.
+        try:
+            return self.repo.create(stock)
+        except InsufficientStockError:
             raise HTTPException(status_code=400, detail="Not enough stock")
 
-        # 3) Kayıt oluştur
-        return self.repo.create(stock)
+    def create_bulk(self, payload: StockBulkCreate) -> StockBulkResult:
+        """
+        Toplu hareket girişi: tüm sünger id'leri tek sorguda doğrulanır,
+        stok kontrolü sünger bazında toplanan deltalarla yapılır ve geçerli
+        satırlar tek transaction içinde yazılır.
+        """
+        items = payload.items
+        atomic = payload.mode == BulkMode.atomic
+        existing = self.sponge_repo.get_existing_ids(item.sponge_id for item in items)
+
+        errors = [
+            StockBulkError(index=i, sponge_id=item.sponge_id, detail="Sponge not found")
+            for i, item in enumerate(items) if item.sponge_id not in existing
+        ]
+        if errors and atomic:
+            raise HTTPException(status_code=400, detail={
+                "message": "Bulk insert rejected",
+                "errors": [e.model_dump() for e in errors],
+            })
+
+        valid = [(i, item) for i, item in enumerate(items) if item.sponge_id in existing]
+        inserted, row_errors = self.repo.bulk_create(
+            [item.model_dump() for _, item in valid], atomic=atomic
+        )
+        errors += [
+            StockBulkError(index=valid[pos][0], sponge_id=valid[pos][1].sponge_id, detail=detail)
+            for pos, detail in row_errors
+        ]
+        errors.sort(key=lambda e: e.index)
+
+        if errors and atomic:
+            raise HTTPException(status_code=400, detail={
+                "message": "Bulk insert rejected",
+                "errors": [e.model_dump() for e in errors],
+            })
+
+        logger.info(f"Toplu stok girişi: {inserted} eklendi, {len(errors)} hatalı.")
+        return StockBulkResult(inserted=inserted, failed=len(errors), errors=errors)
 
     def delete(self, stock_id: int):
+        record = self.repo.get_by_id(stock_id)
+        if record and record.is_opening_balance:
+            # Arşivlenen hareketlerin devri; silinirse defter ile arşiv tutarsızlaşır
+            raise HTTPException(status_code=400, detail="Açılış bakiyesi hareketi silinemez")
         return self.repo.delete(stock_id)
 
-    def get_summary(self):
-        return self.repo.get_summary()
+    @staticmethod
+    def _parse_as_of(as_of: str) -> datetime:
+        """
+        as_of: YYYY-MM-DD (o günün sonu, gün dahil) veya ISO 8601 tarih-saat (o an dahil).
+        Saat dilimi verilmişse UTC'ye çevrilir.
+        """
+        try:
+            if len(as_of) == 10:
+                return datetime.combine(datetime.strptime(as_of, "%Y-%m-%d").date(), time.max)
+            moment = datetime.fromisoformat(as_of)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Geçersiz as_of; YYYY-MM-DD veya ISO 8601 bekleniyor")
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+
+    def get_summary(self, as_of: str | None = None):
+        if as_of is None:
+            # Özet, yeni hareket / sünger değişikliğinde geçersiz kılınan önbellekten servis edilir
+            return stock_cache.get_or_set("stock_summary", self.repo.get_summary)
+
+        moment = self._parse_as_of(as_of)
+        return stock_cache.get_or_set(
+            f"stock_summary:{moment.isoformat()}", lambda: self.repo.get_summary_as_of(moment)
+        )
 
-    def get_by_date_range(self, start, end):
+    def get_by_date_range(self, start, end, include_archived: bool = False):
+        if include_archived:
+            return [self._export_record(row) for row in self.repo.get_by_date_range(start, end, True)]
         return self.repo.get_by_date_range(start, end)
 
-    def get_status(self, sponge_id: int):
+    def stream_by_date_range(self, start: str, end: str, fmt: str, batch_size: int = 1000,
+                             include_archived: bool = False):
+        """
+        Tarih aralığındaki hareketleri NDJSON veya CSV olarak parça parça üretir.
+        Satırlar veritabanından okundukça yazılır; ilk bayt sorgu bitmeden gönderilir.
+        include_archived=True ise arşiv satırları da `archived` kolonuyla eklenir.
+        """
+        rows = self.repo.iter_by_date_range(
+            start, end, batch_size=batch_size, include_archived=include_archived
+        )
+        if fmt == "csv":
+            columns = EXPORT_COLUMNS + ["archived"] if include_archived else EXPORT_COLUMNS
+            yield from self._iter_csv(rows, batch_size, columns)
+        else:
+            yield from self._iter_ndjson(rows, batch_size)
+
+    @staticmethod
+    def _export_record(row) -> dict:
+        record = {
+            "id": row.id,
+            "sponge_id": row.sponge_id,
+            "type": row.type.value if row.type is not None else None,
+            "quantity": row.quantity,
+            "price": row.price,
+            "note": row.note,
+            "date": row.date.isoformat() if row.date else None,
+            "created_by": row.created_by,
+        }
+        if "archived" in row._fields:
+            record["archived"] = bool(row.archived)
+        return record
+
+    def _iter_ndjson(self, rows, batch_size: int):
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(self._export_record(row), ensure_ascii=False))
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    def _iter_csv(self, rows, batch_size: int, columns: list[str] = EXPORT_COLUMNS):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        # Başlık hemen gönderilir (time-to-first-byte)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+        pending = 0
+        for row in rows:
+            record = self._export_record(row)
+            writer.writerow([record[col] for col in columns])
+            pending += 1
+            if pending >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if pending:
+            yield buffer.getvalue()
+
+    def get_status(self, sponge_id: int, as_of: str | None = None):
         sponge = self.sponge_repo.get_by_id(sponge_id)
         if not sponge:
             raise HTTPException(status_code=404, detail="Sponge not found")
 
-        total = self.repo.get_total_stock(sponge_id)
+        if as_of is None:
+            total = self.repo.get_total_stock(sponge_id)
+        else:
+            total = self.repo.get_total_stock_as_of(sponge_id, self._parse_as_of(as_of))
 
-        return {
+        status = {
             "sponge_id": sponge_id,
             "total": total,
             "critical": total <= sponge.critical_stock,
         }
+        if as_of is not None:
+            status["as_of"] = as_of
+        return status
 
     def get_total_quantity(self, sponge_id: int):
-        # COALESCE kullanarak None dönmesini engelliyoruz (0 döner)
-        in_qty = (
-            self.db.query(func.coalesce(func.sum(Stock.quantity), 0))
-            .filter(Stock.sponge_id == sponge_id, Stock.type == StockType.in_)
-            .scalar()
-        )
-
-        out_qty = (
-            self.db.query(func.coalesce(func.sum(Stock.quantity), 0))
-            .filter(Stock.sponge_id == sponge_id, Stock.type == StockType.out)
-            .scalar()
-        )
-
-        return_qty = (
-            self.db.query(func.coalesce(func.sum(Stock.quantity), 0))
-            .filter(Stock.sponge_id == sponge_id, Stock.type == StockType.return_)
-            .scalar()
-        )
-
-        return in_qty + return_qty - out_qty
\ No newline at end of file
+        # Giriş + iade - çıkış; stock_balances tablosunda hazır tutulur
+        return self.repo.get_total_stock(sponge_id)
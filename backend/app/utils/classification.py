@@ -0,0 +1,47 @@
+# app/utils/classification.py
+"""
+ABC/XYZ stok sınıflandırması için vektörel yardımcılar; tüm katalog tek geçişte sınıflanır.
+"""
+import numpy as np
+
+
+def abc_classes(values: np.ndarray, a_share: float, b_share: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Değere göre ABC sınıfı. Süngerler değere göre azalan sıralanır; kendisinden önceki
+    kümülatif pay `a_share`'den küçükse A, `b_share`'den küçükse B, değilse C'dir
+    (eşiği aşan ilk kalem de üst sınıfa dahil olur). Değeri olmayanlar her zaman C'dir.
+    (sınıflar, kümülatif paylar) döner; diziler girişle aynı sıradadır.
+    """
+    total = values.sum()
+    order = np.argsort(-values, kind="stable")
+    cumulative = np.empty_like(values, dtype=np.float64)
+    cumulative[order] = np.cumsum(values[order]) / total if total > 0 else 0.0
+    before = cumulative - (values / total if total > 0 else 0.0)
+
+    classes = np.select([before < a_share, before < b_share], ["A", "B"], default="C")
+    classes[values <= 0] = "C"
+    return classes, cumulative
+
+
+def xyz_classes(mean: np.ndarray, std: np.ndarray, x_cv: float, y_cv: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Talep değişkenliğine (varyasyon katsayısı, std / ortalama) göre XYZ sınıfı:
+    cv <= x_cv → X, cv <= y_cv → Y, değilse Z. Talebi olmayanlar Z'dir (cv = NaN).
+    """
+    cv = np.full(mean.shape, np.nan)
+    demand = mean > 0
+    cv[demand] = std[demand] / mean[demand]
+    classes = np.select([cv <= x_cv, cv <= y_cv], ["X", "Y"], default="Z")
+    return classes, cv
+
+
+def demand_moments(total: np.ndarray, squares: np.ndarray, n_days: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Günlük toplam ve kareler toplamından (hareketsiz günler 0 sayılarak) ortalama ve
+    örneklem standart sapması.
+    """
+    mean = total / n_days
+    if n_days < 2:
+        return mean, np.zeros_like(mean)
+    variance = (squares - n_days * mean * mean) / (n_days - 1)
+    return mean, np.sqrt(np.maximum(variance, 0))
@@ -0,0 +1,77 @@
+# app/utils/forecasting.py
+"""
+Tüketim tahmini için vektörel yardımcılar. Tüm fonksiyonlar (sünger x gün) matrisi
+üzerinde tek geçişte çalışır; sünger başına Python döngüsü yoktur.
+"""
+import numpy as np
+
+
+def consumption_matrix(rows: np.ndarray, n_sponges: int, n_days: int) -> np.ndarray:
+    """
+    (sünger_index, gün_offseti, değer) satırlarından (n_sponges x n_days) yoğun matris kurar.
+    Aynı hücreye düşen değerler toplanır; hareket olmayan günler 0'dır.
+    """
+    matrix = np.zeros((n_sponges, n_days), dtype=np.float64)
+    if len(rows):
+        np.add.at(matrix, (rows[:, 0].astype(np.intp), rows[:, 1].astype(np.intp)), rows[:, 2])
+    return matrix
+
+
+def moving_average(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` günün satır bazında ortalaması."""
+    window = min(window, matrix.shape[1])
+    return matrix[:, -window:].mean(axis=1)
+
+
+def exponential_smoothing(matrix: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Basit üstel düzleştirmenin (s_t = a*x_t + (1-a)*s_(t-1), s_0 = x_0) son değeri.
+    Özyineleme kapalı formda tek bir matris-vektör çarpımıdır:
+    s_(n-1) = sum_k a*(1-a)^k * x_(n-1-k)  +  (1-a)^(n-1) * x_0
+    """
+    n_days = matrix.shape[1]
+    if n_days == 0:
+        return np.zeros(matrix.shape[0])
+    decay = (1 - alpha) ** np.arange(n_days - 1, -1, -1, dtype=np.float64)
+    weights = alpha * decay
+    weights[0] = decay[0]
+    return matrix @ weights
+
+
+def days_of_cover(on_hand: np.ndarray, daily_rate: np.ndarray) -> np.ndarray:
+    """Mevcut stoğun günlük tüketimle kaç gün yeteceği; tüketim yoksa +inf."""
+    cover = np.full(on_hand.shape, np.inf)
+    consuming = daily_rate > 0
+    cover[consuming] = np.maximum(on_hand[consuming], 0) / daily_rate[consuming]
+    return cover
+
+
+def reorder_levels(matrix: np.ndarray, lead_time: np.ndarray, on_hand: np.ndarray,
+                   z: float, review_days: int) -> dict[str, np.ndarray]:
+    """
+    Günlük talebin ortalaması (mu) ve standart sapmasından (sigma) sünger bazında
+    periyodik gözden geçirme (order-up-to) politikası seviyeleri:
+
+        güvenlik stoğu      SS  = z * sigma * sqrt(L)
+        yeniden sipariş     ROP = mu * L + SS
+        tamamlama seviyesi  S   = mu * (L + R) + SS
+        sipariş miktarı     Q   = max(S - stok, 0)   (stok ROP'un üzerindeyse 0)
+    """
+    n_days = matrix.shape[1]
+    mean = matrix.mean(axis=1) if n_days else np.zeros(matrix.shape[0])
+    std = matrix.std(axis=1, ddof=1) if n_days > 1 else np.zeros(matrix.shape[0])
+    # Net tüketim (çıkış - iade) negatif olabilir; talep negatif kabul edilmez
+    mean = np.maximum(mean, 0)
+
+    safety = z * std * np.sqrt(lead_time)
+    reorder_point = mean * lead_time + safety
+    order_up_to = mean * (lead_time + review_days) + safety
+    quantity = np.where(on_hand <= reorder_point, np.maximum(order_up_to - on_hand, 0), 0.0)
+    return {
+        "avg_daily_demand": mean,
+        "demand_std": std,
+        "safety_stock": safety,
+        "reorder_point": reorder_point,
+        "order_up_to": order_up_to,
+        "order_quantity": quantity,
+    }
@@ -0,0 +1,20 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(moment: datetime, row_id: int) -> str:
+    """
+    Keyset sayfalama imleci: (tarih, id) çiftini URL-güvenli, opak bir metne çevirir.
+    """
+    raw = f"{moment.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """İmleci (tarih, id) çiftine çözer; geçersizse ValueError fırlatır."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        moment, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(moment), int(row_id)
+    except Exception:
+        raise ValueError("Geçersiz cursor")
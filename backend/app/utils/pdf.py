@@ -0,0 +1,101 @@
+# app/utils/pdf.py
+from typing import BinaryIO
+
+# WinAnsiEncoding'de (cp1252) bulunmayan Türkçe karakterler
+_TRANSLITERATION = str.maketrans({"ş": "s", "Ş": "S", "ğ": "g", "Ğ": "G", "ı": "i", "İ": "I"})
+
+
+def _pdf_text(text: str) -> bytes:
+    encoded = text.translate(_TRANSLITERATION).encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class SimplePdfWriter:
+    """
+    Harici bağımlılık gerektirmeyen, yalnızca metin satırlarından oluşan minimal PDF yazıcısı.
+
+    Satırlar sabit genişlikli fontla (Courier) A4 sayfalara yazılır; bellekte yalnızca
+    o anki sayfanın satırları tutulur, dolan sayfa hemen dosyaya aktarılır. Böylece
+    çıktı boyutu ne olursa olsun bellek kullanımı sabittir.
+    """
+
+    PAGE_WIDTH = 595
+    PAGE_HEIGHT = 842
+    MARGIN = 40
+    FONT_SIZE = 9
+    LEADING = 12
+
+    # Sabit nesne numaraları: 1 katalog, 2 sayfa ağacı, 3-4 fontlar
+    _CATALOG, _PAGES, _FONT, _FONT_BOLD = 1, 2, 3, 4
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.lines_per_page = (self.PAGE_HEIGHT - 2 * self.MARGIN) // self.LEADING
+        self._position = 0
+        self._offsets: dict[int, int] = {}
+        self._next_object = 5
+        self._page_objects: list[int] = []
+        self._lines: list[tuple[str, bool]] = []
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(self._FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+        self._object(self._FONT_BOLD, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>")
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self._position += len(data)
+
+    def _object(self, number: int, body: bytes) -> None:
+        self._offsets[number] = self._position
+        self._write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def line(self, text: str = "", bold: bool = False) -> None:
+        self._lines.append((text, bold))
+        if len(self._lines) >= self.lines_per_page:
+            self._flush_page()
+
+    def _flush_page(self) -> None:
+        top = self.PAGE_HEIGHT - self.MARGIN
+        content = [b"BT", b"%d TL" % self.LEADING, b"%d %d Td" % (self.MARGIN, top)]
+        current_font = None
+        for text, bold in self._lines:
+            font = b"/F2" if bold else b"/F1"
+            if font != current_font:
+                content.append(font + b" %d Tf" % self.FONT_SIZE)
+                current_font = font
+            content.append(b"(" + _pdf_text(text) + b") Tj T*")
+        content.append(b"ET")
+        data = b"\n".join(content)
+
+        content_number, page_number = self._allocate(), self._allocate()
+        self._object(content_number, b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        self._object(page_number, (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._PAGES, self.PAGE_WIDTH, self.PAGE_HEIGHT, self._FONT, self._FONT_BOLD, content_number)
+        ))
+        self._page_objects.append(page_number)
+        self._lines = []
+
+    def close(self) -> None:
+        if self._lines or not self._page_objects:
+            self._flush_page()
+
+        kids = b" ".join(b"%d 0 R" % number for number in self._page_objects)
+        self._object(self._PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_objects)))
+        self._object(self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES)
+
+        xref_offset = self._position
+        count = self._next_object
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+        for number in range(1, count):
+            self._write(b"%010d 00000 n \n" % self._offsets[number])
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (count, self._CATALOG, xref_offset)
+        )
@@ -0,0 +1,89 @@
+"""
+Tekil `POST /stocks/` ile toplu `POST /stocks/bulk` yollarının saniyedeki satır
+(rows/second) karşılaştırması.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_bulk_ingest.py --rows 2000 --batch 500
+
+Varsayılan olarak geçici bir SQLite dosyası kullanır; gerçek veritabanında ölçmek
+için DATABASE_URL ortam değişkenini verin (tablolar silinip yeniden oluşturulur!).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_db = os.path.join(tempfile.gettempdir(), "sponge_bench_ingest.db")
+for key, value in {
+    "DATABASE_URL": f"sqlite:///{_tmp_db}",
+    "SECRET_KEY": "bench", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "APP_NAME": "bench", "APP_ENV": "bench", "LOG_LEVEL": "WARNING", "CORS_ORIGINS": "*",
+}.items():
+    os.environ.setdefault(key, value)
+
+import logging  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+
+
+def _reset(client):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids = []
+    for i in range(10):
+        res = client.post("/sponges/", json={
+            "name": f"BenchFoam{i}", "density": 20 + i, "hardness": "medium", "unit": "adet",
+        })
+        ids.append(res.json()["id"])
+    return ids
+
+
+def _items(sponge_ids, rows):
+    # Her süngere önce giriş, ardından küçük çıkışlar
+    items = [{"sponge_id": sid, "type": "in", "quantity": rows} for sid in sponge_ids]
+    for i in range(rows - len(items)):
+        items.append({"sponge_id": sponge_ids[i % len(sponge_ids)], "type": "out", "quantity": 1})
+    return items
+
+
+def bench_single(client, rows):
+    items = _items(_reset(client), rows)
+    start = time.perf_counter()
+    for item in items:
+        assert client.post("/stocks/", json=item).status_code == 201
+    return len(items) / (time.perf_counter() - start)
+
+
+def bench_bulk(client, rows, batch):
+    items = _items(_reset(client), rows)
+    start = time.perf_counter()
+    for i in range(0, len(items), batch):
+        res = client.post("/stocks/bulk", json={"items": items[i:i + batch]})
+        assert res.status_code == 201, res.text
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+    single = bench_single(client, args.rows)
+    bulk = bench_bulk(client, args.rows, args.batch)
+    Base.metadata.drop_all(bind=engine)
+
+    print(f"rows={args.rows} batch={args.batch} db={engine.url.get_backend_name()}")
+    print(f"  POST /stocks/      : {single:10.1f} rows/s")
+    print(f"  POST /stocks/bulk  : {bulk:10.1f} rows/s  ({bulk / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+E-posta kuyruğu göndericisinin ölçümü: kuyruktaki mesajlar havuzlanmış SMTP
+bağlantıları üzerinden partiler halinde gönderilir; karşılaştırma için aynı mesajlar
+kuyruk öncesindeki senkron gönderimde olduğu gibi mesaj başına yeni bağlantı açılarak
+da gönderilir. Sunucu olarak yerel bir aiosmtpd örneği kullanılır; gerçek bir SMTP
+sunucusunun TLS + AUTH el sıkışma maliyeti --handshake-ms ile taklit edilir.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_email_outbox.py --messages 1000 --pool-size 2 --handshake-ms 50
+
+Varsayılan olarak geçici bir SQLite dosyası kullanır; gerçek veritabanında ölçmek
+için DATABASE_URL ortam değişkenini verin (tablolar silinip yeniden oluşturulur!).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_db = os.path.join(tempfile.gettempdir(), "sponge_bench_email_outbox.db")
+for key, value in {
+    "DATABASE_URL": f"sqlite:///{_tmp_db}",
+    "SECRET_KEY": "bench", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "APP_NAME": "bench", "APP_ENV": "bench", "LOG_LEVEL": "WARNING", "CORS_ORIGINS": "*",
+}.items():
+    os.environ.setdefault(key, value)
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.core.smtp_pool import SmtpPool  # noqa: E402
+from app.models.email_outbox import EmailOutbox  # noqa: E402
+from app.services.email_outbox_service import EmailOutboxService  # noqa: E402
+
+
+class SinkHandler:
+    """Mesajları kabul eder; her yeni bağlantıda el sıkışma gecikmesi uygular."""
+
+    def __init__(self, handshake_seconds: float):
+        self.handshake_seconds = handshake_seconds
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        await asyncio.sleep(self.handshake_seconds)
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(messages: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.execute(insert(EmailOutbox), [
+        {"recipients": ["ops@example.com"], "subject": f"Uyarı {i}", "body": f"<p>{i}</p>",
+         "status": "pending", "attempts": 0}
+        for i in range(messages)
+    ])
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--handshake-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    handler = SinkHandler(args.handshake_ms / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    settings.SMTP_SERVER, settings.SMTP_PORT = "127.0.0.1", controller.port
+    settings.MAIL_USERNAME = settings.MAIL_PASSWORD = None
+    settings.EMAIL_OUTBOX_BATCH_SIZE = args.batch_size
+
+    seed(args.messages)
+    pool = SmtpPool("127.0.0.1", controller.port, starttls=False, size=args.pool_size)
+    db = SessionLocal()
+    service = EmailOutboxService(db, pool)
+    start = time.perf_counter()
+    while sum(service.send_pending().values()):
+        pass
+    pooled = time.perf_counter() - start
+    pool.close()
+    db.close()
+
+    # Eski yol: her mesaj için ayrı bağlantı (TCP + EHLO [+ STARTTLS + LOGIN]), sıralı
+    start = time.perf_counter()
+    for i in range(args.messages):
+        with SmtpPool("127.0.0.1", controller.port, starttls=False, size=1).connection() as smtp:
+            smtp.sendmail(service.sender, ["ops@example.com"], f"Subject: Uyarı {i}\r\n\r\n{i}".encode())
+    per_message = time.perf_counter() - start
+
+    controller.stop()
+    Base.metadata.drop_all(bind=engine)
+
+    print(f"messages={args.messages} pool_size={args.pool_size} batch_size={args.batch_size} "
+          f"handshake={args.handshake_ms:g}ms db={engine.url.get_backend_name()}")
+    print(f"  kuyruk + havuz        : {pooled:7.2f} sn  {args.messages / pooled:8.0f} msg/sn  "
+          f"({pool.connections_opened} bağlantı)")
+    print(f"  mesaj başına bağlantı : {per_message:7.2f} sn  {args.messages / per_message:8.0f} msg/sn  "
+          f"({args.messages} bağlantı)")
+
+
+if __name__ == "__main__":
+    main()
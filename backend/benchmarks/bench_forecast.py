@@ -0,0 +1,127 @@
+"""
+`/reports/forecast` hesaplamasının ölçümü: tüketim sorgusu, (sünger x gün) matrisinin
+kurulması ve vektörel tahmin geçişi ayrı ayrı ve toplam olarak ölçülür; karşılaştırma
+için aynı hesabın sünger başına Python döngüsüyle yapılan sürümü de çalıştırılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_forecast.py --sponges 3000 --days 1095 --density 0.3
+
+Varsayılan olarak geçici bir SQLite dosyası kullanır; gerçek veritabanında ölçmek
+için DATABASE_URL ortam değişkenini verin (tablolar silinip yeniden oluşturulur!).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_db = os.path.join(tempfile.gettempdir(), "sponge_bench_forecast.db")
+for key, value in {
+    "DATABASE_URL": f"sqlite:///{_tmp_db}",
+    "SECRET_KEY": "bench", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "APP_NAME": "bench", "APP_ENV": "bench", "LOG_LEVEL": "WARNING", "CORS_ORIGINS": "*",
+}.items():
+    os.environ.setdefault(key, value)
+
+import numpy as np  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.sponges import Sponge  # noqa: E402
+from app.models.stock_balances import StockBalance  # noqa: E402
+from app.models.stock_daily_rollups import StockDailyRollup  # noqa: E402
+from app.services.forecast_service import ForecastService  # noqa: E402
+from app.utils.forecasting import days_of_cover, exponential_smoothing, moving_average  # noqa: E402
+
+
+def seed(sponges: int, days: int, density: float):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = np.random.default_rng(42)
+    today = datetime.utcnow().date()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Sponge), [
+            {"id": i + 1, "name": f"BenchFoam{i}", "density": i, "hardness": "medium", "unit": "m3", "critical_stock": 5}
+            for i in range(sponges)
+        ])
+        conn.execute(insert(StockBalance), [
+            {"sponge_id": i + 1, "on_hand": float(rng.uniform(0, 5000)), "total_in": 0, "total_out": 0,
+             "total_return": 0, "version": 0}
+            for i in range(sponges)
+        ])
+
+        rows = 0
+        for day_offset in range(days):
+            day = today - timedelta(days=day_offset)
+            moving = np.flatnonzero(rng.random(sponges) < density)
+            outs = rng.uniform(1, 50, size=len(moving))
+            conn.execute(insert(StockDailyRollup), [
+                {"sponge_id": int(s) + 1, "day": day, "total_in": 0.0, "total_out": float(q),
+                 "total_return": 0.0, "movement_count": 1}
+                for s, q in zip(moving, outs)
+            ])
+            rows += len(moving)
+    return rows
+
+
+def loop_forecast(sponges, matrix, window, alpha):
+    """Karşılaştırma: aynı hesap, sünger başına saf Python döngüsü."""
+    result = []
+    for index, sponge in enumerate(sponges):
+        series = matrix[index].tolist()
+        average = sum(series[-window:]) / window
+        level = series[0]
+        for value in series[1:]:
+            level = alpha * value + (1 - alpha) * level
+        result.append((average, level, float(sponge[3]) / level if level > 0 else float("inf")))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sponges", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--density", type=float, default=0.3, help="Bir süngerin bir günde hareket görme olasılığı")
+    parser.add_argument("--window", type=int, default=28)
+    parser.add_argument("--alpha", type=float, default=0.3)
+    args = parser.parse_args()
+
+    rows = seed(args.sponges, args.days, args.density)
+    db = SessionLocal()
+    service = ForecastService(db)
+
+    start = time.perf_counter()
+    sponges, matrix, _ = service.consumption(args.days)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    on_hand = np.array([float(s[3]) for s in sponges])
+    days_of_cover(on_hand, exponential_smoothing(matrix, args.alpha))
+    moving_average(matrix, args.window)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_forecast(sponges, matrix, args.window, args.alpha)
+    looped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    service._forecast(datetime.utcnow().date(), args.days, args.window, args.alpha)
+    total = time.perf_counter() - start
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+    print(f"sponges={args.sponges} days={args.days} rollup_rows={rows} db={engine.url.get_backend_name()}")
+    print(f"  sorgu + matris        : {load * 1000:9.1f} ms")
+    print(f"  vektörel tahmin       : {vectorized * 1000:9.1f} ms")
+    print(f"  Python döngüsü        : {looped * 1000:9.1f} ms  ({looped / vectorized:.0f}x)")
+    print(f"  toplam (endpoint yolu): {total * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
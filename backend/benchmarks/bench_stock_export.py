@@ -0,0 +1,120 @@
+"""
+`/stocks/by_date` dışa aktarımının ölçümü: time-to-first-byte, toplam süre ve
+sunucunun en yüksek bellek kullanımı (peak RSS, /proc/<pid>/status VmHWM).
+
+Her format için ayrı bir uvicorn süreci başlatılır; böylece peak RSS yalnızca
+o formatın isteğini yansıtır. Linux gerektirir.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_stock_export.py --rows 1000000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_tmp_db = os.path.join(tempfile.gettempdir(), "sponge_bench_export.db")
+ENV = {
+    "DATABASE_URL": f"sqlite:///{_tmp_db}",
+    "SECRET_KEY": "bench", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "APP_NAME": "bench", "APP_ENV": "bench", "LOG_LEVEL": "WARNING", "CORS_ORIGINS": "*",
+}
+for key, value in ENV.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import insert  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.sponges import Sponge  # noqa: E402
+from app.models.stocks import Stock, StockType  # noqa: E402
+
+START = datetime(2024, 1, 1)
+
+
+def seed(rows: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(Sponge(name="ExportFoam", density=25, hardness="medium", unit="m3"))
+    db.commit()
+    step = timedelta(days=365) / rows
+    batch = 50_000
+    for offset in range(0, rows, batch):
+        db.execute(insert(Stock), [
+            {"sponge_id": 1, "type": StockType.in_, "quantity": 1.0, "note": "bench", "date": START + step * i}
+            for i in range(offset, min(offset + batch, rows))
+        ])
+        db.commit()
+    db.close()
+
+
+def _peak_rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure(fmt: str, port: int) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ},
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                httpx.get(base + "/")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        baseline_kb = _peak_rss_kb(server.pid)
+
+        url = f"{base}/stocks/by_date?start=2024-01-01&end=2024-12-31&format={fmt}"
+        started = time.perf_counter()
+        ttfb, size = None, 0
+        with httpx.stream("GET", url, timeout=None) as res:
+            for chunk in res.iter_bytes():
+                if ttfb is None:
+                    ttfb = time.perf_counter() - started
+                size += len(chunk)
+        total = time.perf_counter() - started
+        return {
+            "ttfb": ttfb, "total": total, "mb": size / 1e6,
+            "peak_rss_mb": _peak_rss_kb(server.pid) / 1024,
+            "delta_rss_mb": (_peak_rss_kb(server.pid) - baseline_kb) / 1024,
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--formats", default="json,ndjson,csv")
+    args = parser.parse_args()
+
+    seed(args.rows)
+    print(f"rows={args.rows} db={engine.url.get_backend_name()}")
+    for i, fmt in enumerate(args.formats.split(",")):
+        r = measure(fmt, 8765 + i)
+        print(
+            f"  {fmt:6s} ttfb={r['ttfb']:.3f}s total={r['total']:.2f}s size={r['mb']:.1f}MB "
+            f"peak_rss={r['peak_rss_mb']:.0f}MB (+{r['delta_rss_mb']:.0f}MB)"
+        )
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
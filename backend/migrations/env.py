@@ -8,7 +8,19 @@ from app.core.database import Base
 import app.models.users
 import app.models.sponges
 import app.models.stocks
+import app.models.stock_balances
+import app.models.stock_daily_rollups
+import app.models.stock_balance_checkpoints
+import app.models.stocks_archive
 import app.models.reports
+import app.models.scheduled_jobs
+import app.models.stock_alert_states
+import app.models.sponge_reorder_points
+import app.models.notifications
+import app.models.notification_reads
+import app.models.notification_user_states
+import app.models.email_outbox
+import app.models.notification_digest_items
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,53 @@
+"""add stocks_archive and opening balance flag
+
+Revision ID: a0c9e5d3f817
+Revises: f4b2d8c6a715
+Create Date: 2026-10-18 16:57:02.384115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a0c9e5d3f817'
+down_revision: Union[str, Sequence[str], None] = 'f4b2d8c6a715'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stocks', sa.Column('is_opening_balance', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # stocktype enum'u stocks tablosuyla birlikte zaten oluşturuldu
+    stock_type = postgresql.ENUM('in_', 'out', 'return_', name='stocktype', create_type=False)
+    op.create_table('stocks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('sponge_id', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('type', stock_type, nullable=False),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_stock_archive_sponge_date', 'stocks_archive', ['sponge_id', 'date'], unique=False)
+    op.create_index('idx_stock_archive_date_id', 'stocks_archive', ['date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_stock_archive_date_id', table_name='stocks_archive')
+    op.drop_index('idx_stock_archive_sponge_date', table_name='stocks_archive')
+    op.drop_table('stocks_archive')
+    op.drop_column('stocks', 'is_opening_balance')
@@ -0,0 +1,52 @@
+"""add notification feed indexes
+
+Revision ID: a2d8e6f4c193
+Revises: f7c3d9a2e416
+Create Date: 2026-10-18 20:05:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d8e6f4c193'
+down_revision: Union[str, Sequence[str], None] = 'f7c3d9a2e416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a74ecc15d101 boş üretilmişti; tablo migration ile hiç oluşturulmamış olabilir
+    if 'notifications' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'notifications',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('type', sa.String(length=50), nullable=True),
+            sa.Column('is_read', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f('ix_notifications_id'), 'notifications', ['id'], unique=False)
+
+    # GET /notifications/ : kişisel ve genel akışlar ayrı index'lerden okunup UNION ALL ile birleşir
+    op.create_index(
+        'idx_notification_user_created_id', 'notifications', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'idx_notification_global_created_id', 'notifications', ['created_at', 'id'], unique=False,
+        postgresql_where=sa.text('user_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notification_global_created_id', table_name='notifications')
+    op.drop_index('idx_notification_user_created_id', table_name='notifications')
@@ -0,0 +1,53 @@
+"""add notification global counter and per-user global read counts
+
+Revision ID: a9e3c7f1d284
+Revises: f1c6a8d3b592
+Create Date: 2026-10-19 15:27:08.431562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e3c7f1d284'
+down_revision: Union[str, Sequence[str], None] = 'f1c6a8d3b592'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_global_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.add_column(
+        'notification_user_states',
+        sa.Column('global_read_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        "INSERT INTO notification_global_counters (id, total_count) "
+        "SELECT 1, count(*) FROM notifications WHERE user_id IS NULL"
+    )
+    # Okunan genel bildirimler: filigrana kadar olanlar + filigranın üzerinde tek tek okunanlar
+    op.execute(
+        "UPDATE notification_user_states SET global_read_count = ("
+        "SELECT count(*) FROM notifications n "
+        "WHERE n.user_id IS NULL AND n.id <= notification_user_states.global_read_through"
+        ") + ("
+        "SELECT count(*) FROM notification_reads r "
+        "WHERE r.user_id = notification_user_states.user_id "
+        "AND r.notification_id > notification_user_states.global_read_through)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notification_user_states', 'global_read_count')
+    op.drop_table('notification_global_counters')
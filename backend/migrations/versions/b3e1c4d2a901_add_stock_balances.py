@@ -0,0 +1,54 @@
+"""add stock_balances
+
+Revision ID: b3e1c4d2a901
+Revises: a74ecc15d101
+Create Date: 2026-10-18 09:12:04.512311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1c4d2a901'
+down_revision: Union[str, Sequence[str], None] = 'a74ecc15d101'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_balances',
+    sa.Column('sponge_id', sa.Integer(), nullable=False),
+    sa.Column('on_hand', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_in', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_out', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_return', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('last_movement_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sponge_id')
+    )
+
+    # Mevcut defterden başlangıç bakiyelerini doldur
+    op.execute("""
+        INSERT INTO stock_balances (sponge_id, on_hand, total_in, total_out, total_return, last_movement_at, version)
+        SELECT
+            sponge_id,
+            SUM(CASE WHEN type IN ('in_', 'return_') THEN quantity ELSE -quantity END),
+            SUM(CASE WHEN type = 'in_' THEN quantity ELSE 0 END),
+            SUM(CASE WHEN type = 'out' THEN quantity ELSE 0 END),
+            SUM(CASE WHEN type = 'return_' THEN quantity ELSE 0 END),
+            MAX(date),
+            1
+        FROM stocks
+        GROUP BY sponge_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_balances')
@@ -0,0 +1,45 @@
+"""add per-user notification read state and unread counters
+
+Revision ID: b6f1d3a9e527
+Revises: a2d8e6f4c193
+Create Date: 2026-10-18 20:48:33.602117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f1d3a9e527'
+down_revision: Union[str, Sequence[str], None] = 'a2d8e6f4c193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_reads',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('notification_id', sa.Integer(), nullable=False),
+        sa.Column('read_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'notification_id'),
+    )
+    # Sayaç satırları ilk ihtiyaçta bildirimlerden sayılarak oluşturulur; backfill gerekmez
+    op.create_table(
+        'notification_user_states',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.Column('global_read_through', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_user_states')
+    op.drop_table('notification_reads')
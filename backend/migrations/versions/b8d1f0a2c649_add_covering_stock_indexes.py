@@ -0,0 +1,54 @@
+"""add covering indexes for hot stock queries
+
+Revision ID: b8d1f0a2c649
+Revises: a0c9e5d3f817
+Create Date: 2026-10-18 17:41:19.570233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d1f0a2c649'
+down_revision: Union[str, Sequence[str], None] = 'a0c9e5d3f817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (sponge_id, date) yerine: sünger bazlı keyset sıralaması (id dahil) + as_of / doğrulama
+    # toplamları için index-only scan (INCLUDE yalnızca PostgreSQL'de uygulanır)
+    op.create_index(
+        'idx_stock_sponge_date_id', 'stocks', ['sponge_id', 'date', 'id'], unique=False,
+        postgresql_include=['type', 'quantity', 'is_opening_balance'],
+    )
+    op.drop_index('idx_stock_sponge_date', table_name='stocks')
+
+    op.drop_index('idx_stock_archive_sponge_date', table_name='stocks_archive')
+    op.create_index(
+        'idx_stock_archive_sponge_date', 'stocks_archive', ['sponge_id', 'date'], unique=False,
+        postgresql_include=['type', 'quantity'],
+    )
+
+    # Haftalık / aylık rapor ve trend toplamları
+    op.drop_index('idx_rollup_day_sponge', table_name='stock_daily_rollups')
+    op.create_index(
+        'idx_rollup_day_sponge', 'stock_daily_rollups', ['day', 'sponge_id'], unique=False,
+        postgresql_include=['total_in', 'total_out', 'total_return', 'movement_count'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_rollup_day_sponge', table_name='stock_daily_rollups')
+    op.create_index('idx_rollup_day_sponge', 'stock_daily_rollups', ['day', 'sponge_id'], unique=False)
+
+    op.drop_index('idx_stock_archive_sponge_date', table_name='stocks_archive')
+    op.create_index('idx_stock_archive_sponge_date', 'stocks_archive', ['sponge_id', 'date'], unique=False)
+
+    op.create_index('idx_stock_sponge_date', 'stocks', ['sponge_id', 'date'], unique=False)
+    op.drop_index('idx_stock_sponge_date_id', table_name='stocks')
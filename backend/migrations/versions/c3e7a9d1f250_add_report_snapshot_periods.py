@@ -0,0 +1,37 @@
+"""add period columns to reports for stored snapshots
+
+Revision ID: c3e7a9d1f250
+Revises: b8d1f0a2c649
+Create Date: 2026-10-18 18:05:42.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a9d1f250'
+down_revision: Union[str, Sequence[str], None] = 'b8d1f0a2c649'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('period_start', sa.Date(), nullable=True))
+    op.add_column('reports', sa.Column('period_end', sa.Date(), nullable=True))
+    # Her (rapor türü, dönem) için tek snapshot
+    op.create_index(
+        'uq_report_type_period', 'reports', ['report_type', 'period_start', 'period_end'], unique=True,
+    )
+    op.create_index('idx_report_period_end', 'reports', ['period_end'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_report_period_end', table_name='reports')
+    op.drop_index('uq_report_type_period', table_name='reports')
+    op.drop_column('reports', 'period_end')
+    op.drop_column('reports', 'period_start')
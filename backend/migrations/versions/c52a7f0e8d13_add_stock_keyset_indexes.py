@@ -0,0 +1,33 @@
+"""add stock keyset pagination indexes
+
+Revision ID: c52a7f0e8d13
+Revises: b3e1c4d2a901
+Create Date: 2026-10-18 11:40:51.208734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52a7f0e8d13'
+down_revision: Union[str, Sequence[str], None] = 'b3e1c4d2a901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /stocks/ : ORDER BY date DESC, id DESC + opsiyonel filtreler
+    op.create_index('idx_stock_date_id', 'stocks', ['date', 'id'], unique=False)
+    op.create_index('idx_stock_type_date_id', 'stocks', ['type', 'date', 'id'], unique=False)
+    op.create_index('idx_stock_created_by_date_id', 'stocks', ['created_by', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_stock_created_by_date_id', table_name='stocks')
+    op.drop_index('idx_stock_type_date_id', table_name='stocks')
+    op.drop_index('idx_stock_date_id', table_name='stocks')
@@ -0,0 +1,40 @@
+"""add notification digest items
+
+Revision ID: d3a7e9c1f548
+Revises: c8e2f5b7d034
+Create Date: 2026-10-18 23:12:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7e9c1f548'
+down_revision: Union[str, Sequence[str], None] = 'c8e2f5b7d034'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_digest_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=255), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('channel', 'recipient', 'dedupe_key', name='uq_notification_digest_dedupe'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_digest_items')
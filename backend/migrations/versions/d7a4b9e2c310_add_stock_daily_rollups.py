@@ -0,0 +1,53 @@
+"""add stock_daily_rollups
+
+Revision ID: d7a4b9e2c310
+Revises: c52a7f0e8d13
+Create Date: 2026-10-18 13:05:27.441902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4b9e2c310'
+down_revision: Union[str, Sequence[str], None] = 'c52a7f0e8d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_daily_rollups',
+    sa.Column('sponge_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_in', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_out', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_return', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('movement_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sponge_id', 'day')
+    )
+    op.create_index('idx_rollup_day_sponge', 'stock_daily_rollups', ['day', 'sponge_id'], unique=False)
+
+    # Mevcut defterden günlük özetleri doldur
+    op.execute("""
+        INSERT INTO stock_daily_rollups (sponge_id, day, total_in, total_out, total_return, movement_count)
+        SELECT
+            sponge_id,
+            CAST(date AS DATE),
+            SUM(CASE WHEN type = 'in_' THEN quantity ELSE 0 END),
+            SUM(CASE WHEN type = 'out' THEN quantity ELSE 0 END),
+            SUM(CASE WHEN type = 'return_' THEN quantity ELSE 0 END),
+            COUNT(*)
+        FROM stocks
+        GROUP BY sponge_id, CAST(date AS DATE)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_rollup_day_sponge', table_name='stock_daily_rollups')
+    op.drop_table('stock_daily_rollups')
@@ -0,0 +1,49 @@
+"""add scheduled_jobs lease table and critical report type
+
+Revision ID: d9f2b6e4a381
+Revises: c3e7a9d1f250
+Create Date: 2026-10-18 18:32:07.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f2b6e4a381'
+down_revision: Union[str, Sequence[str], None] = 'c3e7a9d1f250'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scheduled_jobs',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(), nullable=False),
+        sa.Column('lease_owner', sa.String(length=255), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_started_at', sa.DateTime(), nullable=True),
+        sa.Column('last_finished_at', sa.DateTime(), nullable=True),
+        sa.Column('last_duration', sa.Float(), nullable=True),
+        sa.Column('last_status', sa.String(length=20), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failure_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # Kritik stok snapshot'ları için yeni rapor türü (ADD VALUE transaction içinde çalışamaz)
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE reporttype ADD VALUE IF NOT EXISTS 'critical'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL enum değerleri geri alınamaz; 'critical' snapshot'ları silinir
+    op.execute("DELETE FROM reports WHERE report_type = 'critical'")
+    op.drop_table('scheduled_jobs')
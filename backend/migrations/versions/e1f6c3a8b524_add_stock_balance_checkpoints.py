@@ -0,0 +1,40 @@
+"""add stock_balance_checkpoints
+
+Revision ID: e1f6c3a8b524
+Revises: d7a4b9e2c310
+Create Date: 2026-10-18 14:22:10.903514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f6c3a8b524'
+down_revision: Union[str, Sequence[str], None] = 'd7a4b9e2c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_balance_checkpoints',
+    sa.Column('sponge_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('on_hand', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_in', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_out', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_return', sa.Float(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sponge_id', 'period_start')
+    )
+    op.create_index('idx_checkpoint_period', 'stock_balance_checkpoints', ['period_start'], unique=False)
+    # Kontrol noktaları veriye bağlı olarak `python -m app.cli checkpoints build` ile üretilir
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_checkpoint_period', table_name='stock_balance_checkpoints')
+    op.drop_table('stock_balance_checkpoints')
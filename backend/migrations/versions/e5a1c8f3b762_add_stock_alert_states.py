@@ -0,0 +1,47 @@
+"""add stock_alert_states for transition-based critical stock alerts
+
+Revision ID: e5a1c8f3b762
+Revises: d9f2b6e4a381
+Create Date: 2026-10-18 18:58:31.402277
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8f3b762'
+down_revision: Union[str, Sequence[str], None] = 'd9f2b6e4a381'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stock_alert_states',
+        sa.Column('sponge_id', sa.Integer(), nullable=False),
+        sa.Column('is_critical', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sponge_id'),
+    )
+
+    # Mevcut kritik süngerler için başlangıç durumu: yükseltme sonrası ilk harekette
+    # zaten kritik olan süngerler için tekrar "kritik" bildirimi üretilmez
+    op.execute(
+        """
+        INSERT INTO stock_alert_states (sponge_id, is_critical)
+        SELECT b.sponge_id, TRUE
+        FROM stock_balances b
+        JOIN sponges s ON s.id = b.sponge_id
+        WHERE b.on_hand <= s.critical_stock
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_alert_states')
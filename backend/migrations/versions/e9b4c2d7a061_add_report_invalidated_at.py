@@ -0,0 +1,32 @@
+"""add report invalidated_at
+
+Revision ID: e9b4c2d7a061
+Revises: d3a7e9c1f548
+Create Date: 2026-10-19 10:24:17.331842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4c2d7a061'
+down_revision: Union[str, Sequence[str], None] = 'd3a7e9c1f548'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('invalidated_at', sa.DateTime(), nullable=True))
+    # Açık dönemler artık saklanmıyor; bugünü içeren dönem raporları (kritik hariç) kaldırılır
+    op.execute(
+        "DELETE FROM reports WHERE report_type <> 'critical' AND period_end > CURRENT_DATE"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('reports', 'invalidated_at')
@@ -0,0 +1,40 @@
+"""count global notifications as unread at read time
+
+Revision ID: f1c6a8d3b592
+Revises: e9b4c2d7a061
+Create Date: 2026-10-19 11:02:45.916204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6a8d3b592'
+down_revision: Union[str, Sequence[str], None] = 'e9b4c2d7a061'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_notification_global_id', 'notifications', ['id'], unique=False,
+        postgresql_where=sa.text('user_id IS NULL'),
+        sqlite_where=sa.text('user_id IS NULL'),
+    )
+    # Sayaç artık yalnızca kişisel bildirimleri tutar
+    op.execute(
+        "UPDATE notification_user_states SET unread_count = ("
+        "SELECT count(*) FROM notifications n "
+        "WHERE n.user_id = notification_user_states.user_id AND n.is_read = false)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notification_global_id', table_name='notifications')
+    # Eski sayaç genel bildirimleri de içeriyordu; `python -m app.cli notifications recount`
+    # eski sürümde çalıştırılarak yeniden hesaplanmalıdır
@@ -0,0 +1,134 @@
+"""partition stocks by month (PostgreSQL)
+
+Revision ID: f4b2d8c6a715
+Revises: e1f6c3a8b524
+Create Date: 2026-10-18 15:48:33.127640
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b2d8c6a715'
+down_revision: Union[str, Sequence[str], None] = 'e1f6c3a8b524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Migration anında bu aydan itibaren kaç ay ilerisi için partition açılacağı.
+# Sonrası günlük `partitions.ensure` zamanlayıcı işi (veya `python -m app.cli partitions ensure`) ile tamamlanır.
+MONTHS_AHEAD = 12
+
+COLUMNS = "id, sponge_id, created_by, quantity, type, price, note, date, created_at, updated_at"
+
+INDEXES = {
+    'ix_stocks_id': ['id'],
+    'idx_stock_sponge_date': ['sponge_id', 'date'],
+    'idx_stock_date_id': ['date', 'id'],
+    'idx_stock_type_date_id': ['type', 'date', 'id'],
+    'idx_stock_created_by_date_id': ['created_by', 'date', 'id'],
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _drop_indexes(table: str) -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def _create_indexes(table: str) -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, table, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite vb.: bölümlenmemiş tablo olduğu gibi kalır
+        return
+
+    # Partition anahtarı NULL olamaz
+    op.execute("UPDATE stocks SET date = COALESCE(created_at, now()) WHERE date IS NULL")
+
+    op.execute("ALTER TABLE stocks RENAME TO stocks_unpartitioned")
+    op.execute("ALTER INDEX stocks_pkey RENAME TO stocks_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE stocks_id_seq OWNED BY NONE")
+    _drop_indexes('stocks_unpartitioned')
+
+    # PostgreSQL'de bölümlenmiş tablonun birincil anahtarı partition anahtarını içermelidir
+    op.execute("""
+        CREATE TABLE stocks (
+            id INTEGER NOT NULL DEFAULT nextval('stocks_id_seq'),
+            sponge_id INTEGER NOT NULL REFERENCES sponges (id) ON DELETE CASCADE,
+            created_by INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            quantity DOUBLE PRECISION NOT NULL,
+            type stocktype NOT NULL,
+            price DOUBLE PRECISION,
+            note TEXT,
+            date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT ck_quantity_positive CHECK (quantity >= 0),
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+    """)
+
+    first = bind.execute(sa.text("SELECT min(date) FROM stocks_unpartitioned")).scalar()
+    month = (first.date() if first else datetime.utcnow().date()).replace(day=1)
+    last = _add_months(datetime.utcnow().date(), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE stocks_y{month.year:04d}m{month.month:02d} PARTITION OF stocks "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    # Beklenmeyen (çok eski / çok ileri) tarihler için güvenlik ağı
+    op.execute("CREATE TABLE stocks_default PARTITION OF stocks DEFAULT")
+
+    op.execute(f"INSERT INTO stocks ({COLUMNS}) SELECT {COLUMNS} FROM stocks_unpartitioned")
+    op.execute("DROP TABLE stocks_unpartitioned")
+    op.execute("ALTER SEQUENCE stocks_id_seq OWNED BY stocks.id")
+
+    # Parent üzerinde oluşturulan index'ler tüm partition'lara (ve yenilerine) uygulanır
+    _create_indexes('stocks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE stocks RENAME TO stocks_partitioned")
+    op.execute("ALTER SEQUENCE stocks_id_seq OWNED BY NONE")
+    _drop_indexes('stocks_partitioned')
+
+    op.execute("""
+        CREATE TABLE stocks (
+            id INTEGER NOT NULL DEFAULT nextval('stocks_id_seq'),
+            sponge_id INTEGER NOT NULL REFERENCES sponges (id) ON DELETE CASCADE,
+            created_by INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            quantity DOUBLE PRECISION NOT NULL,
+            type stocktype NOT NULL,
+            price DOUBLE PRECISION,
+            note TEXT,
+            date TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT ck_quantity_positive CHECK (quantity >= 0),
+            CONSTRAINT stocks_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO stocks ({COLUMNS}) SELECT {COLUMNS} FROM stocks_partitioned")
+    op.execute("DROP TABLE stocks_partitioned")
+    op.execute("ALTER SEQUENCE stocks_id_seq OWNED BY stocks.id")
+    _create_indexes('stocks')
@@ -0,0 +1,44 @@
+"""add sponge lead time and reorder point results
+
+Revision ID: f7c3d9a2e416
+Revises: e5a1c8f3b762
+Create Date: 2026-10-18 19:21:48.935120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3d9a2e416'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c8f3b762'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sponges', sa.Column('lead_time_days', sa.Integer(), nullable=True))
+    op.create_table(
+        'sponge_reorder_points',
+        sa.Column('sponge_id', sa.Integer(), nullable=False),
+        sa.Column('avg_daily_demand', sa.Float(), nullable=False),
+        sa.Column('demand_std', sa.Float(), nullable=False),
+        sa.Column('lead_time_days', sa.Integer(), nullable=False),
+        sa.Column('safety_stock', sa.Float(), nullable=False),
+        sa.Column('reorder_point', sa.Float(), nullable=False),
+        sa.Column('order_up_to', sa.Float(), nullable=False),
+        sa.Column('order_quantity', sa.Float(), nullable=False),
+        sa.Column('balance_version', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['sponge_id'], ['sponges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sponge_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sponge_reorder_points')
+    op.drop_column('sponges', 'lead_time_days')
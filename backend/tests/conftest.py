@@ -13,7 +13,19 @@ from app.core.config import settings
 import app.models.users
 import app.models.sponges 
 import app.models.stocks
+import app.models.stock_balances
+import app.models.stock_daily_rollups
+import app.models.stock_balance_checkpoints
+import app.models.stocks_archive
 import app.models.reports
+import app.models.scheduled_jobs
+import app.models.stock_alert_states
+import app.models.sponge_reorder_points
+import app.models.notifications
+import app.models.notification_reads
+import app.models.notification_user_states
+import app.models.email_outbox
+import app.models.notification_digest_items
 import app.models.refresh_tokens # Auth için gerekli
 
 # ===============================================
@@ -36,6 +48,10 @@ def adjust_settings_for_tests():
     settings.MAIL_FROM = "test@example.com"
     settings.MAIL_USERNAME = "test_user"
     settings.MAIL_PASSWORD = "test_password"
+
+    # Bildirimler testlerde özetlenmeden hemen yazılır; özet davranışı
+    # test_notification_digest.py'de pencere açılarak test edilir.
+    settings.NOTIFICATION_DIGEST_WINDOW_SECONDS = 0
     
     yield
     # Burası bittikten sonra ayarlar varsayılan değerlerine döner (eğer BaseSettings kullanıyorsanız).
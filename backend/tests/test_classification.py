@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.repositories.stock_repository import StockRepository
+from app.repositories.stock_archive_repository import StockArchiveRepository
+from app.utils.classification import abc_classes, demand_moments, xyz_classes
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name: str, density: float):
+    res = client.post(
+        "/sponges/",
+        json={"name": name, "density": density, "hardness": "medium", "unit": "m3", "critical_stock": 5},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def add_movements(movements: list[dict]):
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create(movements)
+    db.close()
+
+
+# ---------------------------
+# VEKTÖREL YARDIMCILAR
+# ---------------------------
+
+def test_abc_classes_use_cumulative_share():
+    values = np.array([5.0, 70.0, 0.0, 20.0, 5.0])
+    classes, cumulative = abc_classes(values, 0.8, 0.95)
+
+    assert list(classes) == ["B", "A", "C", "A", "C"]
+    np.testing.assert_allclose(cumulative[[1, 3, 0, 4]], [0.7, 0.9, 0.95, 1.0])
+
+
+def test_xyz_classes_from_moments():
+    total = np.array([40.0, 40.0, 0.0])
+    squares = np.array([400.0, 1600.0, 0.0])
+    mean, std = demand_moments(total, squares, 4)
+
+    np.testing.assert_allclose(mean, [10.0, 10.0, 0.0])
+    np.testing.assert_allclose(std, [0.0, 20.0, 0.0])
+    classes, cv = xyz_classes(mean, std, 0.5, 1.0)
+    assert list(classes) == ["X", "Z", "Z"]
+    assert np.isnan(cv[2])
+
+
+# ---------------------------
+# /reports/classification
+# ---------------------------
+
+def test_classification_endpoint():
+    steady = create_sponge("SteadyFoam", 20)
+    lumpy = create_sponge("LumpyFoam", 30)
+    idle = create_sponge("IdleFoam", 40)
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    movements = [
+        {"sponge_id": sid, "type": "in", "quantity": 1000, "date": today - timedelta(days=30)}
+        for sid in (steady, lumpy, idle)
+    ]
+    for days_ago in range(28):
+        movements.append({"sponge_id": steady, "type": "out", "quantity": 5, "price": 10, "date": today - timedelta(days=days_ago)})
+    movements.append({"sponge_id": lumpy, "type": "out", "quantity": 10, "price": 15, "date": today})
+    add_movements(movements)
+
+    res = client.get("/reports/classification", params={"history_days": 28})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["total_value"] == 1550
+    assert body["counts"] == {"AX": 1, "BZ": 1, "CZ": 1}
+
+    items = {item["name"]: item for item in body["items"]}
+    assert [item["name"] for item in body["items"]] == ["SteadyFoam", "LumpyFoam", "IdleFoam"]
+    assert items["SteadyFoam"]["class"] == "AX"
+    assert items["SteadyFoam"]["demand_cv"] == 0
+    assert items["LumpyFoam"]["abc"] == "B"
+    assert items["LumpyFoam"]["xyz"] == "Z"
+    assert items["IdleFoam"]["demand_cv"] is None
+
+
+def test_classification_cache_cleared_by_new_movement():
+    sponge_id = create_sponge("CachedFoam", 20)
+    assert client.get("/reports/classification").json()["total_value"] == 0
+
+    add_movements([
+        {"sponge_id": sponge_id, "type": "in", "quantity": 10},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 4, "price": 3},
+    ])
+    assert client.get("/reports/classification").json()["total_value"] == 12
+
+
+def test_classification_value_includes_archived_movements():
+    sponge_id = create_sponge("ArchivedFoam", 20)
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    add_movements([
+        {"sponge_id": sponge_id, "type": "in", "quantity": 100, "date": today - timedelta(days=40)},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 10, "price": 2, "date": today - timedelta(days=30)},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 5, "price": 2, "date": today - timedelta(days=5)},
+    ])
+    db = TestingSessionLocal()
+    StockArchiveRepository(db).archive(today - timedelta(days=10))
+    db.close()
+
+    # Değer ve talep aynı defteri okur: arşivlenen çıkış her iki eksende de sayılır
+    item = client.get("/reports/classification", params={"history_days": 60}).json()["items"][0]
+    assert item["value"] == 30
+    assert item["avg_daily_demand"] == 0.25
@@ -0,0 +1,219 @@
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.core.smtp_pool import SmtpPool
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox_service import EmailOutboxService
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+class RecordingHandler:
+    """Gelen mesajları ve hangi SMTP oturumundan geldiklerini kaydeder."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+        self.data_reply = None
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        if self.data_reply:
+            return self.data_reply
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+def make_pool(port: int) -> SmtpPool:
+    return SmtpPool("127.0.0.1", port, starttls=False, size=2, timeout=5)
+
+
+def enqueue(db, count: int, to: str = "ops@example.com"):
+    service = EmailOutboxService(db)
+    return [service.enqueue([to], f"Uyarı {i}", f"<p>{i}</p>") for i in range(count)]
+
+
+def outbox_rows(db) -> list[EmailOutbox]:
+    db.expire_all()
+    return db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+
+
+def test_batch_is_sent_over_pooled_connections(smtp_server):
+    handler, port = smtp_server
+    pool = make_pool(port)
+    db = TestingSessionLocal()
+    enqueue(db, 20)
+
+    counts = EmailOutboxService(db, pool).send_pending()
+    pool.close()
+
+    assert counts == {"sent": 20, "retried": 0, "failed": 0}
+    assert len(handler.messages) == 20
+    # Mesaj başına bağlantı yerine en fazla havuz boyutu kadar oturum açılır
+    assert pool.connections_opened <= 2
+    assert len(handler.sessions) <= 2
+    rows = outbox_rows(db)
+    assert all(r.status == "sent" and r.attempts == 1 and r.sent_at is not None for r in rows)
+    db.close()
+
+
+def test_connections_are_reused_across_batches(smtp_server):
+    handler, port = smtp_server
+    pool = make_pool(port)
+    db = TestingSessionLocal()
+
+    for _ in range(3):
+        enqueue(db, 4)
+        EmailOutboxService(db, pool).send_pending()
+    pool.close()
+
+    assert len(handler.messages) == 12
+    assert pool.connections_opened <= 2
+    db.close()
+
+
+def test_transient_failure_is_retried_with_backoff(smtp_server):
+    handler, port = smtp_server
+    pool = make_pool(port)
+    db = TestingSessionLocal()
+    enqueue(db, 1)
+    now = datetime.utcnow()
+
+    handler.data_reply = "451 4.3.0 Try again later"
+    counts = EmailOutboxService(db, pool).send_pending(now)
+    assert counts == {"sent": 0, "retried": 1, "failed": 0}
+    row = outbox_rows(db)[0]
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert row.next_attempt_at > now
+    assert "451" in row.last_error
+
+    # Bekleme süresi dolmadan tekrar denenmez
+    assert EmailOutboxService(db, pool).send_pending(now)["sent"] == 0
+
+    handler.data_reply = None
+    counts = EmailOutboxService(db, pool).send_pending(row.next_attempt_at)
+    pool.close()
+    assert counts == {"sent": 1, "retried": 0, "failed": 0}
+    row = outbox_rows(db)[0]
+    assert row.status == "sent"
+    assert row.attempts == 2
+    db.close()
+
+
+def test_permanent_rejection_fails_without_blocking_batch(smtp_server):
+    handler, port = smtp_server
+    pool = make_pool(port)
+    db = TestingSessionLocal()
+    enqueue(db, 1, to="bounce@example.com")
+    enqueue(db, 3)
+
+    counts = EmailOutboxService(db, pool).send_pending()
+    pool.close()
+
+    assert counts == {"sent": 3, "retried": 0, "failed": 1}
+    rows = outbox_rows(db)
+    assert rows[0].status == "failed"
+    assert "550" in rows[0].last_error
+    assert [r.status for r in rows[1:]] == ["sent"] * 3
+    db.close()
+
+
+def test_unreachable_server_keeps_messages_queued():
+    pool = make_pool(free_port())
+    db = TestingSessionLocal()
+    enqueue(db, 3)
+
+    counts = EmailOutboxService(db, pool).send_pending()
+
+    assert counts == {"sent": 0, "retried": 3, "failed": 0}
+    assert all(r.status == "pending" and r.lease_owner is None for r in outbox_rows(db))
+    db.close()
+
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    pool = make_pool(free_port())
+    db = TestingSessionLocal()
+    enqueue(db, 1)
+    now = datetime.utcnow()
+
+    EmailOutboxService(db, pool).send_pending(now)
+    counts = EmailOutboxService(db, pool).send_pending(now + timedelta(days=1))
+
+    assert counts == {"sent": 0, "retried": 0, "failed": 1}
+    assert outbox_rows(db)[0].status == "failed"
+    db.close()
+
+
+def test_claimed_rows_are_not_sent_twice():
+    db = TestingSessionLocal()
+    enqueue(db, 2)
+    now = datetime.utcnow()
+    first = EmailOutboxService(db, owner="a")
+    other = EmailOutboxService(TestingSessionLocal(), owner="b")
+
+    assert len(first.repo.claim("a", now, 10, 60)) == 2
+    assert other.repo.claim("b", now, 10, 60) == []
+    # Kira süresi dolan satırlar (gönderici çöktü) başka göndericiye geçer
+    assert len(other.repo.claim("b", now + timedelta(seconds=61), 10, 60)) == 2
+    other.db.close()
+    db.close()
+
+
+def test_critical_notify_only_enqueues():
+    res = client.post(
+        "/sponges/",
+        json={"name": "MailFoam", "density": 25, "hardness": "medium", "unit": "m3", "critical_stock": 10},
+    )
+    assert res.status_code == 201
+    res = client.post("/stocks/", json={"sponge_id": res.json()["id"], "type": "in", "quantity": 5})
+    assert res.status_code == 201
+
+    res = client.get("/reports/critical?notify=true")
+
+    assert res.status_code == 200
+    db = TestingSessionLocal()
+    rows = outbox_rows(db)
+    assert len(rows) == 1
+    assert rows[0].status == "pending"
+    assert rows[0].recipients == ["admin@factory.com"]
+    assert "MailFoam" in rows[0].body
+    db.close()
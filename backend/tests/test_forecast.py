@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.repositories.stock_repository import StockRepository
+from app.utils.forecasting import consumption_matrix, days_of_cover, exponential_smoothing, moving_average
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name: str, density: float):
+    res = client.post(
+        "/sponges/",
+        json={"name": name, "density": density, "hardness": "medium", "unit": "m3", "critical_stock": 5},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+# ---------------------------
+# VEKTÖREL YARDIMCILAR
+# ---------------------------
+
+def test_exponential_smoothing_matches_recursion():
+    rng = np.random.default_rng(7)
+    matrix = rng.uniform(0, 10, size=(5, 40))
+    alpha = 0.25
+
+    expected = matrix[:, 0].copy()
+    for t in range(1, matrix.shape[1]):
+        expected = alpha * matrix[:, t] + (1 - alpha) * expected
+
+    np.testing.assert_allclose(exponential_smoothing(matrix, alpha), expected)
+
+
+def test_matrix_moving_average_and_cover():
+    rows = np.array([[0, 0, 2.0], [0, 0, 1.0], [1, 3, 4.0]])
+    matrix = consumption_matrix(rows, n_sponges=3, n_days=4)
+    assert matrix[0, 0] == 3.0
+    assert matrix[1, 3] == 4.0
+
+    np.testing.assert_allclose(moving_average(matrix, 2), [0.0, 2.0, 0.0])
+    cover = days_of_cover(np.array([10.0, 10.0, 10.0]), np.array([2.0, 0.0, -1.0]))
+    assert cover[0] == 5.0
+    assert np.isinf(cover[1]) and np.isinf(cover[2])
+
+
+# ---------------------------
+# /reports/forecast
+# ---------------------------
+
+def test_forecast_days_of_cover_orders_fastest_first():
+    fast = create_sponge("FastFoam", 20)
+    slow = create_sponge("SlowFoam", 30)
+    idle = create_sponge("IdleFoam", 40)
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    movements = [
+        {"sponge_id": fast, "type": "in", "quantity": 1000, "date": today - timedelta(days=30)},
+        {"sponge_id": slow, "type": "in", "quantity": 1000, "date": today - timedelta(days=30)},
+        {"sponge_id": idle, "type": "in", "quantity": 50, "date": today - timedelta(days=30)},
+    ]
+    for days_ago in range(28):
+        moment = today - timedelta(days=days_ago)
+        movements.append({"sponge_id": fast, "type": "out", "quantity": 10, "date": moment})
+        movements.append({"sponge_id": slow, "type": "out", "quantity": 2, "date": moment})
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create(movements)
+    db.close()
+
+    res = client.get("/reports/forecast", params={"history_days": 28, "window": 7, "alpha": 0.5})
+    assert res.status_code == 200
+    items = res.json()["items"]
+    assert [item["name"] for item in items] == ["FastFoam", "SlowFoam", "IdleFoam"]
+
+    fast_item = items[0]
+    assert fast_item["on_hand"] == 720
+    assert fast_item["avg_daily_consumption"] == 10
+    assert fast_item["smoothed_daily_consumption"] == pytest.approx(10)
+    assert fast_item["days_of_cover"] == 72.0
+    assert fast_item["stockout_date"] == str(today.date() + timedelta(days=72))
+
+    assert items[1]["days_of_cover"] == pytest.approx(944 / 2, rel=1e-3)
+    assert items[2]["days_of_cover"] is None
+    assert items[2]["stockout_date"] is None
+
+
+def test_forecast_rejects_window_larger_than_history():
+    res = client.get("/reports/forecast", params={"history_days": 14, "window": 28})
+    assert res.status_code == 400
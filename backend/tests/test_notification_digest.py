@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.models.email_outbox import EmailOutbox
+from app.models.notification_digest_items import NotificationDigestItem
+from app.models.notifications import Notification
+from app.repositories.notification_digest_repository import NotificationDigestRepository
+from app.repositories.stock_repository import StockRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_WINDOW_SECONDS", 300)
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_MAX_ITEMS", 50)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponges(count: int, critical_stock=10) -> list[int]:
+    ids = []
+    for i in range(count):
+        res = client.post(
+            "/sponges/",
+            json={"name": f"DigestFoam{i:02d}", "density": 25, "hardness": "medium", "unit": "m3",
+                  "critical_stock": critical_stock},
+        )
+        assert res.status_code == 201
+        ids.append(res.json()["id"])
+    return ids
+
+
+def bulk_upload(sponge_ids: list[int], quantity: float):
+    db = TestingSessionLocal()
+    inserted, errors = StockRepository(db).bulk_create(
+        [{"sponge_id": sponge_id, "type": "in", "quantity": quantity} for sponge_id in sponge_ids]
+    )
+    db.close()
+    assert inserted == len(sponge_ids) and not errors
+
+
+def flush(after_seconds: int = 301) -> int:
+    db = TestingSessionLocal()
+    flushed = NotificationDigestRepository(db).flush(datetime.utcnow() + timedelta(seconds=after_seconds))
+    db.close()
+    return flushed
+
+
+def rows(model):
+    db = TestingSessionLocal()
+    result = db.query(model).order_by(model.id).all()
+    db.close()
+    return result
+
+
+def test_bulk_upload_alerts_become_one_notification():
+    sponge_ids = create_sponges(20)
+    bulk_upload(sponge_ids, 5)         # 20 sünger birden kritik seviyeye düşer
+
+    assert rows(Notification) == []
+    assert len(rows(NotificationDigestItem)) == 20
+
+    # Pencere kapanmadan yazılmaz
+    assert flush(after_seconds=60) == 0
+    assert flush() == 1
+
+    notifications = rows(Notification)
+    assert len(notifications) == 1
+    assert notifications[0].title == "⚠️ Kritik Stok Uyarısı (20)"
+    assert notifications[0].type == "warning"
+    assert notifications[0].user_id is None
+    assert len(notifications[0].message.splitlines()) == 20
+    assert rows(NotificationDigestItem) == []
+
+
+def test_later_alerts_join_open_window():
+    sponge_ids = create_sponges(3)
+    bulk_upload(sponge_ids[:1], 5)
+    bulk_upload(sponge_ids[1:], 5)
+    bulk_upload(sponge_ids[:1], 20)    # ilk sünger normale döner
+
+    assert flush() == 1
+    notification = rows(Notification)[0]
+    assert notification.title == "🔔 Bildirim Özeti (4)"
+    assert notification.type == "warning"
+    assert "DigestFoam00 stoğu kritik seviyenin üzerine çıktı" in notification.message
+
+
+def test_single_alert_is_written_unchanged():
+    sponge_ids = create_sponges(1)
+    bulk_upload(sponge_ids, 5)
+
+    assert flush() == 1
+    notification = rows(Notification)[0]
+    assert notification.title == "⚠️ Kritik Stok Uyarısı"
+    assert notification.message == "DigestFoam00 stoğu kritik seviyede: 5 / 10"
+
+
+def test_size_threshold_flushes_immediately(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_MAX_ITEMS", 5)
+    sponge_ids = create_sponges(7)
+    bulk_upload(sponge_ids, 5)
+
+    notifications = rows(Notification)
+    assert len(notifications) == 1
+    assert notifications[0].title == "⚠️ Kritik Stok Uyarısı (7)"
+    assert rows(NotificationDigestItem) == []
+
+
+def test_digest_counts_once_for_unread():
+    sponge_ids = create_sponges(10)
+    db = TestingSessionLocal()
+    repo = NotificationDigestRepository(db)
+    assert repo.notification_repo.get_unread_count(1) == 0
+    db.close()
+
+    bulk_upload(sponge_ids, 5)
+    flush()
+
+    db = TestingSessionLocal()
+    assert NotificationDigestRepository(db).notification_repo.get_unread_count(1) == 1
+    db.close()
+
+
+def test_repeated_critical_emails_are_coalesced():
+    sponge_ids = create_sponges(2)
+    bulk_upload(sponge_ids, 5)
+
+    for _ in range(3):
+        assert client.get("/reports/critical?notify=true").status_code == 200
+    assert rows(EmailOutbox) == []
+
+    assert flush() == 2                # uygulama içi bildirim + e-posta
+    emails = rows(EmailOutbox)
+    assert len(emails) == 1
+    assert emails[0].recipients == ["admin@factory.com"]
+    assert emails[0].subject == "⚠️ Kritik Stok Uyarısı (2)"
+    assert emails[0].body.count("<li>") == 2
+
+
+def test_disabled_window_writes_directly(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_WINDOW_SECONDS", 0)
+    sponge_ids = create_sponges(3)
+    bulk_upload(sponge_ids, 5)
+
+    assert len(rows(Notification)) == 3
+    assert rows(NotificationDigestItem) == []
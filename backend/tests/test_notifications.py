@@ -0,0 +1,242 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.notifications import Notification
+from app.repositories.notification_repository import NotificationRepository
+from app.core.notification_bus import NotificationBus
+from app.schemas.notification_schema import NotificationCreate
+from app.services.notification_stream import NotificationStream
+from app.utils.auth import get_current_user
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+USER_ID = 1
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=USER_ID)
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+    Base.metadata.drop_all(bind=engine)
+
+
+def seed(rows: list[dict]):
+    db = TestingSessionLocal()
+    db.execute(insert(Notification), rows)
+    db.commit()
+    db.close()
+
+
+def test_feed_merges_personal_and_global_with_keyset_pages():
+    now = datetime.utcnow().replace(microsecond=0)
+    # Aynı saniyede birden fazla satır: sıralama (created_at, id) ile belirlenir
+    seed([
+        {"user_id": (USER_ID, None, 2)[n % 3], "title": f"N{n}", "message": "m",
+         "created_at": now - timedelta(seconds=n // 2)}
+        for n in range(30)
+    ])
+
+    titles, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"before": cursor} if cursor else {})}
+        res = client.get("/notifications/", params=params)
+        assert res.status_code == 200
+        page = res.json()
+        titles += [item["title"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(
+        (n for n in range(30) if n % 3 != 2),
+        key=lambda n: (-(now - timedelta(seconds=n // 2)).timestamp(), -(n + 1)),
+    )
+    assert titles == [f"N{n}" for n in expected]
+
+
+def test_feed_rejects_invalid_cursor():
+    res = client.get("/notifications/", params={"before": "not-a-cursor"})
+    assert res.status_code == 400
+
+
+def unread_count() -> int:
+    res = client.get("/notifications/unread-count")
+    assert res.status_code == 200
+    return res.json()["unread_count"]
+
+
+def create(user_id=None, title="T") -> int:
+    res = client.post("/notifications/", json={"title": title, "message": "m", "user_id": user_id})
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def test_global_read_state_is_per_user():
+    seed([{"user_id": None, "title": "Old", "message": "m"}, {"user_id": USER_ID, "title": "Mine", "message": "m"}])
+    # Sayaç satırı ilk istekte bildirimlerden sayılarak oluşturulur
+    assert unread_count() == 2
+
+    global_id = create(None)
+    create(USER_ID)
+    create(2)  # başka kullanıcının bildirimi sayılmaz
+    assert unread_count() == 4
+
+    res = client.put(f"/notifications/{global_id}")
+    assert res.status_code == 200
+    assert res.json()["is_read"] is True
+    assert client.put(f"/notifications/{global_id}").status_code == 200  # tekrar okumak sayacı düşürmez
+    assert unread_count() == 3
+
+    # Genel bildirim diğer kullanıcı için okunmamış kalır
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=2)
+    assert unread_count() == 3
+    items = {item["id"]: item for item in client.get("/notifications/").json()["items"]}
+    assert items[global_id]["is_read"] is False
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=USER_ID)
+    items = {item["id"]: item for item in client.get("/notifications/").json()["items"]}
+    assert items[global_id]["is_read"] is True
+
+    assert client.put("/notifications/mark-all-read").json() == {"marked_count": 3}
+    assert unread_count() == 0
+    assert all(item["is_read"] for item in client.get("/notifications/").json()["items"])
+
+    # Filigrandan sonra gelen genel bildirim yeniden okunmamış sayılır
+    create(None)
+    assert unread_count() == 1
+
+
+def test_unread_counter_follows_deletes_and_recount():
+    own = create(USER_ID)
+    assert unread_count() == 1
+    assert client.delete(f"/notifications/{own}").status_code == 204
+    assert unread_count() == 0
+
+    # Sayaç dışı yazılan satırlar (ör. elle eklenen) recount ile düzeltilir
+    seed([{"user_id": USER_ID, "title": "Raw", "message": "m"}])
+    assert unread_count() == 0
+
+    db = TestingSessionLocal()
+    assert NotificationRepository(db).recount() == 1
+    db.close()
+    assert unread_count() == 1
+
+
+def test_unread_count_reads_counter_rows_only():
+    for _ in range(5):
+        create(None)
+    first = create(None)
+    create(USER_ID)
+    assert unread_count() == 7
+    client.put(f"/notifications/{first}")
+    client.put("/notifications/mark-all-read")
+    create(None)
+    read_later = create(None)
+    client.put(f"/notifications/{read_later}")
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert unread_count() == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    # Genel akış taranmaz: yalnızca kullanıcı ve genel sayaç satırları okunur
+    assert not any("FROM notifications " in sql or sql.rstrip().endswith("FROM notifications") for sql in statements)
+
+    # Artımlı sayaçlar bildirimlerden yeniden sayılanla aynıdır
+    db = TestingSessionLocal()
+    assert NotificationRepository(db).recount() == 0
+    db.close()
+
+
+# ---------------------------
+# /notifications/stream (SSE)
+# ---------------------------
+
+def parse_frame(frame: str) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def create_in_db(user_id=None, title="T"):
+    db = TestingSessionLocal()
+    try:
+        return NotificationRepository(db).create(NotificationCreate(title=title, message="m", user_id=user_id)).id
+    finally:
+        db.close()
+
+
+def test_stream_pushes_notifications_and_unread_count(monkeypatch):
+    bus = NotificationBus(replay_size=100, max_connections_per_user=5)
+    monkeypatch.setattr("app.repositories.notification_repository.notification_bus", bus)
+
+    async def scenario():
+        stream = NotificationStream(USER_ID, bus=bus, session_factory=TestingSessionLocal, heartbeat_seconds=0.05)
+        frames = stream.events()
+        assert parse_frame(await anext(frames)) == ("unread_count", {"unread_count": 0})
+        assert bus.connection_count(USER_ID) == 1
+
+        assert await anext(frames) == ": heartbeat\n\n"
+
+        await asyncio.to_thread(create_in_db, None, "Global")
+        await asyncio.to_thread(create_in_db, 2, "Other")  # başka kullanıcıya gitmez
+        event_type, data = parse_frame(await anext(frames))
+        assert (event_type, data["title"]) == ("notification", "Global")
+        assert parse_frame(await anext(frames)) == ("unread_count", {"unread_count": 1})
+
+        await frames.aclose()
+        assert bus.connection_count(USER_ID) == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_resumes_from_last_event_id():
+    bus = NotificationBus(replay_size=3, max_connections_per_user=5)
+    first = bus.publish("notification", USER_ID, {"title": "A"})
+    bus.publish("notification", 2, {"title": "Other"})
+    bus.publish("notification", None, {"title": "B"})
+
+    async def collect(last_event_id, count):
+        stream = NotificationStream(USER_ID, bus=bus, session_factory=TestingSessionLocal)
+        frames = stream.events(last_event_id)
+        result = [await anext(frames) for _ in range(count)]
+        await frames.aclose()
+        return result
+
+    frames = asyncio.run(collect(str(first.id), 2))
+    assert frames[0].startswith(f"id: {first.id + 2}\n")
+    assert parse_frame(frames[0]) == ("notification", {"title": "B"})
+    assert parse_frame(frames[1])[0] == "unread_count"
+
+    # Tampondan düşmüş olaylar: istemci listeyi yeniden çekmeli
+    bus.publish("notification", None, {"title": "C"})
+    bus.publish("notification", None, {"title": "D"})
+    assert parse_frame(asyncio.run(collect(str(first.id), 1))[0]) == ("reset", {})
+
+
+def test_stream_connection_cap(monkeypatch):
+    bus = NotificationBus(replay_size=10, max_connections_per_user=1)
+    monkeypatch.setattr("app.services.notification_stream.notification_bus", bus)
+
+    async def scenario():
+        held = bus.subscribe(USER_ID)
+        try:
+            res = await asyncio.to_thread(client.get, "/notifications/stream")
+            assert res.status_code == 429
+        finally:
+            bus.unsubscribe(held)
+
+    asyncio.run(scenario())
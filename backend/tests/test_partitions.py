@@ -0,0 +1,63 @@
+from datetime import date
+from types import SimpleNamespace
+
+from app.core.database import engine
+from app.models.stocks import Stock
+from app.core.partitions import _create_partition, month_partitions, ensure_stock_partitions
+
+
+def test_month_partitions_are_contiguous_half_open_ranges():
+    parts = list(month_partitions(date(2025, 11, 17), date(2026, 2, 3)))
+    assert parts == [
+        ("stocks_y2025m11", date(2025, 11, 1), date(2025, 12, 1)),
+        ("stocks_y2025m12", date(2025, 12, 1), date(2026, 1, 1)),
+        ("stocks_y2026m01", date(2026, 1, 1), date(2026, 2, 1)),
+        ("stocks_y2026m02", date(2026, 2, 1), date(2026, 3, 1)),
+    ]
+
+
+def test_ensure_partitions_is_noop_on_sqlite():
+    # Test veritabanı bölümlenmemiş SQLite tablosu kullanır
+    assert ensure_stock_partitions(engine, months_ahead=2) == []
+
+
+class RecordingConnection:
+    """DEFAULT partition'da satır olup olmadığını taklit eden, SQL'leri kaydeden bağlantı."""
+
+    def __init__(self, stranded: bool):
+        self.stranded = stranded
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        return SimpleNamespace(scalar=lambda: self.stranded if sql.startswith("SELECT 1") else None, rowcount=3)
+
+
+def test_partition_created_directly_when_default_is_clear():
+    connection = RecordingConnection(stranded=False)
+    _create_partition(connection, "stocks_y2027m01", date(2027, 1, 1), date(2027, 2, 1), has_default=True)
+    assert [s.split(" (")[0] for s in connection.statements[1:]] == [
+        'CREATE TABLE IF NOT EXISTS "stocks_y2027m01" PARTITION OF stocks FOR VALUES FROM',
+    ]
+
+
+def test_stranded_default_rows_are_moved_into_new_partition():
+    connection = RecordingConnection(stranded=True)
+    _create_partition(connection, "stocks_y2027m01", date(2027, 1, 1), date(2027, 2, 1), has_default=True)
+    statements = connection.statements[1:]
+    assert statements[0] == 'ALTER TABLE stocks DETACH PARTITION "stocks_default"'
+    assert statements[1].startswith('CREATE TABLE "stocks_y2027m01" PARTITION OF stocks')
+    assert statements[2].startswith("INSERT INTO stocks (") and '"stocks_default"' in statements[2]
+    assert statements[3].startswith('DELETE FROM "stocks_default"')
+    assert statements[4] == 'ALTER TABLE stocks ATTACH PARTITION "stocks_default" DEFAULT'
+
+
+def test_moved_rows_keep_every_stock_column():
+    connection = RecordingConnection(stranded=True)
+    _create_partition(connection, "stocks_y2027m01", date(2027, 1, 1), date(2027, 2, 1), has_default=True)
+    insert = next(s for s in connection.statements if s.startswith("INSERT INTO"))
+    target, source = insert.split(" SELECT ", 1)
+    for column in Stock.__table__.columns:
+        assert f'"{column.name}"' in target and f'"{column.name}"' in source
+    assert '"is_opening_balance"' in target and '"is_opening_balance"' in source
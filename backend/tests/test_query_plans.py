@@ -0,0 +1,195 @@
+"""
+Sıcak stok sorguları için sorgu planı (EXPLAIN) regresyon testleri.
+
+Seed edilmiş bir veri seti üzerinde her repository sorgusunun ürettiği SQL
+yakalanır, aynı parametrelerle EXPLAIN edilir ve büyük tablolarda tam tablo
+taraması (sequential scan) veya ORDER BY için ayrı sıralama adımı görülürse test
+başarısız olur. SQLite (testler) ve PostgreSQL planları ayrı ayrı yorumlanır;
+PostgreSQL'de küçük seed verisinde planlayıcının tercihine takılmamak için
+`enable_seqscan` / `enable_sort` kapatılarak uygun bir index yolu olup olmadığı sınanır.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base, engine
+from app.models.sponges import Sponge
+from app.models.stocks import Stock, StockType
+from app.models.stocks_archive import StockArchive
+from app.models.notifications import Notification
+from app.repositories.stock_repository import StockRepository
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_rollup_repository import StockRollupRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.notification_repository import NotificationRepository
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+LARGE_TABLES = ("stocks", "stocks_archive", "stock_daily_rollups", "notifications")
+SPONGES = 20
+DAYS = 120
+MOVEMENTS_PER_DAY = 3
+NOW = datetime.utcnow()
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = TestingSessionLocal()
+    db.execute(insert(Sponge), [
+        {"name": f"PlanFoam{i}", "density": 20, "hardness": "medium", "thickness": i, "unit": "m3"}
+        for i in range(SPONGES)
+    ])
+    sponge_ids = [row[0] for row in db.query(Sponge.id).all()]
+    rows = [
+        {
+            "sponge_id": sid,
+            "type": (StockType.in_, StockType.out, StockType.return_)[n % 3],
+            "quantity": 1,
+            "date": NOW - timedelta(days=day, hours=n),
+        }
+        for sid in sponge_ids for day in range(DAYS) for n in range(MOVEMENTS_PER_DAY)
+    ]
+    db.execute(insert(Stock), rows[: len(rows) // 2])
+    # Eskilerin bir kısmı arşivde
+    db.execute(insert(StockArchive), [
+        {"id": 10_000_000 + i, **row} for i, row in enumerate(rows[len(rows) // 2:])
+    ])
+    # Birkaç kullanıcıya özel + genel bildirimler
+    db.execute(insert(Notification), [
+        {"user_id": (None, 1, 2, 3)[n % 4], "title": "t", "message": "m", "created_at": NOW - timedelta(minutes=n)}
+        for n in range(4000)
+    ])
+    db.commit()
+    StockBalanceRepository(db).rebuild()
+    StockRollupRepository(db).rebuild()
+    StockCheckpointRepository(db).build()
+    if engine.dialect.name == "sqlite":
+        db.execute(text("ANALYZE"))
+    else:
+        db.execute(text("ANALYZE stocks, stocks_archive, stock_daily_rollups, notifications"))
+    db.commit()
+
+    yield db, sponge_ids
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+
+
+def explain(db, statement, parameters) -> list[str]:
+    connection = db.connection().connection.driver_connection
+    cursor = connection.cursor()
+    if engine.dialect.name == "sqlite":
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    cursor.execute("SET LOCAL enable_seqscan = off")
+    cursor.execute("SET LOCAL enable_sort = off")
+    cursor.execute(f"EXPLAIN {statement}", parameters)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def plan_problems(plan: list[str], allow_sort: bool = False) -> list[str]:
+    tables = "|".join(LARGE_TABLES)
+    if engine.dialect.name == "sqlite":
+        patterns = [rf"^SCAN ({tables})$"]  # index kullanılmayan tam tarama
+        if not allow_sort:
+            patterns.append(r"USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY")
+    else:
+        patterns = [rf"Seq Scan on ({tables})\b"]
+        if not allow_sort:
+            patterns.append(r"^(->\s*)?(Incremental )?Sort\b")
+    return [line for line in plan for p in patterns if re.search(p, line.strip())]
+
+
+def assert_index_only(db, call, allow_sort: bool = False):
+    with captured_selects() as statements:
+        call()
+    assert statements, "Sorgu yakalanamadı"
+    for statement, parameters in statements:
+        plan = explain(db, statement, parameters)
+        problems = plan_problems(plan, allow_sort)
+        assert not problems, f"{statement}\n--- plan ---\n" + "\n".join(plan)
+
+
+HOT_QUERIES = {
+    "dashboard_overview": lambda db, ids: DashboardRepository(db).get_overview_stats(),
+    "dashboard_weekly_trend": lambda db, ids: DashboardRepository(db).get_weekly_trend(),
+    "dashboard_top_movers": lambda db, ids: DashboardRepository(db).get_top_movers(),
+    "report_period_day": lambda db, ids: ReportRepository(db).get_period_summary(
+        (NOW - timedelta(days=7)).date(), NOW.date(), "day"
+    ),
+    "report_period_quarter": lambda db, ids: ReportRepository(db).get_period_summary(
+        (NOW - timedelta(days=110)).date(), NOW.date(), "quarter"
+    ),
+    "report_critical": lambda db, ids: ReportRepository(db).get_critical_stocks(),
+    "forecast_consumption": lambda db, ids: list(ReportRepository(db).iter_daily_consumption(
+        (NOW - timedelta(days=90)).date(), NOW.date()
+    )),
+    "classification_stats": lambda db, ids: ReportRepository(db).get_classification_stats(
+        (NOW - timedelta(days=90)).date(), NOW.date()
+    ),
+    "notification_feed_global": lambda db, ids: NotificationRepository(db).get_by_user(None, 51),
+    "notification_feed_user": lambda db, ids: NotificationRepository(db).get_by_user(2, 51),
+    "notification_feed_before": lambda db, ids: NotificationRepository(db).get_by_user(
+        2, 51, before=(NOW - timedelta(days=1), 10**9)
+    ),
+    "notification_unread_user": lambda db, ids: NotificationRepository(db).get_unread_count(2),
+    "stock_summary": lambda db, ids: StockRepository(db).get_summary(),
+    "stock_total": lambda db, ids: StockRepository(db).get_total_stock(ids[0]),
+    "page_first": lambda db, ids: StockRepository(db).get_page(100),
+    "page_after_cursor": lambda db, ids: StockRepository(db).get_page(100, after=(NOW - timedelta(days=10), 10**9)),
+    "page_by_sponge": lambda db, ids: StockRepository(db).get_page(100, sponge_id=ids[3]),
+    "page_by_type": lambda db, ids: StockRepository(db).get_page(100, stock_type=StockType.out),
+    "page_by_creator": lambda db, ids: StockRepository(db).get_page(100, created_by=1),
+    "page_by_range": lambda db, ids: StockRepository(db).get_page(
+        100, start=NOW - timedelta(days=30), end=NOW - timedelta(days=20)
+    ),
+    "by_date_range": lambda db, ids: StockRepository(db).get_by_date_range(
+        (NOW - timedelta(days=7)).strftime("%Y-%m-%d"), NOW.strftime("%Y-%m-%d")
+    ),
+    "by_date_range_archived": lambda db, ids: StockRepository(db).get_by_date_range(
+        (NOW - timedelta(days=100)).strftime("%Y-%m-%d"), (NOW - timedelta(days=90)).strftime("%Y-%m-%d"), True
+    ),
+    "stream_by_date_range": lambda db, ids: list(StockRepository(db).iter_by_date_range(
+        (NOW - timedelta(days=7)).strftime("%Y-%m-%d"), NOW.strftime("%Y-%m-%d")
+    )),
+    "as_of_one_sponge": lambda db, ids: StockRepository(db).get_total_stock_as_of(ids[5], NOW - timedelta(days=45)),
+    "as_of_summary": lambda db, ids: StockRepository(db).get_summary_as_of(NOW - timedelta(days=45)),
+}
+
+
+# Bu sorgular toplanmış sonucu (sünger sayısı kadar satır) ya da UNION ALL ile birleşen
+# en fazla 2 * limit satırı sıralar; büyük tablo sıralanmaz
+SORTS_AGGREGATED_ROWS = {
+    "dashboard_top_movers", "report_period_day", "report_period_quarter",
+    "notification_feed_user", "notification_feed_before",
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_avoids_scans_and_sorts(seeded_db, name):
+    db, sponge_ids = seeded_db
+    assert_index_only(db, lambda: HOT_QUERIES[name](db, sponge_ids), allow_sort=name in SORTS_AGGREGATED_ROWS)
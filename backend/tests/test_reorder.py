@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.models.sponge_reorder_points import SpongeReorderPoint
+from app.repositories.stock_repository import StockRepository
+from app.services.reorder_service import ReorderService
+from app.utils.forecasting import reorder_levels
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name: str, density: float, **extra):
+    res = client.post(
+        "/sponges/",
+        json={"name": name, "density": density, "hardness": "medium", "unit": "m3", "critical_stock": 5, **extra},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def add_movements(movements: list[dict]):
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create(movements)
+    db.close()
+
+
+def recompute(full: bool = False) -> int:
+    db = TestingSessionLocal()
+    try:
+        return ReorderService(db).recompute(full=full)["computed"]
+    finally:
+        db.close()
+
+
+def test_reorder_levels_formulas():
+    matrix = np.array([[10.0, 10.0, 10.0, 10.0], [0.0, 4.0, 0.0, 4.0]])
+    levels = reorder_levels(matrix, np.array([5.0, 4.0]), np.array([100.0, 0.0]), z=2.0, review_days=10)
+
+    std = np.std([0.0, 4.0, 0.0, 4.0], ddof=1)
+    np.testing.assert_allclose(levels["avg_daily_demand"], [10.0, 2.0])
+    np.testing.assert_allclose(levels["safety_stock"], [0.0, 2.0 * std * 2.0])
+    np.testing.assert_allclose(levels["reorder_point"], [50.0, 8.0 + 4.0 * std])
+    np.testing.assert_allclose(levels["order_up_to"], [150.0, 28.0 + 4.0 * std])
+    # İlk süngerin stoğu ROP'un üzerinde: sipariş önerilmez
+    np.testing.assert_allclose(levels["order_quantity"], [0.0, 28.0 + 4.0 * std])
+
+
+def test_recompute_is_incremental():
+    busy = create_sponge("BusyFoam", 20, lead_time_days=10)
+    quiet = create_sponge("QuietFoam", 30)
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    movements = [
+        {"sponge_id": busy, "type": "in", "quantity": 500, "date": today - timedelta(days=30)},
+        {"sponge_id": quiet, "type": "in", "quantity": 50, "date": today - timedelta(days=30)},
+    ]
+    for days_ago in range(settings.REORDER_HISTORY_DAYS):
+        movements.append({"sponge_id": busy, "type": "out", "quantity": 2, "date": today - timedelta(days=days_ago)})
+    movements[0]["quantity"] = 500 + 2 * settings.REORDER_HISTORY_DAYS
+    add_movements(movements)
+
+    assert recompute() == 2
+    assert recompute() == 0
+
+    items = {item["name"]: item for item in client.get("/reports/reorder").json()}
+    assert items["BusyFoam"]["avg_daily_demand"] == 2
+    assert items["BusyFoam"]["demand_std"] == 0
+    assert items["BusyFoam"]["lead_time_days"] == 10
+    assert items["BusyFoam"]["reorder_point"] == 20
+    assert items["QuietFoam"]["lead_time_days"] == settings.REORDER_DEFAULT_LEAD_TIME_DAYS
+    assert items["QuietFoam"]["reorder_point"] == 0
+
+    # Yalnızca yeni hareketi olan sünger yeniden hesaplanır
+    add_movements([{"sponge_id": quiet, "type": "out", "quantity": 9, "date": today}])
+    assert recompute() == 1
+
+    # Tedarik süresi değişen sünger de yeniden hesaplanır
+    res = client.put(f"/sponges/{busy}", json={
+        "name": "BusyFoam", "density": 20, "hardness": "medium", "unit": "m3", "lead_time_days": 20,
+    })
+    assert res.status_code == 200
+    assert recompute() == 1
+    items = {item["name"]: item for item in client.get("/reports/reorder").json()}
+    assert items["BusyFoam"]["reorder_point"] == 40
+
+    assert recompute(full=True) == 2
+
+
+def test_recompute_refreshes_results_when_window_moves():
+    idle = create_sponge("IdleFoam", 20)
+    create_sponge("FreshFoam", 30)
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    add_movements([
+        {"sponge_id": idle, "type": "in", "quantity": 100, "date": today - timedelta(days=30)},
+    ])
+    assert recompute() == 2
+    assert recompute() == 0
+
+    # Hareket olmasa da dünden kalan sonuç kaymış pencereyi yansıtmaz; yeniden hesaplanır
+    db = TestingSessionLocal()
+    db.query(SpongeReorderPoint).filter(SpongeReorderPoint.sponge_id == idle).update(
+        {"computed_at": today - timedelta(days=1)}
+    )
+    db.commit()
+    db.close()
+    assert recompute() == 1
+
+
+def test_critical_report_uses_dynamic_thresholds():
+    sponge_id = create_sponge("DynamicFoam", 20, lead_time_days=10)
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    movements = [{"sponge_id": sponge_id, "type": "in", "quantity": 300, "date": today - timedelta(days=30)}]
+    for days_ago in range(settings.REORDER_HISTORY_DAYS):
+        movements.append({"sponge_id": sponge_id, "type": "out", "quantity": 3, "date": today - timedelta(days=days_ago)})
+    movements[0]["quantity"] = 3 * settings.REORDER_HISTORY_DAYS + 20
+    add_movements(movements)
+
+    # Stok 20: sabit eşiğin (5) üzerinde, dinamik ROP'un (3 * 10 = 30) altında
+    assert client.get("/reports/critical").json() == {"message": "Kritik stokta ürün bulunmuyor."}
+    # Hesaplanmamışken dinamik eşik de critical_stock'tur
+    assert client.get("/reports/critical", params={"dynamic": True}).json() == {
+        "message": "Kritik stokta ürün bulunmuyor."
+    }
+
+    recompute()
+    items = client.get("/reports/critical", params={"dynamic": True}).json()
+    assert items == [{"name": "DynamicFoam", "available_stock": 20.0, "critical_stock": 30.0, "status": "critical"}]
+
+    reorder = client.get("/reports/reorder").json()
+    assert reorder[0]["order_quantity"] == pytest.approx(3 * (10 + settings.REORDER_REVIEW_DAYS) - 20)
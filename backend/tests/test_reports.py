@@ -1,9 +1,21 @@
+import io
+import os
+import time
+from datetime import datetime
+
 import pytest
+from openpyxl import load_workbook
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
 from app.main import app
+from app.core.config import settings
 from app.core.database import Base, engine
+from app.models.reports import ReportType
+from app.repositories.stock_repository import StockRepository
+from app.services.report_service import ReportService
 
 client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture(autouse=True)
@@ -173,3 +185,248 @@ def test_critical_report_with_critical_item():
     assert item["available_stock"] == 10.0
     assert item["critical_stock"] == 50.0
     assert item["available_stock"] < item["critical_stock"]
+
+
+# ---------------------------
+# PERIOD REPORT (/reports/) TESTLERİ
+# ---------------------------
+
+def seed_history(sponge_id: int, movements):
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create([
+        {"sponge_id": sponge_id, "type": type_, "quantity": qty, "date": moment}
+        for moment, type_, qty in movements
+    ])
+    db.close()
+
+
+@pytest.fixture
+def history():
+    foam = create_sponge(name="PeriodFoam")
+    other = create_sponge(name="OtherFoam")
+    seed_history(foam, [
+        (datetime(2025, 3, 2, 10), "in", 30),     # Pazar  -> hafta 2025-02-24
+        (datetime(2025, 3, 3, 9), "out", 5),      # Pazartesi -> hafta 2025-03-03
+        (datetime(2025, 3, 31, 23), "return", 2),
+        (datetime(2025, 4, 1, 8), "out", 7),      # Q2
+    ])
+    seed_history(other, [(datetime(2025, 3, 3, 12), "in", 11)])
+
+
+def test_period_report_week_buckets(history):
+    res = client.get("/reports/", params={"start": "2025-03-01", "end": "2025-03-08", "granularity": "week"})
+    assert res.status_code == 200
+    data = res.json()
+
+    assert data["total_in"] == 41
+    assert data["total_out"] == 5
+    assert [b["period_start"] for b in data["buckets"]] == ["2025-02-24", "2025-03-03"]
+    second = data["buckets"][1]
+    assert second["net"] == 6
+    assert second["items"] == [
+        {"name": "OtherFoam", "in": 11, "out": 0},
+        {"name": "PeriodFoam", "in": 0, "out": 5},
+    ]
+
+
+def test_period_report_quarter_and_half_open_end(history):
+    res = client.get("/reports/", params={"start": "2025-01-01", "end": "2025-07-01", "granularity": "quarter"})
+    buckets = res.json()["buckets"]
+    assert [(b["period_start"], b["total_in"], b["total_out"]) for b in buckets] == [
+        ("2025-01-01", 43, 5),
+        ("2025-04-01", 0, 7),
+    ]
+
+    # end hariçtir: 1 Nisan hareketi dahil edilmez
+    res = client.get("/reports/", params={"start": "2025-03-01", "end": "2025-04-01", "granularity": "month"})
+    assert [(b["period_start"], b["total_out"]) for b in res.json()["buckets"]] == [("2025-03-01", 5)]
+
+
+def test_period_report_rejects_empty_range():
+    res = client.get("/reports/", params={"start": "2025-03-08", "end": "2025-03-08"})
+    assert res.status_code == 400
+
+
+# ---------------------------
+# RAPOR SNAPSHOT TESTLERİ
+# ---------------------------
+
+def test_closed_month_served_from_snapshot(history):
+    res = client.get("/reports/monthly", params={"month": "2025-03"})
+    assert res.status_code == 200
+    first = res.json()
+    assert first["total_in"] == 43
+    assert first["total_out"] == 5
+
+    history_res = client.get("/reports/history", params={"report_type": "monthly"})
+    assert history_res.status_code == 200
+    rows = history_res.json()
+    assert len(rows) == 1
+    assert rows[0]["period_start"] == "2025-03-01"
+    assert rows[0]["period_end"] == "2025-04-01"
+    assert rows[0]["generated_duration"] is not None
+
+    # Kapanmış dönem: tekrar istekte yeni satır üretilmez, aynı snapshot döner
+    assert client.get("/reports/monthly", params={"month": "2025-03"}).json() == first
+    assert len(client.get("/reports/history").json()) == 1
+
+    detail = client.get(f"/reports/history/{rows[0]['id']}").json()
+    assert detail["summary_json"] == first
+
+
+def test_backdated_movement_marks_snapshot_stale(history):
+    client.get("/reports/monthly", params={"month": "2025-03"})
+    client.get("/reports/monthly", params={"month": "2025-04"})
+    before = {row["period_start"]: row for row in client.get("/reports/history").json()}
+    foam = client.get("/sponges/").json()[0]["id"]
+
+    seed_history(foam, [(datetime(2025, 3, 15, 12), "in", 100)])
+
+    # Snapshot silinmez; yalnızca etkilenen dönem geçersiz işaretlenir
+    rows = {row["period_start"]: row for row in client.get("/reports/history").json()}
+    assert set(rows) == {"2025-03-01", "2025-04-01"}
+    assert rows["2025-03-01"]["invalidated_at"] is not None
+    assert rows["2025-04-01"]["invalidated_at"] is None
+
+    # Okuma aynı satırı yeniden üretir
+    assert client.get("/reports/monthly", params={"month": "2025-03"}).json()["total_in"] == 143
+    rows = {row["period_start"]: row for row in client.get("/reports/history").json()}
+    assert rows["2025-03-01"]["id"] == before["2025-03-01"]["id"]
+    assert rows["2025-03-01"]["invalidated_at"] is None
+
+
+def test_precompute_regenerates_stale_snapshots(history):
+    client.get("/reports/monthly", params={"month": "2025-03"})
+    foam = client.get("/sponges/").json()[0]["id"]
+    seed_history(foam, [(datetime(2025, 3, 15, 12), "in", 100)])
+
+    db = TestingSessionLocal()
+    ReportService(db).precompute(ReportType.monthly)
+    db.close()
+
+    march = [row for row in client.get("/reports/history").json() if row["period_start"] == "2025-03-01"][0]
+    assert march["invalidated_at"] is None
+    assert client.get(f"/reports/history/{march['id']}").json()["summary_json"]["total_in"] == 143
+
+
+def test_current_movement_does_not_touch_closed_snapshots(history):
+    client.get("/reports/monthly", params={"month": "2025-03"})
+    foam = create_sponge(name="TodayFoam")
+    create_stock(foam, "in", 5)
+
+    rows = client.get("/reports/history").json()
+    assert len(rows) == 1 and rows[0]["invalidated_at"] is None
+
+
+def test_open_period_is_computed_live():
+    foam = create_sponge()
+    create_stock(foam, "in", 10)
+    assert client.get("/reports/weekly").json()["total_in"] == 10
+
+    create_stock(foam, "in", 5)
+    assert client.get("/reports/weekly").json()["total_in"] == 15
+    assert client.get("/reports/monthly").json()["total_in"] == 15
+    # Açık dönem saklanmaz
+    assert client.get("/reports/history").json() == []
+
+
+def test_monthly_rejects_invalid_month():
+    assert client.get("/reports/monthly", params={"month": "2025/03"}).status_code == 400
+    assert client.get("/reports/history/999").status_code == 404
+
+
+# ---------------------------
+# DOSYA DIŞA AKTARMA TESTLERİ
+# ---------------------------
+
+def wait_for_file(report_id: int, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        row = client.get(f"/reports/history/{report_id}").json()
+        if row["file_path"]:
+            return row
+        time.sleep(0.05)
+    raise AssertionError("Rapor dosyası zamanında üretilmedi")
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_export_monthly_xlsx(history, storage_dir):
+    res = client.post("/reports/export", params={"report_type": "monthly", "month": "2025-03", "format": "xlsx"})
+    assert res.status_code == 202
+    row = wait_for_file(res.json()["report_id"])
+    assert row["file_path"].startswith(str(storage_dir))
+
+    download = client.get(f"/reports/history/{row['id']}/file")
+    assert download.status_code == 200
+    workbook = load_workbook(io.BytesIO(download.content), read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    header_index = rows.index(("Gün", "Sünger", "Giriş", "Çıkış", "Net"))
+    assert rows[header_index + 1:] == [
+        ("2025-03-02", "PeriodFoam", 30, 0, 30),
+        ("2025-03-03", "OtherFoam", 11, 0, 11),
+        ("2025-03-03", "PeriodFoam", 0, 5, -5),
+        ("2025-03-31", "PeriodFoam", 2, 0, 2),
+    ]
+
+
+def test_export_pdf_supports_range_requests(history, storage_dir):
+    res = client.post("/reports/export", params={"report_type": "weekly", "end": "2025-03-07", "format": "pdf"})
+    row = wait_for_file(res.json()["report_id"])
+
+    full = client.get(f"/reports/history/{row['id']}/file")
+    assert full.headers["content-type"] == "application/pdf"
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.content.startswith(b"%PDF-1.4")
+    assert full.content.rstrip().endswith(b"%%EOF")
+    assert b"PeriodFoam" in full.content
+
+    partial = client.get(f"/reports/history/{row['id']}/file", headers={"Range": "bytes=0-7"})
+    assert partial.status_code == 206
+    assert partial.content == b"%PDF-1.4"
+
+
+def test_export_file_not_ready_and_invalid_format(history, storage_dir):
+    client.get("/reports/monthly", params={"month": "2025-03"})
+    report_id = client.get("/reports/history").json()[0]["id"]
+    assert client.get(f"/reports/history/{report_id}/file").status_code == 404
+
+    res = client.post("/reports/export", params={"report_type": "monthly", "format": "docx"})
+    assert res.status_code == 422
+
+    # İçinde bulunulan ay açık dönemdir; dosyası üretilmez
+    res = client.post("/reports/export", params={"report_type": "monthly"})
+    assert res.status_code == 400
+
+
+def test_regenerated_snapshot_keeps_export_fresh(history, storage_dir):
+    res = client.post("/reports/export", params={"report_type": "monthly", "month": "2025-03", "format": "pdf"})
+    report_id = res.json()["report_id"]
+    path = wait_for_file(report_id)["file_path"]
+    foam = client.get("/sponges/").json()[0]["id"]
+
+    seed_history(foam, [(datetime(2025, 3, 15, 12), "in", 100)])
+    assert client.get("/reports/monthly", params={"month": "2025-03"}).json()["total_in"] == 143
+
+    deadline = time.monotonic() + 10
+    while b"143" not in open(path, "rb").read():
+        assert time.monotonic() < deadline, "Dosya yeniden üretilmedi"
+        time.sleep(0.05)
+    assert client.get(f"/reports/history/{report_id}").json()["file_path"] == path
+
+
+def test_prune_exports_removes_orphaned_files(history, storage_dir):
+    res = client.post("/reports/export", params={"report_type": "monthly", "month": "2025-03"})
+    kept = wait_for_file(res.json()["report_id"])["file_path"]
+    orphan = storage_dir / "monthly_2025-02-01_999.xlsx"
+    orphan.write_bytes(b"eski")
+
+    db = TestingSessionLocal()
+    assert ReportService(db).prune_exports(min_age_seconds=0) == 1
+    db.close()
+    assert not orphan.exists()
+    assert os.path.exists(kept)
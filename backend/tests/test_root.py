@@ -1,7 +1,19 @@
 # tests/test_root.py
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database import UnsupportedDatabaseError, check_dialect
+
 
 def test_root_endpoint(client):
     # 'client' fixture'ı conftest.py'den otomatik gelir ve app ile kurulmuştur.
     res = client.get("/")
     assert res.status_code == 200
-    assert "Welcome" in res.json()["message"]
\ No newline at end of file
+    assert "Welcome" in res.json()["message"]
+
+
+def test_unsupported_database_fails_at_startup():
+    check_dialect(SimpleNamespace(dialect=SimpleNamespace(name="sqlite")))
+    with pytest.raises(UnsupportedDatabaseError):
+        check_dialect(SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.core.scheduler import Job, Scheduler
+from app.models.scheduled_jobs import ScheduledJob
+from app.models.stock_balance_checkpoints import StockBalanceCheckpoint
+from app.repositories.scheduled_job_repository import ScheduledJobRepository
+from app.repositories.stock_repository import StockRepository
+from app.services.scheduler_service import report_jobs
+from app.utils.auth import get_current_admin
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def make_scheduler(jobs):
+    return Scheduler(jobs, session_factory=TestingSessionLocal, tick_seconds=1, lease_seconds=60)
+
+
+def get_job(name: str) -> ScheduledJob:
+    db = TestingSessionLocal()
+    job = db.query(ScheduledJob).filter(ScheduledJob.name == name).one()
+    db.close()
+    return job
+
+
+def test_job_runs_once_across_replicas():
+    calls = []
+    jobs = [Job("counter", 3600, lambda db: calls.append(1))]
+    first, second = make_scheduler(jobs), make_scheduler(jobs)
+
+    assert first.run_pending() == ["counter"]
+    # İkinci replika: iş zaten bu dönem için çalıştı
+    assert second.run_pending() == []
+    assert first.run_pending() == []
+    assert len(calls) == 1
+
+    job = get_job("counter")
+    assert job.run_count == 1
+    assert job.last_status == "success"
+    assert job.lease_owner is None
+    assert job.next_run_at > datetime.utcnow() + timedelta(minutes=59)
+
+
+def test_held_lease_blocks_other_replicas_until_expiry():
+    calls = []
+    scheduler = make_scheduler([Job("counter", 60, lambda db: calls.append(1))])
+    scheduler.register()
+
+    db = TestingSessionLocal()
+    repo = ScheduledJobRepository(db)
+    now = datetime.utcnow()
+    assert repo.try_acquire("counter", "other-replica", now, lease_seconds=300)
+    assert not repo.try_acquire("counter", "third-replica", now, lease_seconds=300)
+
+    assert scheduler.run_pending() == []
+
+    # Kirayı alan replika çöktü: kira süresi dolunca iş devralınır
+    db.query(ScheduledJob).update({"lease_expires_at": now - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+    assert scheduler.run_pending() == ["counter"]
+    assert calls == [1]
+
+
+def test_failed_job_is_recorded_and_lease_released():
+    def boom(db):
+        raise RuntimeError("rapor üretilemedi")
+
+    scheduler = make_scheduler([Job("broken", 60, boom)])
+    assert scheduler.run_pending() == ["broken"]
+
+    job = get_job("broken")
+    assert job.last_status == "failed"
+    assert job.failure_count == 1
+    assert "rapor üretilemedi" in job.last_error
+    assert job.lease_owner is None
+    assert job.last_duration is not None
+
+
+def test_report_jobs_store_snapshots():
+    scheduler = make_scheduler(report_jobs())
+    assert sorted(scheduler.run_pending()) == [
+        "checkpoints.build", "notifications.digest", "partitions.ensure", "reorder.recompute", "reports.critical",
+        "reports.export_cleanup", "reports.monthly", "reports.weekly",
+    ]
+
+    types = sorted(row["report_type"] for row in client.get("/reports/history").json())
+    assert types == ["critical", "monthly", "weekly"]
+
+
+def test_checkpoint_job_builds_missing_periods():
+    res = client.post("/sponges/", json={
+        "name": "CheckpointFoam", "density": 20, "hardness": "medium", "unit": "m3", "critical_stock": 5,
+    })
+    sponge_id = res.json()["id"]
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create([
+        {"sponge_id": sponge_id, "type": "in", "quantity": 10, "date": datetime.utcnow() - timedelta(days=70)},
+    ])
+    db.close()
+
+    jobs = [job for job in report_jobs() if job.name == "checkpoints.build"]
+    assert make_scheduler(jobs).run_pending() == ["checkpoints.build"]
+
+    db = TestingSessionLocal()
+    latest = db.query(StockBalanceCheckpoint).order_by(StockBalanceCheckpoint.period_start.desc()).first()
+    db.close()
+    assert latest.period_start == datetime.utcnow().date().replace(day=1)
+    assert latest.on_hand == 10
+
+
+def test_admin_jobs_endpoint():
+    assert client.get("/admin/jobs").status_code == 401
+
+    make_scheduler(report_jobs()).run_pending()
+    app.dependency_overrides[get_current_admin] = lambda: None
+    try:
+        res = client.get("/admin/jobs")
+    finally:
+        app.dependency_overrides.pop(get_current_admin)
+
+    assert res.status_code == 200
+    jobs = {job["name"]: job for job in res.json()}
+    assert set(jobs) == {
+        "checkpoints.build", "notifications.digest", "partitions.ensure", "reorder.recompute", "reports.critical",
+        "reports.export_cleanup", "reports.monthly", "reports.weekly",
+    }
+    assert all(job["run_count"] == 1 and job["last_status"] == "success" for job in jobs.values())
@@ -0,0 +1,111 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.notifications import Notification
+from app.models.stock_alert_states import StockAlertState
+from app.repositories.stock_repository import StockRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name="AlertFoam", critical_stock=10, density=25):
+    res = client.post(
+        "/sponges/",
+        json={"name": name, "density": density, "hardness": "medium", "unit": "m3", "critical_stock": critical_stock},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def create_stock(sponge_id: int, type_: str, quantity: float):
+    res = client.post("/stocks/", json={"sponge_id": sponge_id, "type": type_, "quantity": quantity})
+    assert res.status_code == 201
+    return res.json()
+
+
+def notifications() -> list[tuple[str, str]]:
+    db = TestingSessionLocal()
+    rows = [(n.type, n.message) for n in db.query(Notification).order_by(Notification.id).all()]
+    db.close()
+    return rows
+
+
+def alert_state(sponge_id: int):
+    db = TestingSessionLocal()
+    state = db.query(StockAlertState).filter(StockAlertState.sponge_id == sponge_id).first()
+    db.close()
+    return state.is_critical if state else None
+
+
+def test_notifications_only_on_transitions():
+    sponge_id = create_sponge(critical_stock=10)
+
+    create_stock(sponge_id, "in", 5)      # ok -> critical
+    create_stock(sponge_id, "in", 2)      # hâlâ kritik: bildirim yok
+    create_stock(sponge_id, "in", 20)     # critical -> ok
+    create_stock(sponge_id, "out", 1)     # hâlâ ok: bildirim yok
+
+    assert [kind for kind, _ in notifications()] == ["warning", "success"]
+    assert notifications()[0][1] == "AlertFoam stoğu kritik seviyede: 5 / 10"
+    assert alert_state(sponge_id) is False
+
+
+def test_critical_report_is_side_effect_free():
+    sponge_id = create_sponge(critical_stock=50)
+    create_stock(sponge_id, "in", 10)
+    before = notifications()
+
+    for _ in range(3):
+        res = client.get("/reports/critical")
+        assert res.status_code == 200
+        assert res.json()[0]["name"] == "AlertFoam"
+
+    assert notifications() == before
+    assert len(before) == 1
+
+
+def test_delete_and_bulk_create_evaluate_transitions():
+    first = create_sponge(name="BulkA", critical_stock=10, density=20)
+    second = create_sponge(name="BulkB", critical_stock=10, density=30)
+
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create([
+        {"sponge_id": first, "type": "in", "quantity": 50},
+        {"sponge_id": second, "type": "in", "quantity": 3},
+    ])
+    db.close()
+    # Yalnızca BulkB kritik seviyeye düştü
+    assert notifications() == [("warning", "BulkB stoğu kritik seviyede: 3 / 10")]
+
+    movement = create_stock(first, "out", 45)
+    assert alert_state(first) is True
+
+    # Çıkış silinince BulkA normale döner
+    assert client.delete(f"/stocks/{movement['id']}").status_code in (200, 204)
+    assert alert_state(first) is False
+    assert [kind for kind, _ in notifications()] == ["warning", "warning", "success"]
+
+
+def test_threshold_change_evaluates_alert_state():
+    sponge_id = create_sponge(critical_stock=5)
+    create_stock(sponge_id, "in", 8)
+    assert notifications() == []
+
+    res = client.put(
+        f"/sponges/{sponge_id}",
+        json={"name": "AlertFoam", "density": 25, "hardness": "medium", "unit": "m3", "critical_stock": 10},
+    )
+    assert res.status_code == 200
+    assert alert_state(sponge_id) is True
+    assert notifications() == [("warning", "AlertFoam stoğu kritik seviyede: 8 / 10")]
@@ -0,0 +1,145 @@
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.stocks import Stock
+from app.models.stocks_archive import StockArchive
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.repositories.stock_repository import StockRepository
+from app.repositories.stock_archive_repository import StockArchiveRepository
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_rollup_repository import StockRollupRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name="ArchiveFoam"):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "m3",
+        "critical_stock": 5,
+    })
+    return res.json()["id"]
+
+
+HISTORY = [
+    (datetime(2023, 1, 10), "in", 100),
+    (datetime(2023, 2, 5), "out", 40),
+    (datetime(2023, 3, 7), "return", 4),
+    (datetime(2024, 6, 1), "in", 20),
+    (datetime(2024, 6, 2), "out", 10),
+]
+
+
+@pytest.fixture
+def sponge_id():
+    sponge_id = create_sponge()
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create([
+        {"sponge_id": sponge_id, "type": type_, "quantity": qty, "date": moment}
+        for moment, type_, qty in HISTORY
+    ])
+    StockCheckpointRepository(db).build(until=date(2024, 7, 1))
+    db.close()
+    return sponge_id
+
+
+def rollups():
+    db = TestingSessionLocal()
+    rows = {
+        (r.sponge_id, r.day): (r.total_in, r.total_out, r.total_return, r.movement_count)
+        for r in db.query(StockDailyRollup).all()
+    }
+    db.close()
+    return rows
+
+
+def test_archive_moves_rows_and_writes_opening_balance(sponge_id):
+    before_summary = client.get("/stocks/summary").json()
+    before_rollups = rollups()
+
+    db = TestingSessionLocal()
+    stats = StockArchiveRepository(db).archive(datetime(2024, 1, 1))
+    assert stats == {"sponges": 1, "archived": 3}
+
+    assert db.query(StockArchive).count() == 3
+    opening = db.query(Stock).filter_by(is_opening_balance=True).one()
+    assert (opening.type.value, opening.quantity, opening.date) == ("in", 64, datetime(2024, 1, 1))
+    assert db.query(Stock).filter_by(is_opening_balance=False).count() == 2
+
+    # Defterden türetilen tüm değerler arşiv dahil edilerek aynı kalır
+    assert StockBalanceRepository(db).verify() == []
+    db.query(StockDailyRollup).delete()
+    db.commit()
+    StockRollupRepository(db).rebuild()
+    db.close()
+
+    assert rollups() == before_rollups
+    assert client.get("/stocks/summary").json() == before_summary
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 74
+    assert client.get(f"/stocks/{sponge_id}/status", params={"as_of": "2023-02-28"}).json()["total"] == 60
+    assert client.get(f"/stocks/{sponge_id}/status", params={"as_of": "2024-06-01"}).json()["total"] == 84
+
+
+def test_rearchive_merges_opening_balance(sponge_id):
+    db = TestingSessionLocal()
+    repo = StockArchiveRepository(db)
+    repo.archive(datetime(2023, 3, 1))
+    repo.archive(datetime(2024, 6, 2))
+
+    opening = db.query(Stock).filter_by(is_opening_balance=True).one()
+    assert (opening.quantity, opening.date) == (84, datetime(2024, 6, 2))
+    assert db.query(StockArchive).count() == 4
+    assert StockBalanceRepository(db).verify() == []
+    db.close()
+
+
+def test_date_range_include_archived(sponge_id):
+    db = TestingSessionLocal()
+    StockArchiveRepository(db).archive(datetime(2024, 1, 1))
+    db.close()
+
+    live = client.get("/stocks/by_date", params={"start": "2023-01-01", "end": "2024-12-31"}).json()
+    assert [(r["quantity"], r["note"] is not None) for r in live] == [(10, False), (20, False), (64, True)]
+
+    full = client.get(
+        "/stocks/by_date",
+        params={"start": "2023-01-01", "end": "2024-12-31", "include_archived": True},
+    ).json()
+    assert [(r["quantity"], r["archived"]) for r in full] == [
+        (10, False), (20, False), (4, True), (40, True), (100, True)
+    ]
+
+    res = client.get(
+        "/stocks/by_date",
+        params={"start": "2023-01-01", "end": "2023-12-31", "include_archived": True, "format": "ndjson"},
+    )
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [r["type"] for r in rows] == ["return", "out", "in"]
+    assert all(r["archived"] for r in rows)
+
+
+def test_opening_balance_cannot_be_deleted(sponge_id):
+    db = TestingSessionLocal()
+    StockArchiveRepository(db).archive(datetime(2024, 1, 1))
+    opening_id = db.query(Stock.id).filter_by(is_opening_balance=True).scalar()
+    db.close()
+
+    res = client.delete(f"/stocks/{opening_id}")
+    assert res.status_code == 400
@@ -0,0 +1,129 @@
+from datetime import date, datetime, time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.stock_balance_checkpoints import StockBalanceCheckpoint
+from app.repositories.stock_repository import StockRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name="AsOfFoam", critical=5):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "m3",
+        "critical_stock": critical,
+    })
+    return res.json()["id"]
+
+
+# (tarih, tip, miktar) — Ocak'tan Nisan'a yayılan hareketler
+HISTORY = [
+    (datetime(2025, 1, 5, 10), "in", 100),
+    (datetime(2025, 1, 20, 15), "out", 30),
+    (datetime(2025, 2, 1, 0), "in", 10),
+    (datetime(2025, 2, 14, 9), "return", 5),
+    (datetime(2025, 3, 3, 12), "out", 40),
+    (datetime(2025, 3, 31, 23, 30), "in", 7),
+    (datetime(2025, 4, 2, 8), "out", 12),
+]
+
+
+def replay(as_of: datetime) -> float:
+    total = 0.0
+    for moment, type_, quantity in HISTORY:
+        if moment <= as_of:
+            total += -quantity if type_ == "out" else quantity
+    return total
+
+
+@pytest.fixture
+def seeded():
+    sponge_id = create_sponge()
+    db = TestingSessionLocal()
+    rows = [
+        {"sponge_id": sponge_id, "type": type_, "quantity": quantity, "date": moment}
+        for moment, type_, quantity in HISTORY
+    ]
+    StockRepository(db).bulk_create(rows)
+    built = StockCheckpointRepository(db).build(until=date(2025, 5, 10))
+    db.close()
+    assert built == 4  # Şubat, Mart, Nisan, Mayıs başları
+    return sponge_id
+
+
+@pytest.mark.parametrize("as_of", [
+    datetime(2025, 1, 4),
+    datetime(2025, 1, 31, 23, 59),
+    datetime(2025, 2, 1, 0, 0),
+    datetime(2025, 3, 15),
+    datetime(2025, 3, 31, 23, 0),
+    datetime(2025, 5, 9),
+])
+def test_as_of_matches_ledger_replay(seeded, as_of):
+    db = TestingSessionLocal()
+    total = StockRepository(db).get_total_stock_as_of(seeded, as_of)
+    db.close()
+    assert total == replay(as_of)
+
+
+def test_status_as_of_date_includes_whole_day(seeded):
+    res = client.get(f"/stocks/{seeded}/status", params={"as_of": "2025-03-31"})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["total"] == replay(datetime.combine(date(2025, 3, 31), time.max)) == 52
+    assert data["critical"] is False
+    assert data["as_of"] == "2025-03-31"
+
+
+def test_as_of_reads_from_checkpoint(seeded):
+    # Kontrol noktası bozulursa sonuç da değişmeli: defterin tamamı taranmıyor
+    db = TestingSessionLocal()
+    db.query(StockBalanceCheckpoint).filter_by(period_start=date(2025, 3, 1)).update(
+        {"on_hand": 0, "total_in": 0, "total_out": 0, "total_return": 0}
+    )
+    db.commit()
+    db.close()
+
+    res = client.get(f"/stocks/{seeded}/status", params={"as_of": "2025-03-15"})
+    assert res.json()["total"] == -40
+
+
+def test_backdated_movement_updates_later_checkpoints(seeded):
+    db = TestingSessionLocal()
+    StockRepository(db).bulk_create([
+        {"sponge_id": seeded, "type": "in", "quantity": 3, "date": datetime(2025, 2, 20)}
+    ])
+    periods = {
+        row.period_start: row.on_hand
+        for row in db.query(StockBalanceCheckpoint).filter_by(sponge_id=seeded).all()
+    }
+    db.close()
+
+    assert periods[date(2025, 2, 1)] == 70
+    assert periods[date(2025, 3, 1)] == 88
+    assert periods[date(2025, 5, 1)] == 43
+
+    summary = client.get("/stocks/summary", params={"as_of": "2025-02-28"}).json()
+    assert summary[0]["current_stock"] == 88
+    assert summary[0]["total_in"] == 113
+
+
+def test_invalid_as_of_returns_400(seeded):
+    res = client.get(f"/stocks/{seeded}/status", params={"as_of": "31.03.2025"})
+    assert res.status_code == 400
@@ -0,0 +1,106 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.stock_balances import StockBalance
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_repository import StockRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name="BalanceFoam", critical=5):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "m3",
+        "critical_stock": critical,
+    })
+    return res.json()["id"]
+
+
+def create_stock(sponge_id, type_, quantity):
+    res = client.post("/stocks/", json={"sponge_id": sponge_id, "type": type_, "quantity": quantity})
+    assert res.status_code == 201
+    return res.json()
+
+
+def test_balance_follows_movements():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 40)
+    create_stock(sponge_id, "out", 15)
+    create_stock(sponge_id, "return", 5)
+
+    db = TestingSessionLocal()
+    balance = db.query(StockBalance).filter_by(sponge_id=sponge_id).one()
+    assert balance.on_hand == 30
+    assert (balance.total_in, balance.total_out, balance.total_return) == (40, 15, 5)
+    assert balance.version == 3
+    db.close()
+
+    summary = client.get("/stocks/summary").json()
+    assert summary[0]["current_stock"] == 30
+    assert summary[0]["total_return"] == 5
+
+
+def test_delete_reverts_balance():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 40)
+    out = create_stock(sponge_id, "out", 15)
+
+    client.delete(f"/stocks/{out['id']}")
+
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 40
+
+
+def test_failed_delete_rolls_back_partial_updates():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 40)
+    out = create_stock(sponge_id, "out", 15)
+
+    db = TestingSessionLocal()
+    repo = StockRepository(db)
+
+    def fail(sponge_ids):
+        raise RuntimeError("uyarı durumu yazılamadı")
+
+    repo.alert_repo.evaluate = fail
+    with pytest.raises(RuntimeError):
+        repo.delete(out["id"])
+    # Oturum geri alınmıştır; aynı oturumla devam edilebilir ve hiçbir delta yazılmamıştır
+    assert repo.get_by_id(out["id"]) is not None
+    assert StockBalanceRepository(db).verify() == []
+    db.close()
+
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 25
+
+
+def test_verify_detects_and_rebuild_repairs_drift():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 40)
+    create_stock(sponge_id, "out", 10)
+
+    db = TestingSessionLocal()
+    db.query(StockBalance).filter_by(sponge_id=sponge_id).update({"on_hand": 999})
+    db.commit()
+
+    repo = StockBalanceRepository(db)
+    drift = repo.verify(chunk_size=1)
+    assert drift == [{"sponge_id": sponge_id, "expected_on_hand": 30.0, "actual_on_hand": 999.0}]
+
+    assert repo.rebuild(chunk_size=1) == 1
+    assert repo.verify() == []
+    db.close()
+
+    assert client.get(f"/stocks/{sponge_id}/status").json()["total"] == 30
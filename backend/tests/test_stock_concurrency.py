@@ -0,0 +1,72 @@
+"""
+Eşzamanlı stok çıkışı stres testi.
+
+Aynı sünger için yüzlerce paralel `POST /stocks/` isteği gönderilir; hiçbir anda
+bakiye negatife düşmemeli ve defter ile bakiye tablosu tutarlı kalmalıdır.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.repositories.stock_balance_repository import StockBalanceRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+WORKERS = 16
+REQUESTS_PER_SPONGE = 200
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name, thickness):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "adet",
+        "thickness": thickness,
+    })
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def post_out(sponge_id):
+    return client.post("/stocks/", json={"sponge_id": sponge_id, "type": "out", "quantity": 1}).status_code
+
+
+def test_parallel_outs_never_oversell():
+    # İki sünger: biri sınırlı stoklu, diğeri bol stoklu (paralel ilerlemeli)
+    scarce = create_sponge("ScarceFoam", thickness=1)
+    plenty = create_sponge("PlentyFoam", thickness=2)
+    client.post("/stocks/", json={"sponge_id": scarce, "type": "in", "quantity": 50})
+    client.post("/stocks/", json={"sponge_id": plenty, "type": "in", "quantity": 1000})
+
+    targets = [scarce, plenty] * REQUESTS_PER_SPONGE
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        statuses = list(pool.map(post_out, targets))
+
+    scarce_ok = sum(1 for sid, code in zip(targets, statuses) if sid == scarce and code == 201)
+    scarce_rejected = sum(1 for sid, code in zip(targets, statuses) if sid == scarce and code == 400)
+    plenty_ok = sum(1 for sid, code in zip(targets, statuses) if sid == plenty and code == 201)
+
+    assert scarce_ok == 50
+    assert scarce_rejected == REQUESTS_PER_SPONGE - 50
+    assert plenty_ok == REQUESTS_PER_SPONGE
+
+    assert client.get(f"/stocks/{scarce}/total").json()["total"] == 0
+    assert client.get(f"/stocks/{plenty}/total").json()["total"] == 1000 - REQUESTS_PER_SPONGE
+
+    db = TestingSessionLocal()
+    assert StockBalanceRepository(db).verify() == []
+    db.close()
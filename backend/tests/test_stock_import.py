@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.database import Base, engine
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name, thickness=10):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "m3",
+        "thickness": thickness,
+    })
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def test_import_csv_in_chunks():
+    foam_a = create_sponge("FoamA", thickness=1)
+    foam_b = create_sponge("FoamB", thickness=2)
+
+    csv_body = "\n".join([
+        "date,sponge,type,quantity,price,note",
+        "2023-01-02,FoamA,in,100,12.5,açılış",
+        "2023-01-03,foamb,IN,40,,",
+        "2023-01-04,FoamA,out,30,,",
+        "2023-01-05,Unknown,in,5,,",
+        "2023-01-06,FoamB,out,500,,",
+        "2023-01-07,FoamB,return,2,,",
+        "not-a-date,FoamA,in,1,,",
+    ])
+
+    res = client.post(
+        "/stocks/import?chunk_size=2",
+        files={"file": ("history.csv", io.BytesIO(csv_body.encode("utf-8")), "text/csv")},
+    )
+
+    assert res.status_code == 200
+    data = res.json()
+    assert data["processed"] == 7
+    assert data["inserted"] == 4
+    assert data["chunks"] == 4
+    assert [e["line"] for e in data["errors"]] == [5, 6, 8]
+
+    assert client.get(f"/stocks/{foam_a}/total").json()["total"] == 70
+    assert client.get(f"/stocks/{foam_b}/total").json()["total"] == 42
+
+    history = client.get("/stocks/by_date?start=2023-01-01&end=2023-01-31").json()
+    assert len(history) == 4
+
+
+def test_import_xlsx():
+    openpyxl = pytest.importorskip("openpyxl")
+    sponge_id = create_sponge("XlsxFoam")
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["date", "sponge_id", "type", "quantity"])
+    sheet.append(["2023-02-01", sponge_id, "in", 10])
+    sheet.append(["2023-02-02", sponge_id, "out", 3])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    res = client.post("/stocks/import", files={"file": ("history.xlsx", buffer, "application/octet-stream")})
+
+    assert res.status_code == 200
+    assert res.json()["inserted"] == 2
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 7
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.stock_daily_rollups import StockDailyRollup
+from app.repositories.stock_repository import StockRepository
+from app.repositories.stock_rollup_repository import StockRollupRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def create_sponge(name="RollupFoam"):
+    res = client.post("/sponges/", json={
+        "name": name,
+        "density": 25,
+        "hardness": "medium",
+        "unit": "m3",
+        "critical_stock": 5,
+    })
+    return res.json()["id"]
+
+
+def create_stock(sponge_id, type_, quantity):
+    res = client.post("/stocks/", json={"sponge_id": sponge_id, "type": type_, "quantity": quantity})
+    assert res.status_code == 201
+    return res.json()
+
+
+def rollup_rows():
+    db = TestingSessionLocal()
+    rows = {
+        (r.sponge_id, r.day): (r.total_in, r.total_out, r.total_return, r.movement_count)
+        for r in db.query(StockDailyRollup).all()
+    }
+    db.close()
+    return rows
+
+
+def test_rollup_follows_create_and_delete():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 40)
+    out = create_stock(sponge_id, "out", 15)
+    create_stock(sponge_id, "return", 5)
+
+    today = datetime.utcnow().date()
+    assert rollup_rows() == {(sponge_id, today): (40, 15, 5, 3)}
+
+    client.delete(f"/stocks/{out['id']}")
+    assert rollup_rows() == {(sponge_id, today): (40, 0, 5, 2)}
+
+
+def test_bulk_rollup_matches_rebuild():
+    sponge_id = create_sponge()
+    now = datetime.utcnow()
+    db = TestingSessionLocal()
+    rows = [
+        {"sponge_id": sponge_id, "type": "in", "quantity": 10, "date": now - timedelta(days=d)}
+        for d in range(10)
+    ] + [
+        {"sponge_id": sponge_id, "type": "out", "quantity": 2, "date": now - timedelta(days=d)}
+        for d in range(0, 10, 3)
+    ]
+    assert StockRepository(db).bulk_create(rows)[0] == len(rows)
+    db.close()
+
+    incremental = rollup_rows()
+    assert len(incremental) == 10
+
+    db = TestingSessionLocal()
+    db.query(StockDailyRollup).delete()
+    db.commit()
+    chunks = StockRollupRepository(db).rebuild(chunk_days=3)
+    db.close()
+
+    assert chunks == 4
+    assert rollup_rows() == incremental
+
+
+def test_rebuild_repairs_single_range():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 7)
+
+    db = TestingSessionLocal()
+    db.query(StockDailyRollup).update({"total_in": 999})
+    db.commit()
+    StockRollupRepository(db).rebuild(start=datetime.utcnow().date() - timedelta(days=1))
+    db.close()
+
+    assert rollup_rows()[(sponge_id, datetime.utcnow().date())][0] == 7
+
+
+def test_reports_and_trend_read_rollups():
+    sponge_id = create_sponge()
+    create_stock(sponge_id, "in", 50)
+    create_stock(sponge_id, "return", 5)
+    create_stock(sponge_id, "out", 20)
+
+    weekly = client.get("/reports/weekly").json()
+    assert weekly["total_in"] == 55
+    assert weekly["total_out"] == 20
+
+    trend = client.get("/dashboard/weekly-trend").json()
+    assert trend == [{
+        "date": str(datetime.utcnow().date()),
+        "total_in": 55.0,
+        "total_out": 20.0,
+        "net": 35.0,
+    }]
@@ -0,0 +1,111 @@
+"""
+`/stocks/summary` performans testleri.
+
+Büyük bir defter seed edilir ve özetin sünger sayısından bağımsız,
+sabit sayıda SQL sorgusuyla üretildiği doğrulanır.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, engine
+from app.models.sponges import Sponge
+from app.models.stocks import Stock, StockType
+from app.repositories.stock_balance_repository import StockBalanceRepository
+from app.repositories.stock_repository import StockRepository
+
+client = TestClient(app)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+MOVEMENTS_PER_SPONGE = 50
+
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+
+
+@pytest.fixture
+def seed_ledger():
+    """Verilen sayıda sünger ve her biri için MOVEMENTS_PER_SPONGE hareket seed eder."""
+    def _seed(sponge_count: int):
+        db = TestingSessionLocal()
+        db.execute(insert(Sponge), [
+            {"name": f"Foam{i}", "density": 20, "hardness": "medium", "thickness": i, "unit": "m3"}
+            for i in range(sponge_count)
+        ])
+        sponge_ids = [row[0] for row in db.query(Sponge.id).all()]
+        db.execute(insert(Stock), [
+            {"sponge_id": sid, "type": StockType.in_ if n % 3 else StockType.out, "quantity": 2}
+            for sid in sponge_ids for n in range(MOVEMENTS_PER_SPONGE)
+        ])
+        db.commit()
+        StockBalanceRepository(db).rebuild()
+        db.close()
+        return sponge_ids
+    return _seed
+
+
+def summary_query_count(sponge_count, seed):
+    seed(sponge_count)
+    db = TestingSessionLocal()
+    with count_queries() as statements:
+        summary = StockRepository(db).get_summary()
+    db.close()
+    assert len(summary) == sponge_count
+    return len(statements)
+
+
+def test_summary_query_count_is_constant(seed_ledger):
+    small = summary_query_count(10, seed_ledger)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    large = summary_query_count(400, seed_ledger)
+
+    assert small == large == 1
+
+
+def test_summary_includes_zero_movement_sponges(seed_ledger):
+    seed_ledger(3)
+    client.post("/sponges/", json={"name": "EmptyFoam", "density": 30, "hardness": "soft", "unit": "m3"})
+
+    summary = client.get("/stocks/summary").json()
+    assert len(summary) == 4
+    assert summary[-1]["name"] == "EmptyFoam"
+    assert summary[-1]["current_stock"] == 0
+    # 50 hareketin 17'si çıkış (n % 3 == 0), 33'ü giriş; miktar 2
+    assert summary[0]["current_stock"] == (33 - 17) * 2
+
+
+def test_summary_cache_invalidated_by_new_movement(seed_ledger):
+    sponge_id = seed_ledger(5)[0]
+    first = client.get("/stocks/summary").json()
+
+    with count_queries() as statements:
+        assert client.get("/stocks/summary").json() == first
+    assert not any("stock_balances" in s for s in statements)
+
+    client.post("/stocks/", json={"sponge_id": sponge_id, "type": "in", "quantity": 10})
+    updated = client.get("/stocks/summary").json()
+    assert updated[0]["current_stock"] == first[0]["current_stock"] + 10
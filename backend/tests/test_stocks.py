@@ -1,3 +1,6 @@
+import json
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -107,3 +110,108 @@ def test_critical_stock_warning():
     res = client.get(f"/stocks/{sponge_id}/status")
     assert res.status_code == 200
     assert res.json()["critical"] is True
+
+
+def test_bulk_create_atomic():
+    sponge_id = create_sponge()
+
+    res = client.post("/stocks/bulk", json={"items": [
+        {"sponge_id": sponge_id, "type": "in", "quantity": 30},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 20},
+        {"sponge_id": sponge_id, "type": "return", "quantity": 5},
+    ]})
+
+    assert res.status_code == 201
+    assert res.json() == {"inserted": 3, "failed": 0, "errors": []}
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 15
+
+
+def test_bulk_create_atomic_rejects_all_on_error():
+    sponge_id = create_sponge()
+
+    res = client.post("/stocks/bulk", json={"items": [
+        {"sponge_id": sponge_id, "type": "in", "quantity": 10},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 25},
+        {"sponge_id": 9999, "type": "in", "quantity": 5},
+    ]})
+
+    assert res.status_code == 400
+    errors = res.json()["detail"]["errors"]
+    assert [(e["index"], e["detail"]) for e in errors] == [(2, "Sponge not found")]
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 0
+
+
+def test_bulk_create_best_effort_reports_item_errors():
+    sponge_id = create_sponge()
+
+    res = client.post("/stocks/bulk", json={"mode": "best_effort", "items": [
+        {"sponge_id": sponge_id, "type": "in", "quantity": 10},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 25},
+        {"sponge_id": 9999, "type": "in", "quantity": 5},
+        {"sponge_id": sponge_id, "type": "out", "quantity": 4},
+    ]})
+
+    assert res.status_code == 201
+    data = res.json()
+    assert data["inserted"] == 2
+    assert [(e["index"], e["detail"]) for e in data["errors"]] == [
+        (1, "Not enough stock"),
+        (2, "Sponge not found"),
+    ]
+    assert client.get(f"/stocks/{sponge_id}/total").json()["total"] == 6
+
+
+def test_list_stocks_keyset_pagination():
+    sponge_a = create_sponge("PagedFoamA")
+    res = client.post("/sponges/", json={
+        "name": "PagedFoamB", "density": 30, "hardness": "soft", "unit": "m3",
+    })
+    sponge_b = res.json()["id"]
+
+    for qty in range(1, 6):
+        client.post("/stocks/", json={"sponge_id": sponge_a, "type": "in", "quantity": qty})
+    client.post("/stocks/", json={"sponge_id": sponge_b, "type": "in", "quantity": 99})
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "sponge_id": sponge_a}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/stocks/", params=params).json()
+        seen += [item["quantity"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    # En yeniden eskiye, tekrarsız ve eksiksiz
+    assert seen == [5, 4, 3, 2, 1]
+
+    only_b = client.get("/stocks/", params={"type": "in", "sponge_id": sponge_b}).json()
+    assert [item["quantity"] for item in only_b["items"]] == [99]
+    assert only_b["next_cursor"] is None
+
+
+def test_list_stocks_invalid_cursor():
+    res = client.get("/stocks/", params={"cursor": "bozuk"})
+    assert res.status_code == 400
+
+
+def test_by_date_streaming_exports():
+    sponge_id = create_sponge()
+    client.post("/stocks/", json={"sponge_id": sponge_id, "type": "in", "quantity": 12, "note": "ilk"})
+    client.post("/stocks/", json={"sponge_id": sponge_id, "type": "out", "quantity": 2})
+
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+
+    res = client.get(f"/stocks/by_date?start={today}&end={today}&format=ndjson")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [(r["type"], r["quantity"]) for r in rows] == [("out", 2), ("in", 12)]
+
+    res = client.get(f"/stocks/by_date?start={today}&end={today}&format=csv")
+    assert res.status_code == 200
+    lines = res.text.splitlines()
+    assert lines[0] == "id,sponge_id,type,quantity,price,note,date,created_by"
+    assert len(lines) == 3
+    assert ",in,12.0,,ilk," in lines[2]
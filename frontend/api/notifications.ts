@@ -26,8 +26,10 @@ export async function getNotifications(limit: number = 50): Promise<Notification
     const params = new URLSearchParams();
     if (limit) params.append('limit', limit.toString());
 
-    const response = await api.get<Notification[]>(`/notifications/?${params.toString()}`);
-    return response.data;
+    const response = await api.get<{ items: Notification[]; next_cursor: string | null }>(
+      `/notifications/?${params.toString()}`
+    );
+    return response.data.items;
   } catch (error) {
     console.error('Bildirimler alınırken hata:', error);
     throw error;